@@ -0,0 +1,550 @@
+# backend/bench/ws_load.py
+"""WebSocket 부하 테스트 / 벤치마크
+
+SQLite 임시 DB로 앱을 별도 프로세스(uvicorn)로 띄우고, 인증된 /ws?token= 클라이언트를
+여러 개 접속시켜 방마다 메시지를 주고받은 뒤 결과를 JSON으로 출력한다.
+
+  cd backend
+  python -m bench.ws_load --clients 2000 --room-size 50 --rate 0.2 --duration 30 --output result.json
+  python -m bench.ws_load --clients 2000 --baseline result.json   # 이전 결과 대비 회귀 확인 (회귀 시 종료 코드 1)
+
+측정 항목
+  - 메시지 fan-out 지연 (보낸 시각 → 다른 멤버가 받은 시각, 같은 프로세스의 단조 시계) 백분위
+  - 초당 보낸/받은 메시지 수, 유실 수
+  - presence 프레임 비율 (접속 구간/측정 구간, 프레임 수와 바이트)
+  - 서버 RSS 증가량 기준 연결당 메모리
+  - 서버 이벤트 루프 지연 (10ms 주기 sleep의 초과 시간)
+
+클라이언트와 서버가 같은 머신에서 돌기 때문에 클라이언트 CPU도 결과에 영향을 준다.
+같은 머신, 같은 설정끼리만 비교할 것.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_VERSION = 1
+
+# --baseline 비교 항목: (결과 경로, 클수록 좋은지)
+REGRESSION_METRICS = [
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("messages", "delivered_per_s"), True),
+    (("memory", "per_connection_kb"), False),
+    (("event_loop_lag_ms", "p99"), False),
+]
+
+
+def _raise_fd_limit():
+    """클라이언트 수만큼 소켓을 열 수 있도록 파일 디스크립터 한도를 최대로"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _rss_bytes() -> int:
+    """현재 프로세스 RSS (리눅스는 /proc, 그 외는 최대 RSS로 대체)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _percentiles(values: List[float], scale: float = 1.0) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)] * scale, 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * scale, 3),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "p999": pick(0.999),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+
+# ---------------------------------------------------------------------------
+# 서버 (자식 프로세스)
+# ---------------------------------------------------------------------------
+
+def serve(port: int):
+    """벤치마크용 서버: 앱에 이벤트 루프 지연 측정과 통계 엔드포인트를 붙여서 실행"""
+    import uvicorn
+
+    _raise_fd_limit()
+    sys.path.insert(0, BACKEND_DIR)
+    from main import app
+    from utils.message_writer import message_writer
+    from utils.websocket_manager import manager
+
+    lag_samples: deque = deque(maxlen=200_000)
+    probe_interval = 0.01
+
+    async def probe_loop_lag():
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(probe_interval)
+            lag_samples.append(max(0.0, loop.time() - started - probe_interval))
+
+    async def start_probe():
+        asyncio.create_task(probe_loop_lag())
+
+    def bench_stats():
+        return {
+            "rss_bytes": _rss_bytes(),
+            "connections": len(manager.connections),
+            "rooms": len(manager.room_connections),
+            "evicted": manager.evicted,
+            "messages_written": message_writer.written,
+            "messages_failed": message_writer.failed,
+            "presence_sent": manager.presence.sent,
+            "presence_suppressed": manager.presence.suppressed,
+            "event_loop_lag_ms": _percentiles(list(lag_samples), 1000),
+        }
+
+    def bench_reset():
+        lag_samples.clear()
+        return {"ok": True}
+
+    app.router.on_startup.append(start_probe)
+    app.add_api_route("/__bench__/stats", bench_stats, methods=["GET"])
+    app.add_api_route("/__bench__/reset", bench_reset, methods=["POST"])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", ws_ping_interval=None)
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성 (부모 프로세스)
+# ---------------------------------------------------------------------------
+
+def seed_database(clients: int, room_size: int) -> Dict[int, int]:
+    """유저/방/멤버를 bulk INSERT로 만들고 user_id → room_id 매핑 반환 (회원가입 API의 해싱 비용 제외)"""
+    from sqlalchemy import insert
+
+    from core.security import get_password_hash
+    from database import create_tables, engine
+    from models import message, message_reaction, room, room_member, user  # noqa: F401  테이블 등록
+    from models.room import Room
+    from models.room_member import RoomMember
+    from models.user import User
+
+    create_tables()
+    password = get_password_hash("bench-password")
+    rooms = math.ceil(clients / room_size)
+    assignment = {user_id: (user_id - 1) // room_size + 1 for user_id in range(1, clients + 1)}
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"user_id": user_id, "name": f"bench{user_id}", "email": f"bench{user_id}@bench.local", "password": password}
+            for user_id in assignment
+        ])
+        conn.execute(insert(Room), [
+            {
+                "room_id": room_id,
+                "name": f"bench-room-{room_id}",
+                "room_type": "public",
+                "created_by": (room_id - 1) * room_size + 1,
+                "member_count": min(room_size, clients - (room_id - 1) * room_size),
+            }
+            for room_id in range(1, rooms + 1)
+        ])
+        conn.execute(insert(RoomMember), [
+            {
+                "room_id": room_id,
+                "user_id": user_id,
+                "role": "owner" if (user_id - 1) % room_size == 0 else "member",
+            }
+            for user_id, room_id in assignment.items()
+        ])
+    return assignment
+
+
+class Stats:
+    """클라이언트 쪽 수신 통계 (구간별 프레임 수/바이트, 지연)"""
+
+    def __init__(self):
+        self.phase = "connect"
+        self.frames: Dict[str, Counter] = {"connect": Counter(), "measure": Counter()}
+        self.bytes: Dict[str, Counter] = {"connect": Counter(), "measure": Counter()}
+        self.latencies: List[float] = []
+        self.sent_at: Dict[str, float] = {}
+        self.sent = 0
+        self.expected = 0
+        self.delivered = 0
+        self.failed = 0
+
+    def record(self, frame_type: str, size: int):
+        self.frames[self.phase][frame_type] += 1
+        self.bytes[self.phase][frame_type] += size
+
+
+class BenchClient:
+    """/ws 클라이언트 1개 (접속, 방 참가, 메시지 전송/수신)"""
+
+    def __init__(self, user_id: int, room_id: int, audience: int, token: str, codec, stats: Stats):
+        self.user_id = user_id
+        self.room_id = room_id
+        self.audience = audience
+        self.token = token
+        self.codec = codec
+        self.stats = stats
+        self.ws = None
+        self.joined = asyncio.Event()
+        self._seq = 0
+        self._reader: Optional[asyncio.Task] = None
+
+    async def connect(self, url: str):
+        import websockets
+
+        subprotocols = [f"chat.{self.codec.name}"] if self.codec.name != "json" else None
+        self.ws = await websockets.connect(
+            f"{url}/ws?token={self.token}",
+            subprotocols=subprotocols,
+            ping_interval=None,
+            max_queue=None,
+            open_timeout=60,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def send(self, payload: dict):
+        await self.ws.send(self.codec.encode(payload))
+
+    async def join(self):
+        await self.send({"type": "join_room", "roomId": self.room_id})
+
+    async def send_message(self):
+        import websockets
+
+        self._seq += 1
+        client_id = f"{self.user_id}:{self._seq}"
+        self.stats.sent_at[client_id] = time.perf_counter()
+        try:
+            await self.send({"type": "message", "roomId": self.room_id, "content": f"bench {client_id}", "clientId": client_id})
+        except websockets.ConnectionClosed:
+            # 재접속(--churn) 중인 클라이언트
+            return
+        self.stats.sent += 1
+        # 같은 방의 다른 멤버 수만큼 수신이 있어야 함 (재접속 중인 멤버는 놓칠 수 있음)
+        self.stats.expected += self.audience
+
+    async def _read(self):
+        stats = self.stats
+        try:
+            async for data in self.ws:
+                received = time.perf_counter()
+                frame = self.codec.decode(data)
+                frame_type = frame.get("type", "?")
+                stats.record(frame_type, len(data))
+                if frame_type == "message":
+                    client_id = frame.get("clientId")
+                    sent = stats.sent_at.get(client_id)
+                    # 보낸 사람 자신의 수신은 fan-out 지연에서 제외
+                    if sent is not None and frame["sender"]["id"] != self.user_id:
+                        stats.latencies.append(received - sent)
+                        stats.delivered += 1
+                elif frame_type == "message_failed":
+                    stats.failed += 1
+                elif frame_type == "history":
+                    self.joined.set()
+        except Exception:
+            pass
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(client, base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"벤치마크 서버가 종료되었습니다 (exit {process.returncode})")
+        try:
+            if (await client.get(f"{base_url}/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("벤치마크 서버가 시작되지 않았습니다.")
+
+
+async def _sender(client: BenchClient, rate: float, until: float):
+    """포아송 도착으로 rate(초당)만큼 메시지 전송"""
+    await asyncio.sleep(min(random.uniform(0, 1 / rate), until - time.perf_counter()))
+    while time.perf_counter() < until:
+        await client.send_message()
+        await asyncio.sleep(max(0.0, min(random.expovariate(rate), until - time.perf_counter())))
+
+
+async def _reconnect(client: BenchClient, url: str, offline: float):
+    await client.close()
+    await asyncio.sleep(offline)
+    await client.connect(url)
+    await client.join()
+
+
+async def _churn(clients: List[BenchClient], url: str, per_second: float, offline: float, until: float):
+    """초당 per_second개 연결을 끊었다가 offline초 뒤 다시 접속 (presence 부하)
+
+    presence 전송 주기보다 짧게 끊었다 붙으면 변경이 상쇄되어 전송되지 않으므로 offline은 그보다 길게 둔다.
+    """
+    pending = set()
+    while time.perf_counter() < until:
+        await asyncio.sleep(random.expovariate(per_second))
+        task = asyncio.create_task(_reconnect(random.choice(clients), url, offline))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_load(args) -> dict:
+    import httpx
+
+    from core.security import create_access_token
+    from utils.codec import CODECS
+
+    codec = CODECS[args.codec]
+    assignment = seed_database(args.clients, args.room_size)
+    port = args.port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}"
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bench.ws_load", "serve", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    stats = Stats()
+    room_members = Counter(assignment.values())
+    clients = [
+        BenchClient(
+            user_id, room_id, room_members[room_id] - 1,
+            create_access_token({"sub": f"bench{user_id}@bench.local", "user_id": user_id}),
+            codec, stats,
+        )
+        for user_id, room_id in assignment.items()
+    ]
+    try:
+        async with httpx.AsyncClient(timeout=30) as http:
+            await _wait_ready(http, base_url, server)
+            idle = (await http.get(f"{base_url}/__bench__/stats")).json()
+
+            # 1) 접속 (동시 접속 수 제한)
+            started = time.perf_counter()
+            slots = asyncio.Semaphore(args.connect_concurrency)
+
+            async def connect(client: BenchClient):
+                async with slots:
+                    await client.connect(ws_url)
+
+            await asyncio.gather(*(connect(client) for client in clients))
+            connect_seconds = time.perf_counter() - started
+
+            # 2) 방 참가 (이력 프레임 수신까지)
+            await asyncio.gather(*(client.join() for client in clients))
+            await asyncio.wait_for(asyncio.gather(*(client.joined.wait() for client in clients)), 60)
+            # presence/상태 저장 주기가 한 번 돌 때까지 대기 후 연결 후 메모리 측정
+            await asyncio.sleep(args.settle)
+            connected = (await http.get(f"{base_url}/__bench__/stats")).json()
+
+            # 3) 측정 구간
+            await http.post(f"{base_url}/__bench__/reset")
+            stats.phase = "measure"
+            measure_started = time.perf_counter()
+            until = measure_started + args.duration
+            churn = asyncio.create_task(_churn(clients, ws_url, args.churn, args.churn_offline, until)) if args.churn > 0 else None
+            await asyncio.gather(*(_sender(client, args.rate, until) for client in clients))
+            sent_seconds = time.perf_counter() - measure_started
+            if churn is not None:
+                await churn
+            # 전송 중인 프레임이 도착할 시간
+            await asyncio.sleep(args.drain)
+            measured = (await http.get(f"{base_url}/__bench__/stats")).json()
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    measure_frames = stats.frames["measure"]
+    measure_bytes = stats.bytes["measure"]
+    total_frames = sum(measure_frames.values())
+    total_bytes = sum(measure_bytes.values())
+    rss_growth = connected["rss_bytes"] - idle["rss_bytes"]
+
+    return {
+        "version": RESULT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "git_revision": _git_revision(),
+        },
+        "config": {
+            "clients": args.clients,
+            "room_size": args.room_size,
+            "rooms": len(room_members),
+            "rate_per_client": args.rate,
+            "duration_s": args.duration,
+            "churn_per_s": args.churn,
+            "churn_offline_s": args.churn_offline,
+            "codec": args.codec,
+        },
+        "connect": {
+            "seconds": round(connect_seconds, 3),
+            "per_s": round(args.clients / connect_seconds, 1) if connect_seconds else None,
+        },
+        "memory": {
+            "server_rss_idle_mb": round(idle["rss_bytes"] / 2**20, 1),
+            "server_rss_connected_mb": round(connected["rss_bytes"] / 2**20, 1),
+            "per_connection_kb": round(rss_growth / args.clients / 1024, 2),
+        },
+        "messages": {
+            "sent": stats.sent,
+            "delivered": stats.delivered,
+            "expected_deliveries": stats.expected,
+            "lost": stats.expected - stats.delivered,
+            "failed": stats.failed,
+            "sent_per_s": round(stats.sent / sent_seconds, 1),
+            "delivered_per_s": round(stats.delivered / sent_seconds, 1),
+        },
+        "latency_ms": _percentiles(stats.latencies, 1000),
+        "presence": {
+            "connect_phase_frames": stats.frames["connect"]["presence_diff"],
+            "connect_phase_bytes": stats.bytes["connect"]["presence_diff"],
+            "measure_frames": measure_frames["presence_diff"],
+            "measure_bytes": measure_bytes["presence_diff"],
+            "share_of_frames": round(measure_frames["presence_diff"] / total_frames, 4) if total_frames else 0.0,
+            "share_of_bytes": round(measure_bytes["presence_diff"] / total_bytes, 4) if total_bytes else 0.0,
+        },
+        "frames_by_type": {
+            phase: {name: {"frames": count, "bytes": stats.bytes[phase][name]} for name, count in counter.items()}
+            for phase, counter in stats.frames.items()
+        },
+        "event_loop_lag_ms": measured["event_loop_lag_ms"],
+        "server": {key: value for key, value in measured.items() if key != "event_loop_lag_ms"},
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """기준 결과 대비 tolerance(비율) 넘게 나빠진 항목 목록"""
+    regressions = []
+    for path, higher_is_better in REGRESSION_METRICS:
+        current, previous = result, baseline
+        for key in path:
+            current = (current or {}).get(key)
+            previous = (previous or {}).get(key)
+        if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or previous == 0:
+            continue
+        change = (current - previous) / abs(previous)
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append(f"{'.'.join(path)}: {previous} → {current} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="채팅 WebSocket 부하 테스트")
+    sub = parser.add_subparsers(dest="command")
+    serve_parser = sub.add_parser("serve", help="벤치마크 서버 (run이 자식 프로세스로 실행)")
+    serve_parser.add_argument("--port", type=int, required=True)
+
+    parser.add_argument("--clients", type=int, default=1000, help="동시 접속 클라이언트 수")
+    parser.add_argument("--room-size", type=int, default=50, help="방당 멤버 수")
+    parser.add_argument("--rate", type=float, default=0.2, help="클라이언트당 초당 메시지 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 구간 길이(초)")
+    parser.add_argument("--churn", type=float, default=0.0, help="측정 중 초당 재접속 수 (presence 부하)")
+    parser.add_argument("--churn-offline", type=float, default=3.0, help="재접속 전 끊겨 있는 시간(초)")
+    parser.add_argument("--codec", choices=["json", "msgpack"], default="json")
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="동시에 진행할 접속 수")
+    parser.add_argument("--settle", type=float, default=3.0, help="접속 후 측정 전 대기(초)")
+    parser.add_argument("--drain", type=float, default=2.0, help="전송 종료 후 수신 대기(초)")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--db", help="SQLite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 볼 악화 비율")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.port)
+        return 0
+
+    _raise_fd_limit()
+    workdir = tempfile.mkdtemp(prefix="ws-bench-")
+    db_path = args.db or os.path.join(workdir, "bench.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    # 서버(자식 프로세스)도 같은 설정을 쓰도록 환경변수로 전달
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.setdefault("WORKER_ID", "1")
+    # 단일 워커라서 백플레인은 로컬
+    os.environ["CHAT_BACKPLANE_URL"] = "local"
+    sys.path.insert(0, BACKEND_DIR)
+
+    try:
+        result = asyncio.run(run_load(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"회귀: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
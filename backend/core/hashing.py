@@ -0,0 +1,88 @@
+# backend/core/hashing.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# 이 모듈은 해싱 전용 프로세스에서도 import 되므로 DB/FastAPI 의존성을 두지 않는다.
+
+# bcrypt 비용(rounds)이 바뀌면 로그인 시 기존 해시를 새 비용으로 다시 저장한다.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(max(1, (os.cpu_count() or 2) // 2))))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "32"))  # 실행 중 + 대기 중 작업 상한
+HASH_TIMEOUT = float(os.getenv("HASH_TIMEOUT", "5"))          # 작업 1건 최대 대기(초)
+
+# 비밀번호 해싱 설정
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class HashingBusy(Exception):
+    """해싱 풀이 포화 상태라 요청을 받을 수 없음"""
+
+
+class PasswordHasher:
+    """bcrypt를 이벤트 루프/스레드풀 밖의 전용 프로세스 풀에서 실행
+
+    대기열이 HASH_MAX_PENDING을 넘거나 HASH_TIMEOUT 안에 끝나지 않으면
+    무한정 기다리지 않고 HashingBusy를 던진다 (라우터에서 503으로 응답).
+    """
+
+    def __init__(self, pool_size: int = HASH_POOL_SIZE, max_pending: int = HASH_MAX_PENDING, timeout: float = HASH_TIMEOUT):
+        self.pool_size = pool_size
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스레드가 도는 프로세스를 fork하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _release(self, _future):
+        self.pending -= 1
+
+    async def _submit(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingBusy("비밀번호 처리 요청이 많습니다.")
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool(), fn, *args)
+        # 타임아웃으로 포기해도 실제 작업이 끝날 때까지 자리를 차지한 것으로 계산
+        self.pending += 1
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HashingBusy("비밀번호 처리가 지연되고 있습니다.")
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(일치 여부, 비용이 바뀌었으면 새 해시 아니면 None)"""
+        return await self._submit(_verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher()
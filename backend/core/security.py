@@ -1,17 +1,20 @@
 # backend/core/security.py
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from .config import settings
+from .hashing import pwd_context
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from dotenv import load_dotenv
 
-from database import get_db
+from database import get_db, AsyncSessionLocal
 from models.user import User
+from utils.cache import TTLCache
 
 from fastapi import Depends, WebSocket, HTTPException, status
 
@@ -19,9 +22,6 @@ from fastapi import Depends, WebSocket, HTTPException, status
 
 load_dotenv()
 
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT 설정
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-for-development")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
@@ -30,12 +30,31 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 # Bearer 토큰 스키마
 security = HTTPBearer()
 
+# 인증 사용자 캐시 (user_id → 세션에서 분리된 User)
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+# 검증된 JWT 캐시 (토큰 SHA-256 → payload, 토큰 만료 시각에 함께 만료)
+# 서명 검증에 성공한 토큰만 넣으므로 위조 토큰으로 캐시를 채울 수 없고, 크기는 LRU로 제한
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "50000"))
+TOKEN_CACHE_MAX_TTL = int(os.getenv("TOKEN_CACHE_MAX_TTL", "300"))
+token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_MAX_TTL)
+
+def invalidate_user(user_id: int):
+    """이 워커의 사용자 캐시에서 제거
+
+    직접 부르지 말고 utils.read_cache.invalidate(users=[...])로 user 버전을 올리면
+    WebSocketManager가 모든 워커에서 이 함수를 호출한다.
+    """
+    user_cache.pop(user_id)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
+    """비밀번호 검증 (동기 버전, 요청 경로에서는 core.hashing.password_hasher 사용)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """비밀번호 해싱"""
+    """비밀번호 해싱 (동기 버전, 요청 경로에서는 core.hashing.password_hasher 사용)"""
     return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -51,12 +70,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(token: str) -> dict:
-    """JWT 토큰 검증"""
+    """JWT 토큰 검증 (REST/WS 공용, 이미 검증한 토큰은 캐시에서 반환)"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    exp = payload.get("exp")
+    ttl = min(exp - time.time(), TOKEN_CACHE_MAX_TTL) if exp else TOKEN_CACHE_MAX_TTL
+    if ttl > 0:
+        token_cache.set(key, payload, ttl)
+    return payload
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -81,29 +108,42 @@ def get_current_user(
     if email is None or user_id is None:
         raise credentials_exception
     
+    # 캐시 적중 시 DB 조회 없이 현재 세션에 붙여서 반환 (merge(load=False)는 쿼리를 하지 않음)
+    cached = user_cache.get(user_id)
+    if cached is not None and cached.email == email:
+        return db.merge(cached, load=False)
+    
     # 데이터베이스에서 사용자 조회
     user = db.query(User).filter(User.email == email, User.user_id == user_id).first()
     if user is None:
         raise credentials_exception
     
-    return user
+    # 분리된 원본은 캐시에 두고, 요청에는 세션에 붙은 사본을 넘김
+    db.expunge(user)
+    user_cache.set(user_id, user)
+    return db.merge(user, load=False)
 
 
-def get_current_user_ws(websocket: WebSocket, db: Session = Depends(get_db)) -> User:
+async def get_current_user_ws(websocket: WebSocket) -> User:
+    """WebSocket 연결 사용자 조회 (비동기 세션을 짧게 열고 바로 반환)"""
     token = websocket.query_params.get("token")
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        if not user_id:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
+    payload = verify_token(token)
+    user_id: int = payload.get("user_id") if payload else None
+    if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    # 연결이 유지되는 동안 DB 커넥션을 잡고 있지 않도록 세션은 조회 후 바로 닫음
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.set(user_id, user)
 
-    return user
\ No newline at end of file
+    return user
@@ -1,10 +1,16 @@
 # backend/database.py
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, BigInteger, Integer
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from utils import sql_profiler
+from utils.metrics import db_session_seconds, registry
+
 load_dotenv()  # .env 파일 읽기
 
 # 환경변수 검증
@@ -23,13 +29,70 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# 의존성 주입용 함수
+# 자동 증가 PK 타입 (SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 변형 사용)
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
+# 비동기 드라이버 매핑 (ASYNC_DATABASE_URL이 없을 때 DATABASE_URL에서 유도)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+# 비동기 엔진 (WebSocket 등 이벤트 루프 위에서 도는 코드용)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=False,
+)
+
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# SQL_PROFILE=true일 때 요청별 쿼리 집계 (utils.sql_profiler)
+sql_profiler.install(engine, async_engine.sync_engine)
+
+# 의존성 주입용 함수 (세션을 잡고 있던 시간은 /metrics로 노출)
 def get_db():
+    started = time.perf_counter()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        db_session_seconds.observe(time.perf_counter() - started, "sync")
+
+async def get_async_db():
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            yield db
+    finally:
+        db_session_seconds.observe(time.perf_counter() - started, "async")
+
+def _pool_stats():
+    """커넥션 풀 상태 (QueuePool이 아닌 풀은 제공하는 값만)"""
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        for stat in ("checkedout", "overflow", "size"):
+            value = getattr(pool, stat, None)
+            if callable(value):
+                # overflow()는 풀이 덜 찼을 때 음수 (남은 자리)
+                yield (name, stat), max(value(), 0)
+
+registry.gauge("chat_db_pool", "DB 커넥션 풀 상태 (checkedout: 사용 중, overflow: pool_size 초과분, size: 풀 크기)", ("engine", "stat"), callback=_pool_stats)
 
 # 테이블 생성 함수
 def create_tables():
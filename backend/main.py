@@ -1,15 +1,28 @@
 # backend/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from database import create_tables
+from database import create_tables, engine, async_engine
 import os
 from dotenv import load_dotenv
 
 from models import user, room, room_member, message, message_reaction
-from routers import auth, rooms, users, ws
+from routers import auth, rooms, reactions, search, users, ws
+from utils.websocket_manager import manager
+from utils.message_writer import message_writer
+from utils.read_cache import read_cache
+from core.security import user_cache, token_cache
+from core.hashing import password_hasher
+from utils.search import message_search
+from utils.worker_lease import worker_id_lease
+from utils.metrics import METRICS_ENABLED, MetricsMiddleware, loop_lag, registry
+from utils.sql_profiler import SQLProfilerMiddleware
 
 load_dotenv()
 
+# 검색 인덱스가 없으면 시작하지 않음 (기본은 경고 로그 + /health degraded)
+SEARCH_REQUIRE_INDEX = os.getenv("SEARCH_REQUIRE_INDEX", "false").lower() in ("1", "true", "yes")
+
 app = FastAPI(title="Chat API", version="1.0.0")
 
 # CORS 설정
@@ -19,11 +32,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저 JS에서 읽는 응답 헤더 (GET /users/ 페이지 커서, 조건부 요청용 ETag)
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# 라우트별 요청 지연 기록 (/metrics)
+app.add_middleware(MetricsMiddleware)
+# 요청별 SQL 집계 (SQL_PROFILE=true일 때만, X-DB-* 응답 헤더와 로그)
+app.add_middleware(SQLProfilerMiddleware)
+
 # 라우터 등록
 app.include_router(auth.router)
 app.include_router(rooms.router)
+app.include_router(reactions.router)
+app.include_router(search.router)
 app.include_router(users.router)
 app.include_router(ws.router)
 
@@ -34,6 +56,30 @@ app.include_router(ws.router)
 def startup_event():
     """앱 시작시 테이블 생성"""
     create_tables()
+    # 메시지 전문 검색 인덱스 확인 (생성은 python -m migrations.search_index)
+    message_search.check(engine)
+    if SEARCH_REQUIRE_INDEX and not message_search.index_ready:
+        raise RuntimeError("메시지 전문 검색 인덱스가 없습니다. python -m migrations.search_index 를 먼저 실행하세요.")
+
+@app.on_event("startup")
+async def start_realtime():
+    """메시지 ID 워커 번호 임대, WebSocket 브로드캐스트 백플레인 구독 및 메시지 저장기 시작"""
+    # 프로세스마다 다른 번호 (WORKER_ID를 다른 프로세스가 쓰고 있으면 시작 실패)
+    await worker_id_lease.start()
+    await manager.start()
+    await message_writer.start()
+    await loop_lag.start()
+
+@app.on_event("shutdown")
+async def stop_realtime():
+    # 저장 대기 중인 메시지를 모두 커밋한 뒤 종료
+    await message_writer.stop()
+    # 남은 메시지 저장이 끝난 뒤 워커 번호 반납
+    await worker_id_lease.stop()
+    await manager.stop()
+    await loop_lag.stop()
+    await async_engine.dispose()
+    password_hasher.shutdown()
 
 @app.get("/")
 def root():
@@ -41,7 +87,24 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        # 검색 인덱스가 없으면 LIKE 전체 스캔으로 동작 중이므로 degraded
+        "status": "healthy" if message_search.index_ready else "degraded",
+        "search": message_search.status(),
+        "worker": worker_id_lease.status(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "read_cache": read_cache.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 텍스트 형식 지표 (워커별 값)"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
-# uvicorn main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+# uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+# /ws 압축(permessage-deflate)은 uvicorn이 협상한다 (--ws websockets, --ws-per-message-deflate true 가 기본값)
\ No newline at end of file
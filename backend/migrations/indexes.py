@@ -0,0 +1,42 @@
+# backend/migrations/indexes.py
+"""기존 테이블에 모델에만 선언된 인덱스 추가 (migrations.message_indexes, migrations.user_indexes 공용)
+
+create_tables()는 새 테이블을 만들 때만 인덱스를 만들고 기존 테이블에는 추가하지 않는다.
+이름으로 존재 여부를 확인하므로 여러 번 실행해도 결과가 같다.
+"""
+import logging
+from typing import Iterable, List
+
+from sqlalchemy import Index, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+logger = logging.getLogger(__name__)
+
+
+def missing_indexes(engine: Engine, indexes: Iterable[Index]) -> List[Index]:
+    inspector = inspect(engine)
+    existing = {}
+    result = []
+    for index in indexes:
+        table = index.table.name
+        if table not in existing:
+            # 아직 없는 테이블은 create_tables()가 인덱스까지 만든다
+            has_table = inspector.has_table(table)
+            existing[table] = {ix["name"] for ix in inspector.get_indexes(table)} if has_table else None
+        if existing[table] is not None and index.name not in existing[table]:
+            result.append(index)
+    return result
+
+
+def create_indexes(engine: Engine, indexes: Iterable[Index], dry_run: bool = False) -> List[str]:
+    """없는 인덱스만 CREATE INDEX (실행한 문장 목록 반환)"""
+    statements = []
+    for index in missing_indexes(engine, indexes):
+        statement = str(CreateIndex(index).compile(dialect=engine.dialect))
+        logger.info("%s", statement)
+        if not dry_run:
+            with engine.begin() as conn:
+                conn.execute(CreateIndex(index))
+        statements.append(statement)
+    return statements
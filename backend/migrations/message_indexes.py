@@ -0,0 +1,36 @@
+# backend/migrations/message_indexes.py
+"""메시지 이력 키셋 페이지네이션용 (room_id, message_id) 인덱스 추가 (기존 DB에 한 번, 워커를 띄우기 전에 실행)
+
+  cd backend
+  python -m migrations.message_indexes              # 없으면 생성
+  python -m migrations.message_indexes --dry-run    # 실행할 CREATE INDEX 문만 출력
+
+인덱스가 없으면 GET /rooms/{room_id}/messages가 방의 메시지를 전부 훑는다.
+MySQL(InnoDB)은 온라인으로 만들지만 메시지 수에 비례해 오래 걸리므로 트래픽이 적은 시간에 실행할 것.
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from database import engine
+from models import user, room, room_member, message, message_reaction  # noqa: F401 (테이블 메타데이터 등록)
+from models.message import Message
+from migrations.indexes import create_indexes
+
+INDEXES = [index for index in Message.__table__.indexes if index.name == "ix_messages_room_id_message_id"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="메시지 이력 페이지네이션 인덱스 추가")
+    parser.add_argument("--dry-run", action="store_true", help="실행할 CREATE INDEX 문만 출력")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if not create_indexes(engine, INDEXES, dry_run=args.dry_run):
+        logging.getLogger(__name__).info("추가할 인덱스가 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
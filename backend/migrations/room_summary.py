@@ -0,0 +1,136 @@
+# backend/migrations/room_summary.py
+"""방 목록 요약/안 읽은 수 컬럼 추가와 기존 데이터 채우기 (기존 DB에 한 번, 워커를 띄우기 전에 실행)
+
+  cd backend
+  python -m migrations.room_summary              # 없는 컬럼 추가 + 값 채우기
+  python -m migrations.room_summary --dry-run    # 실행할 ALTER 문만 출력
+
+create_tables()는 새 테이블만 만들고 기존 테이블에 컬럼을 추가하지 않는다.
+추가하는 컬럼
+  - rooms.message_count, rooms.member_count                          (NOT NULL DEFAULT 0)
+  - rooms.last_message_id, last_message_preview, last_message_at     (NULL 허용)
+  - room_members.read_count                                          (NOT NULL DEFAULT 0)
+
+값 채우기는 messages/room_members 기준으로 다시 계산하므로 여러 번 실행해도 결과가 같다.
+실행 중에 저장된 메시지는 반영되지 않을 수 있으므로 트래픽을 멈춘 상태에서 실행할 것.
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from sqlalchemy import Column, and_, func, inspect, select, text, update
+from sqlalchemy.engine import Engine
+
+from database import engine
+from models import user, room, room_member, message, message_reaction  # noqa: F401 (테이블 메타데이터 등록)
+from models.message import Message
+from models.room import Room
+from models.room_member import RoomMember
+from utils.unread import LAST_MESSAGE_PREVIEW_LENGTH
+
+logger = logging.getLogger(__name__)
+
+rooms_table = Room.__table__
+members_table = RoomMember.__table__
+messages_table = Message.__table__
+
+NEW_COLUMNS = [
+    rooms_table.c.message_count,
+    rooms_table.c.member_count,
+    rooms_table.c.last_message_id,
+    rooms_table.c.last_message_preview,
+    rooms_table.c.last_message_at,
+    members_table.c.read_count,
+]
+
+
+def _add_column_sql(engine: Engine, column: Column) -> str:
+    sql = f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+    if not column.nullable:
+        sql += f" NOT NULL DEFAULT {column.server_default.arg}"
+    return sql
+
+
+def missing_columns(engine: Engine) -> List[Column]:
+    inspector = inspect(engine)
+    existing = {
+        table: {col["name"] for col in inspector.get_columns(table)}
+        for table in {column.table.name for column in NEW_COLUMNS}
+    }
+    return [column for column in NEW_COLUMNS if column.name not in existing[column.table.name]]
+
+
+def add_columns(engine: Engine, dry_run: bool = False) -> List[str]:
+    statements = [_add_column_sql(engine, column) for column in missing_columns(engine)]
+    for statement in statements:
+        logger.info("%s", statement)
+        if not dry_run:
+            with engine.begin() as conn:
+                conn.execute(text(statement))
+    return statements
+
+
+def backfill(engine: Engine):
+    """요약 컬럼을 messages/room_members 기준으로 다시 계산"""
+    m = messages_table
+    latest = (
+        select(func.max(m.c.message_id))
+        .where(m.c.room_id == rooms_table.c.room_id, m.c.is_deleted == False)
+        .scalar_subquery()
+    )
+    with engine.begin() as conn:
+        # 누적 메시지 수 (메시지 저장 시 증가하는 값과 같게 삭제된 메시지도 포함)
+        conn.execute(update(rooms_table).values(
+            message_count=select(func.count()).where(m.c.room_id == rooms_table.c.room_id).scalar_subquery(),
+            member_count=select(func.count())
+            .where(members_table.c.room_id == rooms_table.c.room_id)
+            .scalar_subquery(),
+            last_message_id=latest,
+        ))
+        conn.execute(update(rooms_table).where(rooms_table.c.last_message_id != None).values(
+            last_message_preview=select(func.substr(m.c.content, 1, LAST_MESSAGE_PREVIEW_LENGTH))
+            .where(m.c.message_id == rooms_table.c.last_message_id)
+            .scalar_subquery(),
+            last_message_at=select(m.c.created_at)
+            .where(m.c.message_id == rooms_table.c.last_message_id)
+            .scalar_subquery(),
+        ))
+        # 읽음 위치 = 방 메시지 수 - last_read_at 이후 다른 사람이 보낸 메시지 수 (utils.unread.recompute_unread_counts와 같은 기준)
+        unread = (
+            select(func.count())
+            .where(and_(
+                m.c.room_id == members_table.c.room_id,
+                m.c.user_id != members_table.c.user_id,
+                m.c.is_deleted == False,
+                m.c.created_at > members_table.c.last_read_at,
+            ))
+            .scalar_subquery()
+        )
+        room_total = (
+            select(rooms_table.c.message_count)
+            .where(rooms_table.c.room_id == members_table.c.room_id)
+            .scalar_subquery()
+        )
+        conn.execute(update(members_table).values(read_count=room_total - unread))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="방 요약/안 읽은 수 컬럼 추가 및 값 채우기")
+    parser.add_argument("--dry-run", action="store_true", help="실행할 ALTER 문만 출력")
+    parser.add_argument("--skip-backfill", action="store_true", help="컬럼만 추가하고 값은 채우지 않음")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    statements = add_columns(engine, dry_run=args.dry_run)
+    if not statements:
+        logger.info("추가할 컬럼이 없습니다.")
+    if args.dry_run or args.skip_backfill:
+        return 0
+    backfill(engine)
+    logger.info("방 요약/읽음 위치를 다시 계산했습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
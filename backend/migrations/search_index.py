@@ -0,0 +1,36 @@
+# backend/migrations/search_index.py
+"""메시지 전문 검색 인덱스 생성 (배포 시 한 번, 워커를 띄우기 전에 실행)
+
+  cd backend
+  python -m migrations.search_index           # 인덱스가 없으면 생성 (SQLite FTS5 / MySQL FULLTEXT ngram)
+  python -m migrations.search_index --check   # 확인만 (없으면 종료 코드 1)
+
+MySQL의 FULLTEXT 인덱스 생성은 메시지 수에 비례해 오래 걸리고 테이블에 메타데이터 락을 잡으므로
+트래픽이 적은 시간에 실행할 것. 앱은 시작할 때 인덱스가 있는지만 확인한다(utils.search).
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from database import create_tables, engine
+from models import user, room, room_member, message, message_reaction  # noqa: F401 (create_tables용 모델 등록)
+from utils.search import message_search
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="메시지 전문 검색 인덱스 생성")
+    parser.add_argument("--check", action="store_true", help="생성하지 않고 있는지만 확인")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if not args.check:
+        create_tables()
+        message_search.create_index(engine)
+    message_search.check(engine)
+    print(f"search mode={message_search.mode} index_ready={message_search.index_ready}")
+    return 0 if message_search.index_ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+# backend/migrations/user_indexes.py
+"""사용자 검색용 users.name, users.department 인덱스 추가 (기존 DB에 한 번, 워커를 띄우기 전에 실행)
+
+  cd backend
+  python -m migrations.user_indexes              # 없으면 생성
+  python -m migrations.user_indexes --dry-run    # 실행할 CREATE INDEX 문만 출력
+
+인덱스가 없으면 GET /users/?q= 접두어 검색(이름/이메일/부서)이 users 전체를 훑는다.
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from database import engine
+from models.user import User
+from migrations.indexes import create_indexes
+
+INDEXES = [index for index in User.__table__.indexes if index.name in ("ix_users_name", "ix_users_department")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사용자 검색 인덱스 추가")
+    parser.add_argument("--dry-run", action="store_true", help="실행할 CREATE INDEX 문만 출력")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if not create_indexes(engine, INDEXES, dry_run=args.dry_run):
+        logging.getLogger(__name__).info("추가할 인덱스가 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,15 @@
 # backend/models/message.py
-from sqlalchemy import Column, BigInteger, Text, Enum, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, BigInteger, Text, Enum, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
+from utils.snowflake import next_id
 
 class Message(Base):
     __tablename__ = "messages"
     
-    message_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # 앱에서 발급하는 시간순 ID (utils/snowflake.py) → INSERT 전에 ID를 알 수 있음
+    message_id = Column(BigInteger, primary_key=True, autoincrement=False, default=next_id)
     room_id = Column(BigInteger, ForeignKey('rooms.room_id'), nullable=False)
     user_id = Column(BigInteger, ForeignKey('users.user_id'), nullable=False)
     content = Column(Text, nullable=False)
@@ -21,4 +23,10 @@ class Message(Base):
     room = relationship("Room", back_populates="messages")
     user = relationship("User")
     reply_to = relationship("Message", remote_side=[message_id])
-    reactions = relationship("MessageReaction", back_populates="message", cascade="all, delete-orphan")
\ No newline at end of file
+    reactions = relationship("MessageReaction", back_populates="message", cascade="all, delete-orphan")
+    reaction_counts = relationship("MessageReactionCount", cascade="all, delete-orphan")
+    
+    # 방별 키셋 페이지네이션: (room_id, message_id) 범위 스캔
+    __table_args__ = (
+        Index('ix_messages_room_id_message_id', 'room_id', 'message_id'),
+    )
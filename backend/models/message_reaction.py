@@ -2,12 +2,12 @@
 from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database import Base
+from database import Base, BigIntPK
 
 class MessageReaction(Base):
     __tablename__ = "message_reactions"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     message_id = Column(BigInteger, ForeignKey('messages.message_id'), nullable=False)
     user_id = Column(BigInteger, ForeignKey('users.user_id'), nullable=False)
     emoji = Column(String(10), nullable=False)
@@ -20,4 +20,13 @@ class MessageReaction(Base):
     # 제약조건: 같은 사용자가 같은 메시지에 같은 이모지는 한 번만
     __table_args__ = (
         UniqueConstraint('user_id', 'message_id', 'emoji', name='unique_user_message_emoji'),
-    )
\ No newline at end of file
+    )
+
+
+class MessageReactionCount(Base):
+    """메시지별 이모지 반응 수 (반응 추가/취소 시 같은 트랜잭션에서 증감)"""
+    __tablename__ = "message_reaction_counts"
+
+    message_id = Column(BigInteger, ForeignKey('messages.message_id'), primary_key=True)
+    emoji = Column(String(10), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
@@ -2,19 +2,28 @@
 from sqlalchemy import Column, BigInteger, String, Text, Enum, DateTime, Boolean, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database import Base
+from datetime import datetime
+from database import Base, BigIntPK
 
 class Room(Base):
     __tablename__ = "rooms"
     
-    room_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    room_id = Column(BigIntPK, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     room_type = Column(Enum('public', 'private'), default='public')
     created_by = Column(BigInteger, ForeignKey('users.user_id'), nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    # 목록 최근 활동순 정렬에서 last_message_at(앱 시계, UTC)과 비교하므로 앱에서 같은 시계로 기록
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
+    # 누적 메시지 수 (안 읽은 메시지 수 = message_count - RoomMember.read_count)
+    message_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # 목록 조회용 요약 (참여/나가기, 메시지 저장 시 같은 트랜잭션에서 갱신)
+    member_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_message_id = Column(BigInteger, nullable=True)
+    last_message_preview = Column(String(200), nullable=True)
+    last_message_at = Column(DateTime, nullable=True)
     
     # 관계 설정
     creator = relationship("User", foreign_keys=[created_by])
@@ -2,17 +2,21 @@
 from sqlalchemy import Column, BigInteger, Enum, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database import Base
+from datetime import datetime
+from database import Base, BigIntPK
 
 class RoomMember(Base):
     __tablename__ = "room_members"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     room_id = Column(BigInteger, ForeignKey('rooms.room_id'), nullable=False)
     user_id = Column(BigInteger, ForeignKey('users.user_id'), nullable=False)
     role = Column(Enum('owner', 'admin', 'member'), default='member')
-    joined_at = Column(DateTime, server_default=func.now())
-    last_read_at = Column(DateTime, server_default=func.now())
+    # 메시지 created_at(앱 시계, UTC)과 비교하므로 DB NOW()가 아닌 앱에서 같은 시계로 기록
+    joined_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    last_read_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    # 읽음 처리 시점의 Room.message_count (본인 메시지도 읽은 것으로 더함)
+    read_count = Column(BigInteger, nullable=False, default=0, server_default="0")
     
     # 관계 설정
     room = relationship("Room", back_populates="members")
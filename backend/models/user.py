@@ -1,7 +1,7 @@
 # backend/models/user.py
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, BigInteger, Enum
 from sqlalchemy.sql import func
-from database import Base
+from database import Base, BigIntPK
 import enum
 
 # 상태 값 정의
@@ -13,11 +13,11 @@ class UserStatus(enum.Enum):
 class User(Base):
     __tablename__ = "users"
     
-    user_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
-    name = Column(String(255), nullable=False)
+    user_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(255), nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password = Column(String(255), nullable=False)
-    department = Column(String(255), nullable=True)
+    department = Column(String(255), nullable=True, index=True)
     role = Column(String(255), default="user")
 
 
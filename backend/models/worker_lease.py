@@ -0,0 +1,11 @@
+# backend/models/worker_lease.py
+from sqlalchemy import Column, Integer, String, DateTime
+from database import Base
+
+class WorkerLease(Base):
+    """메시지 ID 워커 번호 임대 (프로세스마다 하나, 만료 전에 계속 갱신)"""
+    __tablename__ = "worker_leases"
+
+    worker_id = Column(Integer, primary_key=True, autoincrement=False)
+    holder = Column(String(255), nullable=False)  # 호스트명:PID:임의값
+    expires_at = Column(DateTime, nullable=False)  # 앱 시계(UTC) 기준
@@ -1,16 +1,21 @@
 # backend/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from schemas.user import UserUpdate 
 from typing import List
 
-from database import get_db
+from database import get_db, get_async_db
 from schemas.user import UserCreate, UserLogin, UserResponse
 from models.user import User
+from models.room_member import RoomMember
+from core.hashing import password_hasher, HashingBusy
+from utils.websocket_manager import manager
+from routers.users import DIRECTORY_VERSION
+from utils.read_cache import invalidate
 from core.security import (
-    verify_password, 
-    get_password_hash, 
     create_access_token,
     get_current_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -18,11 +23,20 @@ from core.security import (
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+def hashing_busy_exception() -> HTTPException:
+    """해싱 풀 포화 시 대기 대신 바로 돌려주는 응답"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 잠시 후 다시 시도해 주세요.",
+        headers={"Retry-After": "1"},
+    )
+
+# 회원가입/로그인은 bcrypt 대기 동안 스레드풀을 점유하지 않도록 비동기 세션 + 해싱 전용 프로세스 풀 사용
 @router.post("/register", response_model=UserResponse)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """회원가입"""
     # 이메일 중복 체크
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == user_data.email))).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -30,15 +44,20 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 사용자명 중복 체크
-    existing_username = db.query(User).filter(User.name == user_data.name).first()
+    existing_username = (await db.execute(select(User).where(User.name == user_data.name))).scalars().first()
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 사용중인 사용자명입니다."
         )
+    # bcrypt를 기다리는 동안 DB 커넥션을 풀에 반환
+    await db.commit()
     
     # 새 사용자 생성
-    hashed_password = get_password_hash(user_data.password)
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except HashingBusy:
+        raise hashing_busy_exception()
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -48,25 +67,41 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    manager.versions.bump(DIRECTORY_VERSION)
     
     return new_user
 
 @router.post("/login")
-def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login_user(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """로그인"""
     # 사용자 찾기
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = (await db.execute(select(User).where(User.email == login_data.email))).scalars().first()
+    
+    # bcrypt를 기다리는 동안 DB 커넥션을 풀에 반환 (expire_on_commit=False라 user는 그대로 사용)
+    await db.commit()
     
     # 사용자 존재 및 비밀번호 검증
-    if not user or not verify_password(login_data.password, user.password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(login_data.password, user.password)
+        except HashingBusy:
+            raise hashing_busy_exception()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # bcrypt 비용이 바뀐 경우 새 비용으로 다시 저장
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+        invalidate(users=[user.user_id])
+    
     # JWT 토큰 생성
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -136,6 +171,10 @@ def update_profile(
     # updated_at 필드 자동 업데이트 (모델에서 onupdate=func.now()로 설정했다면 자동)
     db.commit()
     db.refresh(current_user)
+    manager.versions.bump(DIRECTORY_VERSION)
+    # 사용자 상세/인증 사용자 캐시와 이 사용자가 속한 방의 멤버 목록(이름/이메일 포함) 캐시 무효화 (모든 워커)
+    room_ids = [room_id for room_id, in db.query(RoomMember.room_id).filter(RoomMember.user_id == current_user.user_id)]
+    invalidate(members=room_ids, users=[current_user.user_id])
     
     return current_user
 
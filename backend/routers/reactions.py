@@ -0,0 +1,43 @@
+# backend/routers/reactions.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from models.user import User
+from schemas.message import ReactionCreate, ReactionResponse
+from core.security import get_current_user
+from utils.reactions import ReactionError, apply_reaction
+
+router = APIRouter(prefix="/rooms", tags=["reactions"])
+
+
+async def _react(db: AsyncSession, room_id: int, message_id: int, user: User, emoji: str, added: bool) -> ReactionResponse:
+    try:
+        changed, count = await apply_reaction(db, room_id, message_id, user.user_id, emoji, added)
+    except ReactionError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc))
+    return ReactionResponse(message_id=str(message_id), emoji=emoji, count=count, changed=changed)
+
+
+@router.post("/{room_id}/messages/{message_id}/reactions", response_model=ReactionResponse)
+async def add_message_reaction(
+    room_id: int,
+    message_id: int,
+    reaction: ReactionCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """메시지에 반응 추가 (이미 누른 반응이면 changed=False)"""
+    return await _react(db, room_id, message_id, current_user, reaction.emoji, added=True)
+
+
+@router.delete("/{room_id}/messages/{message_id}/reactions/{emoji}", response_model=ReactionResponse)
+async def remove_message_reaction(
+    room_id: int,
+    message_id: int,
+    emoji: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """메시지 반응 취소"""
+    return await _react(db, room_id, message_id, current_user, emoji, added=False)
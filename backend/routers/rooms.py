@@ -1,31 +1,52 @@
 # backend/routers/rooms.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database import get_db
 from models.room import Room
 from models.room_member import RoomMember
-from schemas.room import RoomCreate, RoomResponse
+from models.message import Message
+from schemas.room import RoomCreate, RoomListItem, RoomResponse
+from schemas.message import MessagePage
 from core.security import get_current_user
 from models.user import User
+from utils.unread import unread_count_column, change_member_count, mark_room_read, recompute_unread_counts
+from utils.websocket_manager import manager
+from utils.reactions import reaction_counts
+from utils.read_cache import read_cache, invalidate
+from utils.versions import members_version, room_version
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 
-@router.get("/", response_model=List[RoomResponse])  
+@router.get("/", response_model=List[RoomListItem])  
 def get_user_rooms(
+    sort: str = Query("activity", pattern="^(activity|name|created)$", description="activity: 최근 메시지순, name: 이름순, created: 생성순"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """사용자가 속한 채팅방 목록"""
-    rooms = (
-        db.query(Room)
+    """사용자가 속한 채팅방 목록 (멤버 수, 마지막 메시지, 내 역할, 안 읽은 메시지 수 포함, 쿼리 1회)
+
+    멤버 수와 마지막 메시지는 rooms 테이블의 요약 컬럼이라 집계 없이 조인 한 번으로 끝난다.
+    """
+    query = (
+        db.query(Room, RoomMember.role, unread_count_column())
         .join(RoomMember)
         .filter(RoomMember.user_id == current_user.user_id)
         .filter(Room.is_active == True)
-        .all()
     )
-    return rooms
+    if sort == "activity":
+        # 메시지가 없는 방은 생성 시각 기준
+        query = query.order_by(func.coalesce(Room.last_message_at, Room.created_at).desc(), Room.room_id.desc())
+    elif sort == "name":
+        query = query.order_by(Room.name.asc(), Room.room_id.asc())
+    else:
+        query = query.order_by(Room.room_id.desc())
+    return [
+        RoomListItem.model_validate(room).model_copy(update={"unread_count": max(unread, 0), "my_role": role})
+        for room, role, unread in query.all()
+    ]
 
 @router.post("/", response_model=RoomResponse)
 def create_room(
@@ -39,7 +60,8 @@ def create_room(
         name=room_data.name,
         description=room_data.description,
         room_type=room_data.room_type,
-        created_by=current_user.user_id
+        created_by=current_user.user_id,
+        member_count=1
     )
     
     db.add(new_room)
@@ -55,38 +77,63 @@ def create_room(
     
     db.add(room_member)
     db.commit()
+    manager.membership_changed("add", new_room.room_id, current_user.user_id)
+    # 생성 전에 같은 ID로 조회해서 캐시된 "멤버 아님"/404 결과 무효화
+    invalidate(rooms=[new_room.room_id], members=[new_room.room_id])
     
     return new_room
 
+@router.post("/unread/recompute")
+def recompute_unread(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """안 읽은 메시지 수 재계산 (카운터가 어긋났을 때 복구용)"""
+    updated = recompute_unread_counts(db, current_user.user_id)
+    return {"message": f"{updated}개 채팅방의 안 읽은 메시지 수를 다시 계산했습니다."}
+
+def _is_member(db: Session, room_id: int, user_id: int) -> bool:
+    """방 멤버 여부 (멤버 변경 시까지 캐시)"""
+    return read_cache.get(
+        ("member", room_id, user_id),
+        members_version(room_id),
+        lambda: db.query(RoomMember.id)
+        .filter(RoomMember.room_id == room_id)
+        .filter(RoomMember.user_id == user_id)
+        .first() is not None,
+    )
+
 @router.get("/{room_id}", response_model=RoomResponse)
 def get_room_info(
     room_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """특정 채팅방 정보 조회"""
+    """특정 채팅방 정보 조회 (캐시 적중 시 DB 조회 없음, ETag/Last-Modified로 304 지원)"""
     # 사용자가 해당 채팅방의 멤버인지 확인
-    member = (
-        db.query(RoomMember)
-        .filter(RoomMember.room_id == room_id)
-        .filter(RoomMember.user_id == current_user.user_id)
-        .first()
-    )
-    
-    if not member:
+    if not _is_member(db, room_id, current_user.user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="해당 채팅방에 접근 권한이 없습니다."
         )
     
-    room = db.query(Room).filter(Room.room_id == room_id).first()
-    if not room or not room.is_active:
+    def load_room():
+        room = db.query(Room).filter(Room.room_id == room_id).first()
+        if not room or not room.is_active:
+            return None
+        return RoomResponse.model_validate(room).model_dump(mode="json")
+
+    response = read_cache.response(
+        ("room", room_id), room_version(room_id), load_room, if_none_match, if_modified_since
+    )
+    if response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="채팅방을 찾을 수 없습니다."
         )
-    
-    return room
+    return response
 
 @router.post("/{room_id}/join")
 def join_room(
@@ -121,18 +168,45 @@ def join_room(
             detail="비공개 채팅방은 초대받은 사용자만 참여할 수 있습니다."
         )
     
-    # 멤버 추가
+    # 멤버 추가 (참여 전 메시지는 읽은 것으로 처리)
     new_member = RoomMember(
         room_id=room_id,
         user_id=current_user.user_id,
-        role='member'
+        role='member',
+        read_count=room.message_count
     )
     
     db.add(new_member)
+    change_member_count(db, room_id, 1)
     db.commit()
+    invalidate(rooms=[room_id], members=[room_id])
+    manager.membership_changed("add", room_id, current_user.user_id)
     
     return {"message": f"'{room.name}' 채팅방에 참여했습니다."}
 
+@router.post("/{room_id}/read")
+def read_room(
+    room_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """채팅방 읽음 처리"""
+    member = (
+        db.query(RoomMember)
+        .filter(RoomMember.room_id == room_id)
+        .filter(RoomMember.user_id == current_user.user_id)
+        .first()
+    )
+    
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 채팅방의 멤버가 아닙니다."
+        )
+    
+    mark_room_read(db, member)
+    return {"unread_count": 0}
+
 @router.post("/{room_id}/leave")
 def leave_room(
     room_id: int,
@@ -163,7 +237,10 @@ def leave_room(
     
     # 멤버 제거
     db.delete(member)
+    change_member_count(db, room_id, -1)
     db.commit()
+    invalidate(rooms=[room_id], members=[room_id])
+    manager.membership_changed("remove", room_id, current_user.user_id)
     
     return {"message": "채팅방에서 나갔습니다."}
 
@@ -184,6 +261,8 @@ def delete_room(
 
     db.delete(room)
     db.commit()
+    invalidate(rooms=[room_id], members=[room_id])
+    manager.membership_changed("drop", room_id)
     return {"message": f"채팅방 '{room.name}' 이 삭제되었습니다."}
 
 
@@ -191,10 +270,64 @@ def delete_room(
 @router.get("/{room_id}/members")
 def get_room_members(
     room_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """채팅방 멤버 목록 (캐시 적중 시 DB 조회 없음, ETag/Last-Modified로 304 지원)"""
+    # 사용자가 해당 채팅방의 멤버인지 확인
+    if not _is_member(db, room_id, current_user.user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="해당 채팅방에 접근 권한이 없습니다."
+        )
+    
+    def load_members():
+        members = (
+            db.query(RoomMember, User)
+            .join(User, RoomMember.user_id == User.user_id)
+            .filter(RoomMember.room_id == room_id)
+            .all()
+        )
+        
+        member_list = []
+        for member_info, user_info in members:
+            member_list.append({
+                "user_id": user_info.user_id,
+                "name": user_info.name,
+                "email": user_info.email,
+                "role": member_info.role,
+                "joined_at": member_info.joined_at
+            })
+        
+        return {"members": member_list}
+
+    return read_cache.response(
+        ("members", room_id), members_version(room_id), load_members, if_none_match, if_modified_since
+    )
+
+
+@router.get("/{room_id}/messages", response_model=MessagePage)
+def get_room_messages(
+    room_id: int,
+    before: Optional[int] = Query(None, description="이 메시지 ID보다 오래된 메시지"),
+    after: Optional[int] = Query(None, description="이 메시지 ID보다 최신 메시지"),
+    limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """채팅방 멤버 목록"""
+    """채팅방 메시지 이력 (키셋 페이지네이션)
+
+    (room_id, message_id) 인덱스 범위 스캔만 하므로 방의 메시지 수와 관계없이
+    페이지 조회 비용이 일정하다. 커서 없이 호출하면 최신 페이지를 반환한다.
+    """
+    if before is not None and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before와 after는 동시에 사용할 수 없습니다."
+        )
+
     # 사용자가 해당 채팅방의 멤버인지 확인
     member = (
         db.query(RoomMember)
@@ -202,29 +335,53 @@ def get_room_members(
         .filter(RoomMember.user_id == current_user.user_id)
         .first()
     )
-    
+
     if not member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="해당 채팅방에 접근 권한이 없습니다."
         )
-    
-    # 멤버 목록 조회
-    members = (
-        db.query(RoomMember, User)
-        .join(User, RoomMember.user_id == User.user_id)
-        .filter(RoomMember.room_id == room_id)
-        .all()
+
+    query = (
+        db.query(Message, User.name)
+        .join(User, Message.user_id == User.user_id)
+        .filter(Message.room_id == room_id)
+        .filter(Message.is_deleted == False)
     )
-    
-    member_list = []
-    for member_info, user_info in members:
-        member_list.append({
-            "user_id": user_info.user_id,
-            "name": user_info.name,
-            "email": user_info.email,
-            "role": member_info.role,
-            "joined_at": member_info.joined_at
-        })
-    
-    return {"members": member_list}
\ No newline at end of file
+    # 한 건 더 읽어서 다음 페이지 존재 여부 판단
+    if after is not None:
+        rows = query.filter(Message.message_id > after).order_by(Message.message_id.asc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        has_older, has_newer = True, has_more
+    else:
+        if before is not None:
+            query = query.filter(Message.message_id < before)
+        rows = query.order_by(Message.message_id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        has_older, has_newer = has_more, before is not None
+
+    # 페이지 전체의 반응 수를 한 번에 조회
+    counts = reaction_counts(db, [message.message_id for message, _ in rows])
+
+    messages = [
+        {
+            "message_id": str(message.message_id),
+            "room_id": message.room_id,
+            "sender": {"id": message.user_id, "name": sender_name},
+            "content": message.content,
+            "message_type": message.message_type,
+            "reply_to_message_id": str(message.reply_to_message_id) if message.reply_to_message_id else None,
+            "created_at": message.created_at,
+            "updated_at": message.updated_at,
+            "reactions": counts.get(message.message_id, {}),
+        }
+        for message, sender_name in rows
+    ]
+
+    return {
+        "messages": messages,
+        "before_cursor": messages[0]["message_id"] if messages and has_older else None,
+        "after_cursor": messages[-1]["message_id"] if messages and has_newer else None,
+    }
@@ -0,0 +1,68 @@
+# backend/routers/search.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database import get_db
+from models.message import Message
+from models.user import User
+from schemas.message import MessageSearchPage
+from core.security import get_current_user
+from utils.reactions import reaction_counts
+from utils.search import message_search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/messages", response_model=MessageSearchPage)
+def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어 (공백으로 구분한 단어를 모두 포함)"),
+    room_id: Optional[int] = Query(None, description="특정 채팅방으로 한정"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """참여 중인 채팅방의 메시지 전문 검색 (관련도순)"""
+    if not q.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="검색어를 입력하세요.")
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부 판단
+    hits = message_search.search(db, current_user.user_id, q, room_id=room_id, limit=limit + 1, offset=offset)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    ids = [message_id for message_id, _ in hits]
+    rows = {
+        message.message_id: (message, sender_name)
+        for message, sender_name in (
+            db.query(Message, User.name)
+            .join(User, Message.user_id == User.user_id)
+            .filter(Message.message_id.in_(ids))
+            .filter(Message.is_deleted == False)
+            .all()
+        )
+    } if ids else {}
+    counts = reaction_counts(db, rows)
+
+    messages = []
+    for message_id, score in hits:
+        if message_id not in rows:
+            continue
+        message, sender_name = rows[message_id]
+        messages.append({
+            "message_id": str(message.message_id),
+            "room_id": message.room_id,
+            "sender": {"id": message.user_id, "name": sender_name},
+            "content": message.content,
+            "message_type": message.message_type,
+            "reply_to_message_id": str(message.reply_to_message_id) if message.reply_to_message_id else None,
+            "created_at": message.created_at,
+            "updated_at": message.updated_at,
+            "reactions": counts.get(message.message_id, {}),
+            "score": score,
+        })
+
+    return {
+        "messages": messages,
+        "next_offset": offset + limit if has_more else None,
+    }
@@ -1,31 +1,111 @@
 # backend/routers/users.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database import get_db
 from models.user import User
 from schemas.user import UserResponse
 from core.security import get_current_user
+from utils.codec import json_codec
+from utils.snowflake import datetime_to_id
+from utils.read_cache import read_cache
+from utils.versions import etag_matches, make_etag, user_version
+from utils.websocket_manager import manager
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# 사용자 목록 ETag용 버전 (가입/프로필 변경 → directory, 상태 저장 → user_status)
+DIRECTORY_VERSION = "directory"
+STATUS_VERSION = "user_status"
+STATUS_FIELDS = {"status", "status_message"}
+USER_FIELDS = tuple(UserResponse.model_fields)
+
+def _directory_versions(db: Session):
+    """현재 버전 (워커 시작 후 처음에는 DB에서 초기값을 읽어 모든 워커가 같은 값에서 출발)"""
+    directory = manager.versions.get(DIRECTORY_VERSION)
+    user_status = manager.versions.get(STATUS_VERSION)
+    if directory is None or user_status is None:
+        count, latest = db.query(func.count(User.user_id), func.max(User.updated_at)).one()
+        seed = (datetime_to_id(latest) if latest else 0) + count % (1 << 22)
+        manager.versions.observe(DIRECTORY_VERSION, seed)
+        manager.versions.observe(STATUS_VERSION, seed)
+        directory = manager.versions.get(DIRECTORY_VERSION)
+        user_status = manager.versions.get(STATUS_VERSION)
+    return directory, user_status
+
 @router.get("/", response_model=List[UserResponse])
 def list_users(
+    q: Optional[str] = Query(None, max_length=100, description="이름/이메일/부서 접두어 검색"),
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: user_id,name,status)"),
+    cursor: Optional[int] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    limit: int = Query(200, ge=1, le=1000),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # 인증된 사용자만 접근
 ):
-    """모든 사용자 목록 조회"""
-    return db.query(User).all()
+    """사용자 목록 조회 (user_id 순 커서 페이지네이션, 다음 커서는 X-Next-Cursor 헤더)
+
+    응답 형태는 기존과 같은 사용자 배열이고, fields로 필요한 필드만 받을 수 있다.
+    목록이 바뀌지 않았으면 If-None-Match에 대해 DB 조회 없이 304를 돌려준다.
+    """
+    selected = USER_FIELDS
+    if fields:
+        selected = tuple(field for field in USER_FIELDS if field in {f.strip() for f in fields.split(",")})
+        if not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"fields는 다음 중에서 선택하세요: {', '.join(USER_FIELDS)}"
+            )
+
+    directory, user_status = _directory_versions(db)
+    etag = make_etag(
+        directory,
+        user_status if STATUS_FIELDS & set(selected) else "-",
+        ",".join(selected), q or "", cursor or "", limit,
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # 커서 계산을 위해 user_id는 항상 조회
+    columns = [getattr(User, field) for field in dict.fromkeys(("user_id",) + selected)]
+    query = db.query(*columns)
+    if q:
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%"
+        query = query.filter(or_(
+            User.name.like(pattern, escape="\\"),
+            User.email.like(pattern, escape="\\"),
+            User.department.like(pattern, escape="\\"),
+        ))
+    if cursor is not None:
+        query = query.filter(User.user_id > cursor)
+    rows = query.order_by(User.user_id.asc()).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1].user_id)
+
+    # Pydantic 검증 없이 필요한 필드만 바로 직렬화
+    users = [{field: getattr(row, field) for field in selected} for row in rows]
+    return Response(content=json_codec.encode(users), media_type="application/json", headers=headers)
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """특정 사용자 조회"""
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
+    """특정 사용자 조회 (캐시 적중 시 DB 조회 없음, ETag/Last-Modified로 304 지원)"""
+    def load_user():
+        user = db.query(User).filter(User.user_id == user_id).first()
+        return UserResponse.model_validate(user).model_dump(mode="json") if user else None
+
+    response = read_cache.response(("user", user_id), user_version(user_id), load_user, if_none_match, if_modified_since)
+    if response is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
-    return user
+    return response
@@ -1,114 +1,147 @@
+# main.py에 등록되지 않은 이전 /ws 라우터 (실제 엔드포인트는 routers/ws.py, 프레임 처리 공용 함수는 utils/frames.py)
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.orm import Session
 from core.security import get_current_user_ws
 from utils.websocket_manager import manager
+from utils.sql_profiler import profile
+from utils.codec import receive_frame
+from utils.frames import (
+    MESSAGE_MAX_LENGTH,
+    ROOM_FRAME_TYPES,
+    frame_id,
+    handle_reaction,
+    message_content,
+    notify_forbidden,
+    notify_invalid,
+    notify_message_failed,
+)
+from utils.message_writer import message_writer, MessageWriterFull, MessageWriterClosed
+from utils.snowflake import WorkerIdUnavailable, next_id, id_to_datetime
 from models.user import User
-from models.message import Message
-from database import get_db
 from typing import Any, Dict
-import json
+from functools import partial
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+
 @router.websocket("")
 async def websocket_endpoint(
     websocket: WebSocket,
-    user: User = Depends(get_current_user_ws),
-    db: Session = Depends(get_db)
+    user: User = Depends(get_current_user_ws)
 ):
-    # 연결 수락 및 등록
+    # 연결 수락 및 등록 (presence는 매니저가 묶어서 전송)
     await manager.connect(user.user_id, websocket)
-    # presence 브로드캐스트
-    await manager.broadcast_all({"type": "presence", "userId": user.user_id, "status": "online"})
+    # 연결 시 협상한 코덱 (기본 JSON 텍스트, chat.msgpack이면 바이너리)
+    codec = manager.codec_of(websocket)
 
     try:
         while True:
-            text = await websocket.receive_text()
-            try:
-                msg: Dict[str, Any] = json.loads(text)
-            except Exception:
+            msg: Dict[str, Any] = await receive_frame(websocket, codec)
+            if not isinstance(msg, dict):
                 continue
 
             mtype = msg.get("type")
+            # 방 대상 프레임은 roomId 형식부터 확인 (잘못된 값으로 루프가 끝나지 않도록)
+            room_id = None
+            if mtype in ROOM_FRAME_TYPES:
+                room_id = frame_id(msg, "roomId")
+                if room_id is None:
+                    await notify_invalid(websocket, None, "roomId가 올바르지 않습니다.")
+                    continue
+
+            # 프레임 처리 중 실행된 SQL 집계 (SQL_PROFILE=true일 때만)
+            with profile(f"ws:{mtype}"):
+                # 1) 상태 업데이트
+                if mtype == "status_update":
+                    status_val = msg.get("status", "online")
+                    status_msg = msg.get("statusMessage", "")
+
+                    # 메모리에 업데이트 (presence_diff 전송과 DB 저장은 매니저가 묶어서 처리)
+                    manager.set_status(user.user_id, status_val, status_msg)
+
+                # 2) 방 참가
+                elif mtype == "join_room":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+                    await manager.join_room(room_id, websocket)
+                    await manager.broadcast_room(room_id, {
+                        "type": "system",
+                        "roomId": room_id,
+                        "message": f"{user.name} 님이 입장했습니다."
+                    })
+
+                # 3) 방 퇴장
+                elif mtype == "leave_room":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+                    # 구독하지 않은 방에는 퇴장 알림을 보내지 않음
+                    if not manager.leave_room(room_id, websocket):
+                        continue
+                    await manager.broadcast_room(room_id, {
+                        "type": "system",
+                        "roomId": room_id,
+                        "message": f"{user.name} 님이 퇴장했습니다."
+                    })
+
+                # 4) 메시지 전송 (방 브로드캐스트)
+                elif mtype == "message":
+                    content = message_content(msg)
+                    if content is None:
+                        await notify_invalid(websocket, room_id, f"메시지는 1~{MESSAGE_MAX_LENGTH}자 문자열이어야 합니다.")
+                        continue
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+
+                    client_id = msg.get("clientId")
+                    # ID와 시각을 앱에서 정하므로 DB 왕복 없이 바로 브로드캐스트 가능
+                    # DB 저장은 write-behind 배치에 맡기고 커밋을 기다리지 않고 브로드캐스트
+                    try:
+                        message_id = next_id()
+                        created_at = id_to_datetime(message_id)
+                        message_writer.submit(
+                            {
+                                "message_id": message_id,
+                                "room_id": room_id,
+                                "user_id": user.user_id,
+                                "content": content,
+                                "message_type": "text",
+                                "created_at": created_at,
+                            },
+                            on_error=partial(notify_message_failed, websocket, room_id, client_id),
+                        )
+                    except (MessageWriterFull, MessageWriterClosed, WorkerIdUnavailable) as exc:
+                        await notify_message_failed(websocket, room_id, client_id, exc)
+                        continue
+
+                    await manager.broadcast_room(room_id, {
+                        "type": "message",
+                        "roomId": room_id,
+                        "messageId": str(message_id),
+                        "clientId": client_id,
+                        "sender": {"id": user.user_id, "name": user.name},
+                        "content": content,
+                        "createdAt": str(created_at)
+                    })
+                    await manager.typing.update(room_id, user.user_id, user.name, typing=False)
+
+                # 5) 반응 추가/취소
+                elif mtype == "reaction":
+                    await handle_reaction(websocket, user, room_id, msg)
+
+                # 6) 입력 중 표시 (방별로 모아서 주기적으로 전송)
+                elif mtype == "typing":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        continue
+                    await manager.typing.update(room_id, user.user_id, user.name, typing=bool(msg.get("typing", True)))
 
-            # 1) 상태 업데이트
-            if mtype == "status_update":
-                status_val = msg.get("status", "online")
-                status_msg = msg.get("statusMessage", "")
-
-                # 메모리에 업데이트
-                manager.user_status[user.user_id] = status_val
-
-                # DB에도 반영
-                db_user = db.query(User).filter(User.user_id == user.user_id).first()
-                if db_user:
-                    db_user.status = status_val
-                    db_user.status_message = status_msg
-                    db.commit()
-                    db.refresh(db_user)
-
-                # 브로드캐스트
-                await manager.broadcast_all({
-                    "type": "presence",
-                    "userId": user.user_id,
-                    "status": status_val,
-                    "statusMessage": status_msg
-                })
-
-            # 2) 방 참가
-            elif mtype == "join_room":
-                room_id = int(msg["roomId"])
-                await manager.join_room(room_id, websocket)
-                await manager.broadcast_room(room_id, {
-                    "type": "system",
-                    "roomId": room_id,
-                    "message": f"{user.name} 님이 입장했습니다."
-                })
-
-            # 3) 방 퇴장
-            elif mtype == "leave_room":
-                room_id = int(msg["roomId"])
-                manager.leave_room(room_id, websocket)
-                await manager.broadcast_room(room_id, {
-                    "type": "system",
-                    "roomId": room_id,
-                    "message": f"{user.name} 님이 퇴장했습니다."
-                })
-
-            # 4) 메시지 전송 (방 브로드캐스트)
-            elif mtype == "message":
-                room_id = int(msg["roomId"])
-                content = msg["content"]
-
-                # DB 저장
-                new_msg = Message(
-                    room_id=room_id,
-                    user_id=user.user_id,
-                    content=content,
-                    message_type="text"
-                )
-                db.add(new_msg)
-                db.commit()
-                db.refresh(new_msg)
-
-                await manager.broadcast_room(room_id, {
-                    "type": "message",
-                    "roomId": room_id,
-                    "messageId": new_msg.message_id,
-                    "sender": {"id": user.user_id, "name": user.name},
-                    "content": content,
-                    "createdAt": str(new_msg.created_at)
-                })
-
-            # 5) 핑/퐁
-            elif mtype == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                # 7) 핑/퐁
+                elif mtype == "ping":
+                    await manager.send_personal(websocket, {"type": "pong"})
 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # 예외로 루프가 끝나도 연결 정리
         manager.disconnect(user.user_id, websocket)
-        if manager.user_status.get(user.user_id) == "offline":
-            await manager.broadcast_all({
-                "type": "presence",
-                "userId": user.user_id,
-                "status": "offline"
-            })
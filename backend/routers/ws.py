@@ -1,119 +1,189 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.orm import Session
 from core.security import get_current_user_ws
 from utils.websocket_manager import manager
+from utils.sql_profiler import profile
+from utils.codec import json_codec, receive_frame
+from utils.frames import (
+    MESSAGE_MAX_LENGTH,
+    ROOM_FRAME_TYPES,
+    frame_id,
+    handle_reaction,
+    message_content,
+    notify_forbidden,
+    notify_invalid,
+    notify_message_failed,
+)
+from utils.message_writer import message_writer, MessageWriterFull, MessageWriterClosed
+from utils.snowflake import WorkerIdUnavailable, next_id, id_to_datetime
 from models.user import User
-from database import get_db
-from typing import Any, Dict
-import json
+from models.message import Message
+from database import AsyncSessionLocal
+from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+
+def message_frame(
+    room_id: int,
+    message_id: int,
+    sender_id: int,
+    sender_name: str,
+    content: str,
+    created_at: datetime,
+    client_id: Optional[str] = None,
+) -> dict:
+    """채팅 메시지 프레임 (실시간 전송과 최근 이력이 같은 형태를 쓰도록 한 곳에서 생성)"""
+    return {
+        "type": "message",
+        "roomId": room_id,
+        "messageId": str(message_id),
+        "clientId": client_id,
+        "sender": {"id": sender_id, "name": sender_name},
+        "content": content,
+        "createdAt": str(created_at)
+    }
+
+
+async def load_recent_messages(room_id: int, limit: int) -> List[Tuple[int, str]]:
+    """최근 메시지 캐시 미스 시 DB에서 마지막 limit개를 읽어 직렬화 (오래된 순)"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Message, User.name)
+            .join(User, Message.user_id == User.user_id)
+            .where(Message.room_id == room_id, Message.is_deleted == False)
+            .order_by(Message.message_id.desc())
+            .limit(limit)
+        )
+        rows = result.all()
+    return [
+        (
+            message.message_id,
+            json_codec.encode(
+                message_frame(room_id, message.message_id, message.user_id, sender_name, message.content, message.created_at)
+            ),
+        )
+        for message, sender_name in reversed(rows)
+    ]
+
+
 @router.websocket("")
 async def websocket_endpoint(
     websocket: WebSocket,
-    user: User = Depends(get_current_user_ws),
-    db: Session = Depends(get_db)
+    user: User = Depends(get_current_user_ws)
 ):
-    # 연결 수락 및 등록
+    # 연결 수락 및 등록 (online 상태는 매니저가 presence 전송과 DB 저장을 묶어서 처리)
     await manager.connect(user.user_id, websocket)
-
-    # ✅ 접속 시 DB 상태 online 반영
-    db_user = db.query(User).filter(User.user_id == user.user_id).first()
-    if db_user:
-        db_user.status = "online"
-        db.commit()
-        db.refresh(db_user)
-
-    # 다른 클라이언트에게 브로드캐스트
-    await manager.broadcast_all({
-        "type": "presence",
-        "userId": user.user_id,
-        "status": "online"
-    })
+    # 연결 시 협상한 코덱 (기본 JSON 텍스트, chat.msgpack이면 바이너리)
+    codec = manager.codec_of(websocket)
 
     try:
         while True:
-            text = await websocket.receive_text()
-            try:
-                msg: Dict[str, Any] = json.loads(text)
-            except Exception:
+            msg: Dict[str, Any] = await receive_frame(websocket, codec)
+            if not isinstance(msg, dict):
                 continue
 
             mtype = msg.get("type")
-
-            # === 상태 업데이트 ===
-            if mtype == "status_update":
-                status_val = msg.get("status", "online")
-                manager.user_status[user.user_id] = status_val
-
-                # ✅ DB 업데이트
-                db_user = db.query(User).filter(User.user_id == user.user_id).first()
-                if db_user:
-                    db_user.status = status_val
-                    db.commit()
-                    db.refresh(db_user)
-
-                await manager.broadcast_all({
-                    "type": "presence",
-                    "userId": user.user_id,
-                    "status": status_val
-                })
-
-            # === 방 참가 ===
-            elif mtype == "join_room":
-                room_id = int(msg["roomId"])
-                await manager.join_room(room_id, websocket)
-                await manager.broadcast_room(room_id, {
-                    "type": "room_update",
-                    "roomId": room_id,
-                    "message": f"{user.name} 님이 입장했습니다."
-                })
-
-            # === 방 퇴장 ===
-            elif mtype == "leave_room":
-                room_id = int(msg["roomId"])
-                manager.leave_room(room_id, websocket)
-                await manager.broadcast_room(room_id, {
-                    "type": "room_update",
-                    "roomId": room_id,
-                    "message": f"{user.name} 님이 퇴장했습니다."
-                })
-
-            # === 메시지 전송 ===
-            elif mtype == "message":
-                room_id = int(msg["roomId"])
-                content = msg["content"]
-
-                # ✅ 여기서도 DB 저장 가능 (messages 테이블)
-                # new_msg = Message(room_id=room_id, user_id=user.user_id, content=content)
-                # db.add(new_msg)
-                # db.commit()
-
-                await manager.broadcast_room(room_id, {
-                    "type": "message",
-                    "roomId": room_id,
-                    "sender": {"id": user.user_id, "name": user.name},
-                    "content": content
-                })
-
-            # === Ping/Pong ===
-            elif mtype == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+            # 방 대상 프레임은 roomId 형식부터 확인 (잘못된 값으로 루프가 끝나지 않도록)
+            room_id = None
+            if mtype in ROOM_FRAME_TYPES:
+                room_id = frame_id(msg, "roomId")
+                if room_id is None:
+                    await notify_invalid(websocket, None, "roomId가 올바르지 않습니다.")
+                    continue
+
+            # 프레임 처리 중 실행된 SQL 집계 (SQL_PROFILE=true일 때만)
+            with profile(f"ws:{mtype}"):
+                # === 상태 업데이트 ===
+                if mtype == "status_update":
+                    status_val = msg.get("status", "online")
+                    # presence 전송과 DB 저장은 매니저가 묶어서 처리
+                    manager.set_status(user.user_id, status_val)
+
+                # === 방 참가 ===
+                elif mtype == "join_room":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+                    await manager.join_room(room_id, websocket)
+                    # 최근 메시지 이력 전송 (대부분 메모리 캐시에서 바로 응답)
+                    await manager.send_room_history(websocket, room_id, load_recent_messages)
+                    await manager.broadcast_room(room_id, {
+                        "type": "room_update",
+                        "roomId": room_id,
+                        "message": f"{user.name} 님이 입장했습니다."
+                    })
+
+                # === 방 퇴장 ===
+                elif mtype == "leave_room":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+                    # 구독하지 않은 방에는 퇴장 알림을 보내지 않음
+                    if not manager.leave_room(room_id, websocket):
+                        continue
+                    await manager.broadcast_room(room_id, {
+                        "type": "room_update",
+                        "roomId": room_id,
+                        "message": f"{user.name} 님이 퇴장했습니다."
+                    })
+
+                # === 메시지 전송 ===
+                elif mtype == "message":
+                    content = message_content(msg)
+                    if content is None:
+                        await notify_invalid(websocket, room_id, f"메시지는 1~{MESSAGE_MAX_LENGTH}자 문자열이어야 합니다.")
+                        continue
+                    if not await manager.membership.check(room_id, user.user_id):
+                        await notify_forbidden(websocket, room_id)
+                        continue
+
+                    client_id = msg.get("clientId")
+                    # ID와 시각을 앱에서 정하므로 DB 왕복 없이 바로 브로드캐스트 가능
+                    # DB 저장은 write-behind 배치에 맡기고 커밋을 기다리지 않고 브로드캐스트
+                    try:
+                        message_id = next_id()
+                        created_at = id_to_datetime(message_id)
+                        message_writer.submit(
+                            {
+                                "message_id": message_id,
+                                "room_id": room_id,
+                                "user_id": user.user_id,
+                                "content": content,
+                                "message_type": "text",
+                                "created_at": created_at,
+                            },
+                            on_error=partial(notify_message_failed, websocket, room_id, client_id),
+                        )
+                    except (MessageWriterFull, MessageWriterClosed, WorkerIdUnavailable) as exc:
+                        await notify_message_failed(websocket, room_id, client_id, exc)
+                        continue
+
+                    await manager.broadcast_room(
+                        room_id,
+                        message_frame(room_id, message_id, user.user_id, user.name, content, created_at, client_id),
+                    )
+                    # 메시지를 보냈으면 입력 중 표시 해제
+                    await manager.typing.update(room_id, user.user_id, user.name, typing=False)
+
+                # === 반응 추가/취소 (변경분만 방에 브로드캐스트) ===
+                elif mtype == "reaction":
+                    await handle_reaction(websocket, user, room_id, msg)
+
+                # === 입력 중 (저장하지 않고 방별로 모아서 주기적으로 전송) ===
+                elif mtype == "typing":
+                    if not await manager.membership.check(room_id, user.user_id):
+                        continue
+                    await manager.typing.update(room_id, user.user_id, user.name, typing=bool(msg.get("typing", True)))
+
+                # === Ping/Pong ===
+                elif mtype == "ping":
+                    await manager.send_personal(websocket, {"type": "pong"})
 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # 예외로 루프가 끝나도 연결 정리 (모든 커넥션이 끊기면 매니저가 offline 처리)
         manager.disconnect(user.user_id, websocket)
-
-        # ✅ 모든 커넥션 끊기면 offline 처리
-        if manager.user_status.get(user.user_id) == "offline":
-            db_user = db.query(User).filter(User.user_id == user.user_id).first()
-            if db_user:
-                db_user.status = "offline"
-                db.commit()
-                db.refresh(db_user)
-
-            await manager.broadcast_all({
-                "type": "presence",
-                "userId": user.user_id,
-                "status": "offline"
-            })
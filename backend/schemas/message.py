@@ -0,0 +1,40 @@
+# backend/schemas/message.py
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class MessageSender(BaseModel):
+    id: int
+    name: str
+
+class MessageResponse(BaseModel):
+    message_id: str                 # 64비트 ID → JS 정밀도 문제로 문자열
+    room_id: int
+    sender: MessageSender
+    content: str
+    message_type: str
+    reply_to_message_id: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    reactions: Dict[str, int] = {}  # 이모지 → 반응 수
+
+class MessagePage(BaseModel):
+    messages: List[MessageResponse]  # 오래된 순
+    before_cursor: Optional[str]     # 더 오래된 페이지 조회용 (?before=)
+    after_cursor: Optional[str]      # 더 최신 페이지 조회용 (?after=)
+
+class MessageSearchResult(MessageResponse):
+    score: float                     # 관련도 (클수록 관련 높음)
+
+class MessageSearchPage(BaseModel):
+    messages: List[MessageSearchResult]  # 관련도순
+    next_offset: Optional[int]       # 다음 페이지 조회용 (?offset=)
+
+class ReactionCreate(BaseModel):
+    emoji: str = Field(..., min_length=1, max_length=10)
+
+class ReactionResponse(BaseModel):
+    message_id: str
+    emoji: str
+    count: int                       # 변경 후 해당 이모지 반응 수
+    changed: bool                    # 이미 누른(없는) 반응이면 False
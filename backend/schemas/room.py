@@ -19,4 +19,12 @@ class RoomResponse(BaseModel):
     is_active: bool
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RoomListItem(RoomResponse):
+    """GET /rooms/ 목록 항목 (방 요약과 요청한 사용자 기준 값 포함)"""
+    unread_count: int = 0
+    member_count: int = 0
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    my_role: Optional[str] = None    # 요청한 사용자의 역할
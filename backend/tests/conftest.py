@@ -0,0 +1,72 @@
+# backend/tests/conftest.py
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import pytest
+
+# 앱 모듈은 import 시점에 환경변수를 읽으므로 가장 먼저 설정 (테스트 전용 SQLite 파일)
+_DB_DIR = tempfile.mkdtemp(prefix="chat-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("WORKER_ID", "1")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """앱 시작/종료 이벤트까지 실행하는 테스트 클라이언트 (세션당 1개)"""
+    from fastapi.testclient import TestClient
+    from database import create_tables
+    from main import app
+    from migrations.search_index import main as create_search_index
+
+    # 배포 절차와 같이 검색 인덱스는 앱 시작 전에 별도 명령으로 생성
+    create_tables()
+    assert create_search_index([]) == 0
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """가입 + 로그인 후 (user, token, headers) 반환"""
+    def _make_user(name: str = None):
+        name = name or f"u{uuid.uuid4().hex[:8]}"
+        email = f"{name}@example.com"
+        response = client.post("/auth/register", json={"name": name, "email": email, "password": "password1"})
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/login", json={"email": email, "password": "password1"})
+        assert response.status_code == 200, response.text
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        return client.get("/auth/me", headers=headers).json(), token, headers
+    return _make_user
+
+
+@pytest.fixture
+def send_messages(client):
+    """WS로 메시지를 보내고 DB에 저장될 때까지 기다린 뒤 메시지 ID 목록 반환 (보낸 순)"""
+    def _send_messages(token: str, headers: dict, room_id: int, contents) -> list:
+        contents = list(contents)
+        with client.websocket_connect(f"/ws?token={token}") as ws:
+            for content in contents:
+                ws.send_text(json.dumps({"type": "message", "roomId": room_id, "content": content}))
+            ws.send_text(json.dumps({"type": "ping"}))
+            while json.loads(ws.receive_text()).get("type") != "pong":
+                pass
+        # write-behind 저장 대기
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            page = client.get(f"/rooms/{room_id}/messages?limit=100", headers=headers).json()
+            ids = [m["message_id"] for m in page["messages"] if m["content"] in contents]
+            if len(ids) >= len(contents):
+                return ids
+            time.sleep(0.05)
+        raise AssertionError("메시지가 저장되지 않았습니다.")
+    return _send_messages
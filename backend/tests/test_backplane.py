@@ -0,0 +1,171 @@
+# backend/tests/test_backplane.py
+import asyncio
+
+import pytest
+
+from utils import backplane
+from utils.backplane import BackplaneError, RedisBackplane, _encode_command, _read_reply, create_backplane
+
+
+class FakeWriter:
+    """asyncio.StreamWriter 대역 (보낸 바이트 기록, fail=True면 drain에서 연결 끊김)"""
+
+    def __init__(self, fail: bool = False):
+        self.data = bytearray()
+        self.fail = fail
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.data += data
+
+    async def drain(self):
+        if self.fail:
+            raise ConnectionResetError("reset")
+
+    def close(self):
+        self.closed = True
+
+
+def _reader(*chunks: bytes, eof: bool = False) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    if eof:
+        reader.feed_eof()
+    return reader
+
+
+def _message(payload: bytes) -> bytes:
+    return b"*3\r\n$7\r\nmessage\r\n$14\r\nchat:broadcast\r\n$%d\r\n%s\r\n" % (len(payload), payload)
+
+
+SUBSCRIBED = b"*3\r\n$9\r\nsubscribe\r\n$14\r\nchat:broadcast\r\n:1\r\n"
+
+
+def test_encode_command():
+    assert _encode_command(b"PUBLISH", b"ch", b"hi") == b"*3\r\n$7\r\nPUBLISH\r\n$2\r\nch\r\n$2\r\nhi\r\n"
+
+
+def test_read_reply_types():
+    async def main():
+        reader = _reader(b"+OK\r\n:42\r\n$5\r\nhe\r\no\r\n$-1\r\n*2\r\n:1\r\n*1\r\n+x\r\n")
+        assert await _read_reply(reader) == "OK"
+        assert await _read_reply(reader) == 42
+        # 길이 기반이라 본문 안의 CRLF도 그대로
+        assert await _read_reply(reader) == b"he\r\no"
+        assert await _read_reply(reader) is None
+        assert await _read_reply(reader) == [1, ["x"]]
+        with pytest.raises(BackplaneError, match="NOAUTH"):
+            await _read_reply(_reader(b"-NOAUTH required\r\n"))
+        with pytest.raises(BackplaneError):
+            await _read_reply(_reader(b"?what\r\n"))
+        with pytest.raises(ConnectionError):
+            await _read_reply(_reader(eof=True))
+
+    asyncio.run(main())
+
+
+def _redis(connections) -> RedisBackplane:
+    """_open이 connections의 (reader, writer)를 차례로 돌려주는 백플레인"""
+    bp = RedisBackplane("redis://localhost:6379")
+    bp.RECONNECT_DELAY = 0
+    bp.opened = []
+
+    async def fake_open():
+        reader, writer = connections.pop(0)
+        bp.opened.append(writer)
+        return reader, writer
+
+    bp._open = fake_open
+    return bp
+
+
+def test_subscribe_delivers_messages_and_survives_handler_errors():
+    async def main():
+        received = []
+
+        async def handler(message):
+            if message.get("boom"):
+                raise RuntimeError("handler bug")
+            received.append(message)
+
+        writer = FakeWriter()
+        bp = _redis([(_reader(SUBSCRIBED, _message(b'{"boom":1}'), _message(b'{"op":"all"}')), writer)])
+        await bp.start(handler)
+        await asyncio.sleep(0.01)
+        assert received == [{"op": "all"}]
+        assert bytes(writer.data) == _encode_command(b"SUBSCRIBE", b"chat:broadcast")
+        await bp.close()
+
+    asyncio.run(main())
+
+
+def test_subscriber_reconnects_after_dropped_connection():
+    async def main():
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        first, second = FakeWriter(), FakeWriter()
+        bp = _redis([
+            (_reader(SUBSCRIBED, _message(b'{"n":1}'), eof=True), first),
+            (_reader(SUBSCRIBED, _message(b'{"n":2}')), second),
+        ])
+        await bp.start(handler)
+        await asyncio.sleep(0.01)
+        assert received == [{"n": 1}, {"n": 2}]
+        assert first.closed and bytes(second.data).startswith(b"*2\r\n$9\r\nSUBSCRIBE")
+        await bp.close()
+        assert second.closed
+
+    asyncio.run(main())
+
+
+def test_publish_reuses_connection_and_retries_once():
+    async def main():
+        healthy = FakeWriter()
+        bp = _redis([(_reader(b":1\r\n:1\r\n"), healthy)])
+        await bp.publish({"op": "all", "payload": {"a": 1}})
+        await bp.publish({"op": "all", "payload": {"a": 2}})
+        assert len(bp.opened) == 1
+        assert bytes(healthy.data).count(b"PUBLISH") == 2
+
+        # 끊긴 연결은 다시 열어서 한 번 재시도
+        broken, fresh = FakeWriter(fail=True), FakeWriter()
+        bp = _redis([(_reader(), broken), (_reader(b":0\r\n"), fresh)])
+        await bp.publish({"op": "all"})
+        assert broken.closed and b"PUBLISH" in fresh.data
+
+        # 두 번 연속 실패하면 예외, 다음 publish는 새 연결
+        bp = _redis([(_reader(), FakeWriter(fail=True)), (_reader(eof=True), FakeWriter()), (_reader(b":1\r\n"), FakeWriter())])
+        with pytest.raises(ConnectionError):
+            await bp.publish({"op": "all"})
+        assert bp._writer is None
+        await bp.publish({"op": "all"})
+        assert len(bp.opened) == 3
+
+    asyncio.run(main())
+
+
+def test_open_authenticates_with_password(monkeypatch):
+    async def main():
+        writer = FakeWriter()
+
+        async def open_connection(host, port):
+            assert (host, port) == ("redis.internal", 6380)
+            return _reader(b"+OK\r\n"), writer
+
+        monkeypatch.setattr(backplane.asyncio, "open_connection", open_connection)
+        bp = RedisBackplane("redis://:s3cret@redis.internal:6380")
+        await bp._open()
+        assert bytes(writer.data) == _encode_command(b"AUTH", b"s3cret")
+
+    asyncio.run(main())
+
+
+def test_create_backplane():
+    assert isinstance(create_backplane(None), backplane.LocalBackplane)
+    assert isinstance(create_backplane("unix:///tmp/redis.sock"), RedisBackplane)
+    with pytest.raises(ValueError):
+        create_backplane("amqp://broker")
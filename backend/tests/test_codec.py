@@ -0,0 +1,48 @@
+# backend/tests/test_codec.py
+import json
+
+import pytest
+
+# msgpack은 선택 의존성 (없으면 바이너리 모드 비활성)
+msgpack = pytest.importorskip("msgpack")
+
+from utils.codec import EncodedFrame, codec_for_subprotocol, json_codec, negotiate
+
+
+def test_negotiate_picks_first_supported_subprotocol():
+    assert negotiate(["chat.cbor", "chat.msgpack", "chat.json"]) == "chat.msgpack"
+    assert negotiate(["graphql-ws", "msgpack"]) is None
+    assert negotiate([]) is None
+    assert codec_for_subprotocol(None) is json_codec
+    assert codec_for_subprotocol("chat.msgpack").binary
+
+
+def test_encoded_frame_is_encoded_once_per_codec():
+    msgpack_codec = codec_for_subprotocol("chat.msgpack")
+    frame = EncodedFrame({"type": "message", "content": "안녕"})
+    data = frame.encode(json_codec)
+    assert frame.encode(json_codec) is data
+    assert json.loads(data) == msgpack.unpackb(frame.encode(msgpack_codec)) == frame.payload
+
+
+def test_msgpack_subprotocol_uses_binary_frames(client, make_user):
+    _, token, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "binary"}, headers=headers).json()["room_id"]
+    with client.websocket_connect(f"/ws?token={token}", subprotocols=["chat.msgpack", "chat.json"]) as ws:
+        assert ws.accepted_subprotocol == "chat.msgpack"
+        ws.send_bytes(msgpack.packb({"type": "join_room", "roomId": room_id}))
+        ws.send_bytes(msgpack.packb({"type": "message", "roomId": room_id, "content": "binary"}))
+        while True:
+            frame = msgpack.unpackb(ws.receive_bytes())
+            if frame.get("type") == "message":
+                break
+        assert frame["content"] == "binary" and frame["roomId"] == room_id
+
+
+def test_unknown_subprotocol_falls_back_to_json(client, make_user):
+    _, token, _ = make_user()
+    with client.websocket_connect(f"/ws?token={token}", subprotocols=["chat.cbor"]) as ws:
+        assert ws.accepted_subprotocol is None
+        ws.send_text(json.dumps({"type": "ping"}))
+        while json.loads(ws.receive_text()).get("type") != "pong":
+            pass
@@ -0,0 +1,87 @@
+# backend/tests/test_hashing.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from passlib.hash import bcrypt
+
+from core.hashing import BCRYPT_ROUNDS, HashingBusy, PasswordHasher, _verify_and_update
+
+
+def _blocking(event: threading.Event):
+    event.wait(5)
+    return "done"
+
+
+def _thread_hasher(**kwargs) -> PasswordHasher:
+    """프로세스 풀 대신 스레드 풀 (테스트에서 작업을 붙잡아 둘 수 있도록)"""
+    hasher = PasswordHasher(**kwargs)
+    hasher._executor = ThreadPoolExecutor(max_workers=2)
+    return hasher
+
+
+def test_saturated_hasher_rejects_instead_of_queueing():
+    async def main():
+        hasher = _thread_hasher(max_pending=1, timeout=5)
+        release = threading.Event()
+        running = asyncio.ensure_future(hasher._submit(_blocking, release))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HashingBusy):
+            await hasher._submit(_blocking, release)
+        assert hasher.rejected == 1 and hasher.pending == 1
+        release.set()
+        assert await running == "done"
+        assert hasher.pending == 0
+        hasher.shutdown()
+
+    asyncio.run(main())
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    async def main():
+        hasher = _thread_hasher(max_pending=1, timeout=0.05)
+        release = threading.Event()
+        with pytest.raises(HashingBusy):
+            await hasher._submit(_blocking, release)
+        # 포기했어도 작업이 끝나기 전에는 자리가 비지 않음
+        with pytest.raises(HashingBusy):
+            await hasher._submit(_blocking, release)
+        assert hasher.rejected == 2
+        release.set()
+        await asyncio.sleep(0.05)
+        assert hasher.pending == 0
+        hasher.shutdown()
+
+    asyncio.run(main())
+
+
+def test_verify_and_update_rehashes_when_rounds_change():
+    old = bcrypt.using(rounds=BCRYPT_ROUNDS + 1).hash("password1")
+    valid, new_hash = _verify_and_update("password1", old)
+    assert valid and new_hash is not None and bcrypt.from_string(new_hash).rounds == BCRYPT_ROUNDS
+    assert _verify_and_update("password1", new_hash) == (True, None)
+    assert _verify_and_update("wrong", old) == (False, None)
+
+
+def test_login_returns_503_when_hasher_is_saturated(client, make_user, monkeypatch):
+    from core.hashing import password_hasher
+
+    user, _, _ = make_user()
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+    response = client.post("/auth/login", json={"email": user["email"], "password": "password1"})
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_password_with_new_rounds(client, make_user):
+    from sqlalchemy import text
+    from database import engine
+
+    user, _, _ = make_user()
+    old = bcrypt.using(rounds=BCRYPT_ROUNDS + 1).hash("password1")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET password = :p WHERE user_id = :u"), {"p": old, "u": user["user_id"]})
+    assert client.post("/auth/login", json={"email": user["email"], "password": "password1"}).status_code == 200
+    with engine.connect() as conn:
+        stored = conn.execute(text("SELECT password FROM users WHERE user_id = :u"), {"u": user["user_id"]}).scalar()
+    assert stored != old and bcrypt.from_string(stored).rounds == BCRYPT_ROUNDS
@@ -0,0 +1,96 @@
+# backend/tests/test_membership.py
+import asyncio
+import json
+
+from utils.membership import MembershipIndex
+
+
+def _index(memberships: dict, on_load=None):
+    calls = []
+
+    async def loader(user_ids):
+        calls.append(sorted(user_ids))
+        if on_load is not None:
+            on_load(index)
+        return {user_id: set(memberships.get(user_id, ())) for user_id in user_ids}
+
+    index = MembershipIndex(loader)
+    return index, calls
+
+
+def test_index_loads_each_user_once_and_tracks_changes():
+    async def run():
+        index, calls = _index({1: {10}, 2: {10, 20}})
+        assert await index.check(10, 1) and not await index.check(20, 1)
+        assert await index.check(20, 2)
+        assert calls == [[1], [2]]
+        index.add(20, 1)
+        index.remove(10, 2)
+        assert await index.check(20, 1) and not await index.check(10, 2)
+        index.drop_room(20)
+        assert not await index.check(20, 1) and not await index.check(20, 2)
+        assert calls == [[1], [2]]
+
+    asyncio.run(run())
+
+
+def test_change_during_load_is_not_lost():
+    """로드 쿼리 후 반영 전에 들어온 참여는 다시 읽어서 반영"""
+    memberships = {1: set()}
+
+    def join_while_loading(index):
+        if not memberships[1]:
+            memberships[1].add(10)
+            index.add(10, 1)
+
+    async def run():
+        index, calls = _index(memberships, on_load=join_while_loading)
+        assert await index.check(10, 1)
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_audience_is_users_sharing_a_room():
+    async def run():
+        index, _ = _index({1: {10}, 2: {10}, 3: {30}})
+        assert await index.audience({1, 3}, {1, 2, 3}) == {1: {1, 2}, 3: {3}}
+
+    asyncio.run(run())
+
+
+def _reply(ws, payload: dict) -> list:
+    """payload 전송 후 pong까지 받은 프레임"""
+    ws.send_text(json.dumps(payload))
+    ws.send_text(json.dumps({"type": "ping"}))
+    frames = []
+    while not frames or frames[-1].get("type") != "pong":
+        frames.append(json.loads(ws.receive_text()))
+    return frames
+
+
+def test_room_frames_require_membership(client, make_user):
+    _, owner_token, owner = make_user()
+    _, token, guest = make_user()
+    room_id = client.post("/rooms/", json={"name": "members"}, headers=owner).json()["room_id"]
+
+    def forbidden(ws, payload):
+        return any(f.get("type") == "error" and f.get("roomId") == room_id for f in _reply(ws, payload))
+
+    join = {"type": "join_room", "roomId": room_id}
+    leave = {"type": "leave_room", "roomId": room_id}
+    message = {"type": "message", "roomId": room_id, "content": "hi"}
+    with client.websocket_connect(f"/ws?token={token}") as ws:
+        assert forbidden(ws, join) and forbidden(ws, message) and forbidden(ws, leave)
+        # REST 참여가 바로 반영됨
+        client.post(f"/rooms/{room_id}/join", headers=guest)
+        # 구독하지 않은 방의 leave_room은 퇴장 알림을 보내지 않음
+        with client.websocket_connect(f"/ws?token={owner_token}") as owner_ws:
+            _reply(owner_ws, join)
+            assert not forbidden(ws, leave)
+            assert not any(f.get("type") == "room_update" for f in _reply(owner_ws, {"type": "ping"})[:-1])
+        assert not forbidden(ws, join)
+        assert any(f.get("type") == "message" for f in _reply(ws, message))
+        # 나가기 후에는 다시 거절
+        client.post(f"/rooms/{room_id}/leave", headers=guest)
+        assert forbidden(ws, message)
@@ -0,0 +1,50 @@
+# backend/tests/test_message_cache.py
+import asyncio
+
+from utils.message_cache import RecentMessageCache
+
+
+def _loader(rows):
+    async def load(room_id, limit):
+        return rows[-limit:]
+    return load
+
+
+def test_snapshot_merges_backfill_with_live_messages():
+    cache = RecentMessageCache(per_room=3)
+    cache.append(1, 30, "c")
+    items = asyncio.run(cache.snapshot(1, _loader([(10, "a"), (20, "b")])))
+    assert items == ["a", "b", "c"]
+    # 두 번째 조회는 캐시 적중
+    assert asyncio.run(cache.snapshot(1, _loader([]))) == ["a", "b", "c"]
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_late_message_is_inserted_in_id_order():
+    cache = RecentMessageCache(per_room=3)
+    for message_id, data in ((10, "a"), (30, "c"), (20, "b"), (20, "b")):
+        cache.append(1, message_id, data)
+    cache.append(1, 5, "old")  # 버퍼가 가득 찼고 가장 오래된 것보다 오래됨 → 무시
+    assert [data for _, data in cache._rooms[1].items] == ["a", "b", "c"]
+    assert cache.total_bytes == 3
+
+
+def test_discard_removes_failed_messages():
+    cache = RecentMessageCache(per_room=5)
+    for message_id, data in ((10, "aa"), (20, "bb"), (30, "cc")):
+        cache.append(1, message_id, data)
+    cache.discard(1, [20, 99])
+    cache.discard(2, [10])  # 버퍼가 없는 방은 무시
+    assert [message_id for message_id, _ in cache._rooms[1].items] == [10, 30]
+    assert cache.total_bytes == cache._rooms[1].size == 4
+    # 제거 후에도 새 메시지는 정상 추가
+    cache.append(1, 40, "dd")
+    assert [message_id for message_id, _ in cache._rooms[1].items] == [10, 30, 40]
+
+
+def test_rooms_are_evicted_by_total_size():
+    cache = RecentMessageCache(per_room=10, max_bytes=4)
+    cache.append(1, 1, "aa")
+    cache.append(2, 2, "bb")
+    cache.append(3, 3, "cc")
+    assert 1 not in cache._rooms and cache.evictions == 1
@@ -0,0 +1,138 @@
+# backend/tests/test_message_writer.py
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from utils.message_writer import MessageWriter, MessageWriterClosed
+from utils.snowflake import next_id
+
+
+def _row(room_id: int, content="hello") -> dict:
+    return {
+        "message_id": next_id(),
+        "room_id": room_id,
+        "user_id": 1,
+        "content": content,
+        "message_type": "text",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _run_writer(scenario):
+    """테스트마다 새 이벤트 루프와 비동기 엔진으로 scenario(writer 생성 함수, 세션 팩토리) 실행"""
+    import database
+
+    async def main():
+        engine = create_async_engine(database.ASYNC_DATABASE_URL)
+        factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            return await scenario(lambda **kwargs: MessageWriter(session_factory=factory, **kwargs), factory)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def _count(factory, room_id: int) -> int:
+    from models.message import Message
+
+    async with factory() as db:
+        return (await db.execute(select(func.count()).where(Message.room_id == room_id))).scalar()
+
+
+def test_rows_are_written_in_one_batch(client):
+    async def scenario(make_writer, factory):
+        flushes = []
+        writer = make_writer(on_flush=lambda room_ids: flushes.append(set(room_ids)))
+        for _ in range(5):
+            writer.submit(_row(9001))
+        assert writer.pending == 5
+        await writer.flush()
+        return writer, flushes, await _count(factory, 9001)
+
+    writer, flushes, stored = _run_writer(scenario)
+    assert stored == 5
+    assert writer.written == 5 and writer.pending == 0
+    assert flushes == [{9001}]
+
+
+def test_batch_size_splits_buffer(client):
+    async def scenario(make_writer, factory):
+        flushes = []
+        writer = make_writer(batch_size=2, on_flush=lambda room_ids: flushes.append(room_ids))
+        for _ in range(5):
+            writer.submit(_row(9002))
+        await writer.flush()
+        return flushes, await _count(factory, 9002)
+
+    flushes, stored = _run_writer(scenario)
+    assert stored == 5
+    assert len(flushes) == 3
+
+
+def test_unbindable_row_fails_alone(client):
+    """바인딩할 수 없는 값(dict 본문)이 섞여도 나머지 행은 저장되고 그 행만 실패 통지"""
+    async def scenario(make_writer, factory):
+        errors = []
+
+        async def on_error(exc):
+            errors.append(exc)
+
+        writer = make_writer()
+        for _ in range(5):
+            writer.submit(_row(9003))
+        writer.submit({**_row(9003), "content": {"evil": 1}}, on_error=on_error)
+        await writer.flush()
+        return writer, errors, await _count(factory, 9003)
+
+    writer, errors, stored = _run_writer(scenario)
+    assert stored == 5
+    assert writer.written == 5 and writer.failed == 1
+    assert len(errors) == 1
+
+
+def test_closed_writer_rejects_rows(client):
+    async def scenario(make_writer, factory):
+        writer = make_writer()
+        await writer.start()
+        writer.submit(_row(9004))
+        await writer.stop()
+        with pytest.raises(MessageWriterClosed):
+            writer.submit(_row(9004))
+        return await _count(factory, 9004)
+
+    assert _run_writer(scenario) == 1
+
+
+def test_failed_rows_are_reported_to_on_fail(client):
+    """최종 실패한 행은 on_fail로 넘어가 최근 메시지 버퍼에서 제거될 수 있어야 함"""
+    async def scenario(make_writer, factory):
+        failed = []
+        writer = make_writer(on_fail=failed.extend)
+        good, bad = _row(9005), {**_row(9005), "content": {"evil": 1}}
+        writer.submit(good)
+        writer.submit(bad)
+        await writer.flush()
+        return failed, bad
+
+    failed, bad = _run_writer(scenario)
+    assert [row["message_id"] for row in failed] == [bad["message_id"]]
+
+
+def test_failed_message_is_not_replayed_in_history(client):
+    from utils.message_writer import _discard_failed
+    from utils.websocket_manager import manager
+
+    manager.recent_messages.append(9006, 1, '{"messageId":"1"}')
+    manager.recent_messages.append(9006, 2, '{"messageId":"2"}')
+
+    async def main():
+        _discard_failed([{"room_id": 9006, "message_id": 2}])
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert [message_id for message_id, _ in manager.recent_messages._rooms[9006].items] == [1]
@@ -0,0 +1,37 @@
+# backend/tests/test_messages.py
+
+
+def test_keyset_pagination(client, make_user, send_messages):
+    _, token, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "pages"}, headers=headers).json()["room_id"]
+    ids = send_messages(token, headers, room_id, [f"m{i}" for i in range(5)])
+    url = f"/rooms/{room_id}/messages"
+
+    # 커서 없이 호출하면 최신 페이지 (오래된 순 정렬)
+    page = client.get(f"{url}?limit=2", headers=headers).json()
+    assert [m["message_id"] for m in page["messages"]] == ids[3:]
+    assert page["after_cursor"] is None
+
+    # before 커서로 이전 페이지를 끝까지 따라감
+    seen = list(ids[3:])
+    while page["before_cursor"] is not None:
+        page = client.get(f"{url}?limit=2&before={page['before_cursor']}", headers=headers).json()
+        seen = [m["message_id"] for m in page["messages"]] + seen
+    assert seen == ids
+
+    # after 커서로 최신 방향 조회
+    page = client.get(f"{url}?limit=3&after={ids[0]}", headers=headers).json()
+    assert [m["message_id"] for m in page["messages"]] == ids[1:4]
+    assert page["after_cursor"] == ids[3] and page["before_cursor"] == ids[1]
+    page = client.get(f"{url}?limit=3&after={ids[3]}", headers=headers).json()
+    assert [m["message_id"] for m in page["messages"]] == ids[4:] and page["after_cursor"] is None
+
+
+def test_pagination_rejects_bad_requests(client, make_user, send_messages):
+    _, token, headers = make_user()
+    _, _, outsider = make_user()
+    room_id = client.post("/rooms/", json={"name": "guarded"}, headers=headers).json()["room_id"]
+    url = f"/rooms/{room_id}/messages"
+    assert client.get(f"{url}?before=10&after=1", headers=headers).status_code == 400
+    assert client.get(f"{url}?limit=101", headers=headers).status_code == 422
+    assert client.get(url, headers=outsider).status_code == 403
@@ -0,0 +1,25 @@
+# backend/tests/test_metrics.py
+import main
+
+
+def test_metrics_use_route_templates(client, make_user):
+    _, _, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "metrics"}, headers=headers).json()["room_id"]
+    client.get(f"/rooms/{room_id}", headers=headers)
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE chat_http_requests_total counter" in body
+    assert 'chat_http_requests_total{method="GET",route="/rooms/{room_id}",status="200"}' in body
+    assert 'route="unmatched"' in body
+    # 실제 경로(ID)는 라벨에 들어가지 않음
+    assert f"/rooms/{room_id}\"" not in body
+    assert 'chat_http_request_duration_seconds_bucket{method="GET",route="/rooms/{room_id}",le="+Inf"}' in body
+
+
+def test_metrics_disabled_returns_404(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
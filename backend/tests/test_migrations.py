@@ -0,0 +1,93 @@
+# backend/tests/test_migrations.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, inspect, text
+
+from database import Base
+from migrations import message_indexes, room_summary, user_indexes
+from migrations.indexes import create_indexes, missing_indexes
+
+
+def _legacy_db(path):
+    """요약 컬럼이 없던 시절의 스키마 + 데이터"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    with engine.begin() as conn:
+        for column in room_summary.NEW_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {column.table.name} DROP COLUMN {column.name}"))
+        conn.execute(text("INSERT INTO users (user_id, name, email, password, status) VALUES (1, 'a', 'a@x', 'h', 'offline'), (2, 'b', 'b@x', 'h', 'offline')"))
+        conn.execute(text("INSERT INTO rooms (room_id, name, created_by) VALUES (10, 'r', 1), (11, 'empty', 1)"))
+        conn.execute(
+            text("INSERT INTO room_members (room_id, user_id, role, last_read_at) VALUES (10, 1, 'owner', :t), (10, 2, 'member', :t), (11, 1, 'owner', :t)"),
+            {"t": now},
+        )
+        rows = [
+            (100, 1, "hello", now - timedelta(minutes=5), 0),
+            (101, 2, "after read", now + timedelta(minutes=1), 0),
+            (102, 1, "mine after read", now + timedelta(minutes=2), 0),
+            (103, 2, "deleted", now + timedelta(minutes=3), 1),
+        ]
+        for message_id, user_id, content, created_at, deleted in rows:
+            conn.execute(
+                text("INSERT INTO messages (message_id, room_id, user_id, content, message_type, created_at, is_deleted) "
+                     "VALUES (:id, 10, :u, :c, 'text', :t, :d)"),
+                {"id": message_id, "u": user_id, "c": content, "t": created_at, "d": deleted},
+            )
+    return engine
+
+
+def test_room_summary_migration(tmp_path):
+    engine = _legacy_db(tmp_path / "legacy.db")
+    assert len(room_summary.missing_columns(engine)) == 6
+    assert len(room_summary.add_columns(engine, dry_run=True)) == 6
+    assert len(room_summary.missing_columns(engine)) == 6
+
+    room_summary.add_columns(engine)
+    assert room_summary.missing_columns(engine) == []
+    assert "read_count" in {c["name"] for c in inspect(engine).get_columns("room_members")}
+    # 두 번 실행해도 같은 결과
+    for _ in range(2):
+        room_summary.backfill(engine)
+        with engine.connect() as conn:
+            rooms = {row.room_id: row for row in conn.execute(text("SELECT * FROM rooms"))}
+            reads = dict(conn.execute(text("SELECT user_id, read_count FROM room_members WHERE room_id = 10")).all())
+        assert (rooms[10].message_count, rooms[10].member_count) == (4, 2)
+        assert (rooms[10].last_message_id, rooms[10].last_message_preview) == (102, "mine after read")
+        assert rooms[11].last_message_id is None and rooms[11].member_count == 1
+        # 안 읽은 수 = message_count - read_count
+        assert {user_id: 4 - read for user_id, read in reads.items()} == {1: 1, 2: 1}
+
+
+def _index_names(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_message_index_migration(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_messages_room_id_message_id"))
+    assert missing_indexes(engine, message_indexes.INDEXES) == message_indexes.INDEXES
+    assert len(create_indexes(engine, message_indexes.INDEXES, dry_run=True)) == 1
+    assert "ix_messages_room_id_message_id" not in _index_names(engine, "messages")
+
+    assert len(create_indexes(engine, message_indexes.INDEXES)) == 1
+    assert create_indexes(engine, message_indexes.INDEXES) == []
+    with engine.connect() as conn:
+        plan = " ".join(str(row) for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT message_id FROM messages WHERE room_id = 1 AND message_id < 100 ORDER BY message_id DESC LIMIT 51"
+        )))
+    assert "ix_messages_room_id_message_id" in plan
+
+
+def test_user_index_migration(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_users_name"))
+        conn.execute(text("DROP INDEX ix_users_department"))
+    assert {index.name for index in user_indexes.INDEXES} == {"ix_users_name", "ix_users_department"}
+    assert len(create_indexes(engine, user_indexes.INDEXES)) == 2
+    assert {"ix_users_name", "ix_users_department"} <= _index_names(engine, "users")
+    assert create_indexes(engine, user_indexes.INDEXES) == []
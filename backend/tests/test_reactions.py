@@ -0,0 +1,37 @@
+# backend/tests/test_reactions.py
+
+
+def test_reaction_counters(client, make_user, send_messages):
+    _, token, alice = make_user()
+    _, _, bob = make_user()
+    room_id = client.post("/rooms/", json={"name": "reactions"}, headers=alice).json()["room_id"]
+    client.post(f"/rooms/{room_id}/join", headers=bob)
+    message_id, = send_messages(token, alice, room_id, ["react to me"])
+    url = f"/rooms/{room_id}/messages/{message_id}/reactions"
+
+    assert client.post(url, json={"emoji": "👍"}, headers=alice).json() == {
+        "message_id": message_id, "emoji": "👍", "count": 1, "changed": True
+    }
+    # 같은 사람이 같은 반응을 다시 누르면 변경 없음
+    assert client.post(url, json={"emoji": "👍"}, headers=alice).json()["changed"] is False
+    assert client.post(url, json={"emoji": "👍"}, headers=bob).json()["count"] == 2
+    assert client.post(url, json={"emoji": "🎉"}, headers=bob).json()["count"] == 1
+
+    page = client.get(f"/rooms/{room_id}/messages", headers=alice).json()
+    assert page["messages"][-1]["reactions"] == {"👍": 2, "🎉": 1}
+
+    assert client.delete(f"{url}/👍", headers=alice).json()["count"] == 1
+    assert client.delete(f"{url}/👍", headers=alice).json()["changed"] is False
+    assert client.delete(f"{url}/🎉", headers=bob).json()["count"] == 0
+    page = client.get(f"/rooms/{room_id}/messages", headers=alice).json()
+    assert page["messages"][-1]["reactions"] == {"👍": 1}
+
+
+def test_reaction_requires_membership(client, make_user, send_messages):
+    _, token, alice = make_user()
+    _, _, outsider = make_user()
+    room_id = client.post("/rooms/", json={"name": "private"}, headers=alice).json()["room_id"]
+    message_id, = send_messages(token, alice, room_id, ["members only"])
+    url = f"/rooms/{room_id}/messages/{message_id}/reactions"
+    assert client.post(url, json={"emoji": "👍"}, headers=outsider).status_code == 403
+    assert client.post(f"/rooms/{room_id}/messages/1/reactions", json={"emoji": "👍"}, headers=alice).status_code == 404
@@ -0,0 +1,86 @@
+# backend/tests/test_rooms.py
+
+LIST_ONLY_FIELDS = {"unread_count", "member_count", "last_message_preview", "last_message_at", "my_role"}
+
+
+def test_list_only_fields_are_not_in_single_room_responses(client, make_user):
+    _, _, headers = make_user()
+    created = client.post("/rooms/", json={"name": "schema"}, headers=headers).json()
+    assert not LIST_ONLY_FIELDS & set(created)
+    info = client.get(f"/rooms/{created['room_id']}", headers=headers).json()
+    assert not LIST_ONLY_FIELDS & set(info)
+    listed = next(r for r in client.get("/rooms/", headers=headers).json() if r["room_id"] == created["room_id"])
+    assert LIST_ONLY_FIELDS <= set(listed)
+
+
+def test_unread_counts(client, make_user, send_messages):
+    _, alice_token, alice = make_user()
+    _, bob_token, bob = make_user()
+    room_id = client.post("/rooms/", json={"name": "unread"}, headers=alice).json()["room_id"]
+    send_messages(alice_token, alice, room_id, ["before bob joined"])
+    client.post(f"/rooms/{room_id}/join", headers=bob)
+
+    def unread(headers):
+        rooms = client.get("/rooms/", headers=headers).json()
+        return next(r for r in rooms if r["room_id"] == room_id)["unread_count"]
+
+    # 참여 전 메시지는 안 읽은 수에 포함하지 않음
+    assert unread(bob) == 0
+    send_messages(alice_token, alice, room_id, ["one", "two", "three"])
+    assert unread(bob) == 3
+    # 보낸 사람 본인의 메시지는 안 읽은 수에 포함하지 않음
+    assert unread(alice) == 0
+    send_messages(bob_token, bob, room_id, ["reply"])
+    assert unread(bob) == 3 and unread(alice) == 1
+
+    assert client.post(f"/rooms/{room_id}/read", headers=bob).status_code == 200
+    assert unread(bob) == 0
+
+    # 카운터가 어긋나도 재계산으로 복구
+    assert client.post("/rooms/unread/recompute", headers=alice).status_code == 200
+    assert unread(alice) == 1
+
+
+def test_room_list_summary(client, make_user, send_messages):
+    _, token, alice = make_user()
+    _, _, bob = make_user()
+    quiet = client.post("/rooms/", json={"name": "quiet"}, headers=alice).json()["room_id"]
+    busy = client.post("/rooms/", json={"name": "busy"}, headers=alice).json()["room_id"]
+    client.post(f"/rooms/{busy}/join", headers=bob)
+    send_messages(token, alice, busy, ["x" * 150])
+
+    rooms = client.get("/rooms/", headers=alice).json()
+    by_id = {r["room_id"]: r for r in rooms}
+    assert by_id[busy]["member_count"] == 2 and by_id[quiet]["member_count"] == 1
+    assert by_id[busy]["last_message_preview"] == "x" * 100
+    assert by_id[quiet]["last_message_at"] is None
+    assert by_id[busy]["my_role"] == "owner"
+    # 기본 정렬은 최근 활동순
+    assert [r["room_id"] for r in rooms].index(busy) < [r["room_id"] for r in rooms].index(quiet)
+    bob_rooms = {r["room_id"]: r for r in client.get("/rooms/", headers=bob).json()}
+    assert bob_rooms[busy]["my_role"] == "member"
+    client.post(f"/rooms/{busy}/leave", headers=bob)
+    assert {r["room_id"]: r for r in client.get("/rooms/", headers=alice).json()}[busy]["member_count"] == 1
+
+
+def test_recompute_uses_same_clock_as_messages(client, make_user, send_messages):
+    """참여/읽음 시각을 DB NOW()로 기록하면 직전 메시지가 안 읽은 것으로 다시 계산됨"""
+    _, alice_token, alice = make_user()
+    _, _, bob = make_user()
+    room_id = client.post("/rooms/", json={"name": "clock"}, headers=alice).json()["room_id"]
+    send_messages(alice_token, alice, room_id, ["just before join"])
+    client.post(f"/rooms/{room_id}/join", headers=bob)
+
+    assert client.post("/rooms/unread/recompute", headers=bob).status_code == 200
+    rooms = client.get("/rooms/", headers=bob).json()
+    assert next(r for r in rooms if r["room_id"] == room_id)["unread_count"] == 0
+
+
+def test_activity_sort_compares_on_one_clock(client, make_user, send_messages):
+    """메시지 없는 방의 생성 시각과 다른 방의 마지막 메시지 시각을 같은 시계로 비교"""
+    _, token, alice = make_user()
+    busy = client.post("/rooms/", json={"name": "busy"}, headers=alice).json()["room_id"]
+    send_messages(token, alice, busy, ["earlier"])
+    fresh = client.post("/rooms/", json={"name": "fresh"}, headers=alice).json()["room_id"]
+    order = [r["room_id"] for r in client.get("/rooms/", headers=alice).json()]
+    assert order.index(fresh) < order.index(busy)
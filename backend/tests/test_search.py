@@ -0,0 +1,36 @@
+# backend/tests/test_search.py
+from sqlalchemy import create_engine
+
+from utils.search import MessageSearch
+
+
+def test_startup_check_reports_missing_index(tmp_path):
+    """인덱스가 없으면 만들지 않고 LIKE 모드 + index_ready=False로 보고"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    search = MessageSearch()
+    search.check(engine)
+    assert search.status() == {"mode": "like", "index_ready": False}
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM sqlite_master").scalar() == 0
+
+
+def test_health_reports_search_index(client):
+    body = client.get("/health").json()
+    assert body["status"] == "healthy"
+    assert body["search"] == {"mode": "fts5", "index_ready": True}
+
+
+def test_full_text_search_only_in_member_rooms(client, make_user, send_messages):
+    _, token, alice = make_user()
+    _, bob_token, bob = make_user()
+    mine = client.post("/rooms/", json={"name": "search-mine"}, headers=alice).json()["room_id"]
+    other = client.post("/rooms/", json={"name": "search-other"}, headers=bob).json()["room_id"]
+    send_messages(token, alice, mine, ["배포 일정 공유합니다", "점심 메뉴"])
+    send_messages(bob_token, bob, other, ["배포 비밀 일정"])
+
+    page = client.get("/search/messages", params={"q": "배포 일정"}, headers=alice).json()
+    assert [m["content"] for m in page["messages"]] == ["배포 일정 공유합니다"]
+    # 접두어 일치
+    page = client.get("/search/messages", params={"q": "점"}, headers=alice).json()
+    assert [m["content"] for m in page["messages"]] == ["점심 메뉴"]
+    assert client.get("/search/messages", params={"q": "배포", "room_id": other}, headers=alice).json()["messages"] == []
@@ -0,0 +1,97 @@
+# backend/tests/test_snowflake.py
+import time
+from datetime import datetime
+
+import pytest
+
+from utils import snowflake
+from utils.snowflake import (
+    MAX_CLOCK_SKEW_MS,
+    MAX_SEQUENCE,
+    SnowflakeGenerator,
+    datetime_to_id,
+    id_to_datetime,
+)
+
+
+class FakeClock:
+    def __init__(self, ms: int):
+        self.ms = ms
+
+    def __call__(self) -> int:
+        return self.ms
+
+
+def _generator(clock: FakeClock, worker: int = 3) -> SnowflakeGenerator:
+    generator = SnowflakeGenerator(worker)
+    generator._now_ms = clock
+    return generator
+
+
+def test_ids_are_unique_and_ordered_across_workers():
+    clock = FakeClock(1000)
+    a, b = _generator(clock, 1), _generator(clock, 2)
+    ids = [g.next_id() for _ in range(50) for g in (a, b)]
+    assert len(set(ids)) == len(ids)
+    clock.ms += 1
+    assert a.next_id() > max(ids)
+
+
+def test_sequence_overflow_borrows_next_ms_without_waiting():
+    clock = FakeClock(1000)
+    generator = _generator(clock)
+    ids = [generator.next_id() for _ in range(MAX_SEQUENCE + 2)]
+    assert ids == sorted(set(ids))
+    assert generator._last_ms == 1001 and clock.ms == 1000
+
+
+def test_backward_clock_continues_without_sleep(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda _: pytest.fail("락 안에서 sleep"))
+    clock = FakeClock(5000)
+    generator = _generator(clock)
+    first = generator.next_id()
+    clock.ms -= MAX_CLOCK_SKEW_MS
+    assert generator.next_id() > first
+    clock.ms -= 1
+    with pytest.raises(RuntimeError):
+        generator.next_id()
+
+
+def test_id_time_roundtrip():
+    generator = SnowflakeGenerator(7)
+    message_id = generator.next_id()
+    created_at = id_to_datetime(message_id)
+    assert datetime_to_id(created_at) <= message_id
+    assert abs((datetime.utcnow() - created_at).total_seconds()) < 5
+
+
+def test_explicit_worker_id(monkeypatch):
+    monkeypatch.delenv("WORKER_ID", raising=False)
+    assert snowflake.explicit_worker_id() is None
+    monkeypatch.setenv("WORKER_ID", " 5 ")
+    assert snowflake.explicit_worker_id() == 5
+    for value in ("abc", "-1", "1024"):
+        monkeypatch.setenv("WORKER_ID", value)
+        with pytest.raises(ValueError):
+            snowflake.explicit_worker_id()
+
+
+def test_next_id_needs_a_worker_id(monkeypatch):
+    """임대도 WORKER_ID도 없는 프로세스(예: fork된 자식)는 ID를 발급하지 않음"""
+    monkeypatch.delenv("WORKER_ID", raising=False)
+    monkeypatch.setattr(snowflake, "_generator_pid", None)
+    with pytest.raises(snowflake.WorkerIdUnavailable):
+        snowflake.next_id()
+    snowflake.configure(9)
+    try:
+        assert (snowflake.next_id() >> snowflake.SEQUENCE_BITS) & snowflake.MAX_WORKER_ID == 9
+        snowflake.configure(None)
+        with pytest.raises(snowflake.WorkerIdUnavailable):
+            snowflake.next_id()
+        # 같은 번호로 다시 설정하면 이전 생성기를 이어서 사용
+        last = snowflake._generator._last_ms
+        snowflake.configure(9)
+        assert snowflake._generator._last_ms == last
+    finally:
+        monkeypatch.setenv("WORKER_ID", "1")
+        snowflake.configure(1)
@@ -0,0 +1,48 @@
+# backend/tests/test_sql_profiler.py
+import pytest
+from sqlalchemy import event
+
+from database import async_engine, engine
+from utils import sql_profiler
+
+
+@pytest.fixture
+def sql_profile(monkeypatch):
+    """SQL_PROFILE=true로 시작한 것처럼 엔진에 측정 이벤트 등록 (테스트 후 제거)"""
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILE", True)
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILE_SAMPLE_RATE", 1.0)
+    engines = (engine, async_engine.sync_engine)
+    sql_profiler.install(*engines)
+    yield
+    for target in engines:
+        event.remove(target, "before_cursor_execute", sql_profiler._before_cursor_execute)
+        event.remove(target, "after_cursor_execute", sql_profiler._after_cursor_execute)
+
+
+def test_db_headers_count_queries(client, make_user, sql_profile):
+    _, _, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "profiled"}, headers=headers).json()["room_id"]
+    response = client.get(f"/rooms/{room_id}/messages", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 2
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+    assert response.headers["X-DB-Repeated"] == "0"
+
+
+def test_no_db_headers_when_disabled(client, make_user):
+    _, _, headers = make_user()
+    response = client.get("/rooms/", headers=headers)
+    assert response.status_code == 200 and "X-DB-Queries" not in response.headers
+
+
+def test_repeated_statements_are_flagged(sql_profile, caplog):
+    """같은 문장이 SQL_PROFILE_REPEAT번 이상이면 N+1 후보로 헤더와 WARNING 로그"""
+    from sqlalchemy import text
+
+    with sql_profiler.profile("ws:test") as current:
+        with engine.connect() as conn:
+            for _ in range(sql_profiler.SQL_PROFILE_REPEAT):
+                conn.execute(text("SELECT 1"))
+    assert current.count == sql_profiler.SQL_PROFILE_REPEAT
+    assert dict(current.headers())[b"x-db-repeated"] == b"1"
+    assert "N+1?" in caplog.text
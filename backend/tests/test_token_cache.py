@@ -0,0 +1,68 @@
+# backend/tests/test_token_cache.py
+from datetime import timedelta
+
+import pytest
+
+from core import security
+from core.security import create_access_token, token_cache, verify_token
+from utils import cache
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """jwt.decode 호출 횟수 (캐시 적중이면 늘지 않음)"""
+    calls = []
+    decode = security.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting)
+    return calls
+
+
+def test_valid_token_is_cached_until_its_exp(monkeypatch, decodes):
+    clock = FakeTime(1000.0)
+    monkeypatch.setattr(cache, "time", clock)
+    token = create_access_token({"sub": "a@x", "user_id": 1}, timedelta(seconds=30))
+    assert verify_token(token)["user_id"] == 1
+    assert verify_token(token)["user_id"] == 1
+    assert len(decodes) == 1
+    # 토큰 만료 시각(30초 후)이 지나면 캐시에서도 빠져 다시 검증
+    clock.now += 29
+    verify_token(token)
+    assert len(decodes) == 1
+    clock.now += 2
+    verify_token(token)
+    assert len(decodes) == 2
+
+
+def test_cache_ttl_is_capped(monkeypatch, decodes):
+    clock = FakeTime(1000.0)
+    monkeypatch.setattr(cache, "time", clock)
+    token = create_access_token({"sub": "a@x", "user_id": 2}, timedelta(days=1))
+    verify_token(token)
+    clock.now += security.TOKEN_CACHE_MAX_TTL + 1
+    verify_token(token)
+    assert len(decodes) == 2
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-jwt",
+    create_access_token({"sub": "a@x", "user_id": 3}, timedelta(seconds=-5)),  # 이미 만료
+    create_access_token({"sub": "a@x", "user_id": 3})[:-4] + "AAAA",           # 서명 위조
+])
+def test_invalid_tokens_are_not_cached(token, decodes):
+    size = len(token_cache)
+    assert verify_token(token) is None
+    assert verify_token(token) is None
+    assert len(decodes) == 2 and len(token_cache) == size
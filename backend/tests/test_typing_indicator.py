@@ -0,0 +1,92 @@
+# backend/tests/test_typing_indicator.py
+import asyncio
+
+from utils import typing_indicator
+from utils.typing_indicator import TypingTracker
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeManager:
+    def __init__(self):
+        self.published = []
+        self.delivered = []
+
+    async def _publish(self, message: dict):
+        self.published.append(message)
+
+    def _deliver_room(self, room_id: int, payload: dict):
+        self.delivered.append(payload)
+
+
+def _tracker(monkeypatch):
+    clock = FakeTime(100.0)
+    monkeypatch.setattr(typing_indicator, "time", clock)
+    manager = FakeManager()
+    return TypingTracker(manager, interval_ms=1000, ttl_ms=5000, min_gap_ms=1000), manager, clock
+
+
+def _users(manager) -> list:
+    return [[user["id"] for user in frame["users"]] for frame in manager.delivered]
+
+
+def test_typing_frames_are_throttled_per_user_and_room(monkeypatch):
+    tracker, manager, clock = _tracker(monkeypatch)
+
+    async def main():
+        await tracker.update(1, 7, "kim")
+        await tracker.update(1, 7, "kim")
+        await tracker.update(2, 7, "kim")  # 다른 방은 따로 계산
+        assert tracker.throttled == 1 and len(manager.published) == 2
+        clock.now += 1
+        await tracker.update(1, 7, "kim")
+        assert len(manager.published) == 3
+
+    asyncio.run(main())
+
+
+def test_only_changed_rooms_are_flushed_and_typers_expire(monkeypatch):
+    tracker, manager, clock = _tracker(monkeypatch)
+    tracker.apply(1, 7, "kim", True)
+    tracker.apply(1, 8, "lee", True)
+    tracker.flush()
+    assert _users(manager) == [[7, 8]]
+    # 바뀐 게 없으면 보내지 않음
+    tracker.flush()
+    assert len(manager.delivered) == 1
+    clock.now += 3
+    tracker.apply(1, 8, "lee", True)  # lee만 갱신
+    clock.now += 2.5
+    tracker.flush()
+    assert _users(manager)[-1] == [8]
+    clock.now += 3
+    tracker.flush()
+    # 빈 목록을 한 번 보내고 방 상태 정리
+    assert _users(manager)[-1] == [] and tracker._rooms == {}
+
+
+def test_message_stops_typing_immediately(monkeypatch):
+    """메시지를 보내면(typing=False) TTL을 기다리지 않고 목록에서 빠지고 다른 워커에도 알림"""
+    tracker, manager, clock = _tracker(monkeypatch)
+
+    async def main():
+        await tracker.update(1, 7, "kim")
+        tracker.flush()
+        await tracker.update(1, 7, "kim", typing=False)
+        tracker.flush()
+        assert _users(manager) == [[7], []]
+        assert manager.published[-1]["typing"] is False
+        # 입력 중이 아니었던 유저의 중지는 전파하지 않음
+        await tracker.update(1, 9, "park", typing=False)
+        assert len(manager.published) == 2
+        # 중지 직후 다시 입력하면 간격 제한 없이 받음
+        await tracker.update(1, 7, "kim")
+        assert tracker.throttled == 0
+
+    asyncio.run(main())
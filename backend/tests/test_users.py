@@ -0,0 +1,53 @@
+# backend/tests/test_users.py
+
+
+def _all_pages(client, headers, **params):
+    users, cursor, pages = [], None, 0
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/users/", params=query, headers=headers)
+        assert response.status_code == 200
+        users += response.json()
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return users, pages
+
+
+def test_users_are_paginated_by_cursor(client, make_user):
+    for _ in range(5):
+        make_user()
+    _, _, headers = make_user()
+    everyone = client.get("/users/", params={"limit": 1000}, headers=headers).json()
+    users, pages = _all_pages(client, headers, limit=2)
+    assert [u["user_id"] for u in users] == [u["user_id"] for u in everyone]
+    # 마지막 페이지 뒤에는 커서가 없음 (빈 페이지를 한 번 더 읽지 않음)
+    assert pages == (len(everyone) + 1) // 2
+
+
+def test_users_field_projection_and_etag(client, make_user):
+    _, _, headers = make_user()
+    response = client.get("/users/", params={"fields": "user_id,name"}, headers=headers)
+    assert set(response.json()[0]) == {"user_id", "name"}
+    etag = response.headers["ETag"]
+    again = client.get("/users/", params={"fields": "user_id,name"}, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    # 새 가입자가 생기면 목록 버전이 바뀜
+    make_user()
+    assert client.get("/users/", params={"fields": "user_id,name"}, headers={**headers, "If-None-Match": etag}).status_code == 200
+    assert client.get("/users/", params={"fields": "password"}, headers=headers).status_code == 400
+
+
+def test_cursor_and_etag_headers_are_exposed_to_browsers(client, make_user):
+    _, _, headers = make_user()
+    make_user()
+    response = client.get("/users/", params={"limit": 1}, headers={**headers, "Origin": "http://localhost:3000"})
+    exposed = {h.strip().lower() for h in response.headers["Access-Control-Expose-Headers"].split(",")}
+    assert {"x-next-cursor", "etag"} <= exposed
+
+
+def test_profile_update_is_not_hidden_by_user_cache(client, make_user):
+    _, _, headers = make_user()
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert client.patch("/auth/profile", json={"department": "infra"}, headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).json()["department"] == "infra"
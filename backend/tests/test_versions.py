@@ -0,0 +1,77 @@
+# backend/tests/test_versions.py
+from utils.versions import VersionStamps, etag_matches, make_etag, room_version
+
+
+def test_bump_publishes_one_message_for_all_names():
+    published = []
+    versions = VersionStamps(published.append)
+    value = versions.bump("a", "b")
+    assert versions.get("a") == versions.get("b") == value
+    assert published == [{"op": "version", "names": ["a", "b"], "value": value}]
+    assert versions.bump() and len(published) == 1
+
+
+def test_remote_bump_with_smaller_value_still_invalidates():
+    """시계가 느리거나 워커 ID가 작은 워커의 변경(더 작은 값)도 반영"""
+    versions = VersionStamps()
+    local = versions.bump("room:1")
+    versions.observe("room:1", local - 1000)
+    assert versions.get("room:1") == local - 1000
+    versions.observe("room:1", local + 1000)
+    assert versions.get("room:1") == local + 1000
+
+
+def test_read_cache_reloads_after_any_version_change():
+    from utils.read_cache import ReadCache
+    from utils.websocket_manager import manager
+
+    cache = ReadCache(maxsize=10, ttl=60)
+    name = room_version(424242)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"n": len(loads)}
+
+    assert cache.get("k", name, loader) == {"n": 1}
+    assert cache.get("k", name, loader) == {"n": 1}
+    value = manager.versions.bump(name)
+    assert cache.get("k", name, loader) == {"n": 2}
+    manager.versions.observe(name, value - 1)
+    assert cache.get("k", name, loader) == {"n": 3}
+
+
+def test_etag_matching():
+    etag = make_etag(1, "x")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert make_etag(1, "x") != make_etag(2, "x")
+
+
+def test_room_members_conditional_get(client, make_user):
+    _, _, alice = make_user()
+    _, _, bob = make_user()
+    room_id = client.post("/rooms/", json={"name": "etag"}, headers=alice).json()["room_id"]
+    first = client.get(f"/rooms/{room_id}/members", headers=alice)
+    etag = first.headers["ETag"]
+    assert client.get(f"/rooms/{room_id}/members", headers={**alice, "If-None-Match": etag}).status_code == 304
+    # 멤버가 바뀌면 버전이 올라가 다시 200
+    client.post(f"/rooms/{room_id}/join", headers=bob)
+    second = client.get(f"/rooms/{room_id}/members", headers={**alice, "If-None-Match": etag})
+    assert second.status_code == 200 and len(second.json()["members"]) == 2
+
+
+def test_probe_before_create_does_not_hide_new_room(client, make_user):
+    """생성 전에 같은 ID를 조회해서 캐시된 "멤버 아님" 결과가 생성자에게 남지 않아야 함"""
+    _, _, alice = make_user()
+    previous = client.post("/rooms/", json={"name": "before"}, headers=alice).json()["room_id"]
+    for path in (f"/rooms/{previous + 1}", f"/rooms/{previous + 1}/members"):
+        assert client.get(path, headers=alice).status_code == 403
+    room_id = client.post("/rooms/", json={"name": "probed"}, headers=alice).json()["room_id"]
+    assert room_id == previous + 1
+    assert client.get(f"/rooms/{room_id}", headers=alice).json()["name"] == "probed"
+    assert client.get(f"/rooms/{room_id}/members", headers=alice).status_code == 200
@@ -0,0 +1,184 @@
+# backend/tests/test_websocket_manager.py
+import asyncio
+
+import pytest
+
+from utils.codec import EncodedFrame, json_codec
+from utils.websocket_manager import Connection, WebSocketManager, frame_key
+
+
+def _connection(policy: str, queue_size: int = 2) -> Connection:
+    return Connection(WebSocketManager(queue_size=queue_size, overflow_policy=policy), 1, websocket=None)
+
+
+def _enqueue(conn: Connection, payload: dict) -> bool:
+    frame = EncodedFrame(payload)
+    return conn.enqueue(frame.encode(conn.codec), frame_key(payload), frame.payload)
+
+
+def _queued(conn: Connection) -> list:
+    return [json_codec.decode(data) for _, data, _ in conn.queue]
+
+
+def _diff(*changes) -> dict:
+    return {"type": "presence_diff", "changes": [{"userId": user_id, "status": status} for user_id, status in changes]}
+
+
+def test_drop_oldest_policy():
+    conn = _connection("drop_oldest")
+    for n in range(3):
+        assert _enqueue(conn, {"type": "message", "n": n})
+    assert [frame["n"] for frame in _queued(conn)] == [1, 2]
+    assert conn.dropped == 1
+
+
+def test_disconnect_policy_rejects_when_full():
+    conn = _connection("disconnect")
+    assert _enqueue(conn, {"type": "message"}) and _enqueue(conn, {"type": "message"})
+    assert not _enqueue(conn, {"type": "message"})
+
+
+def test_coalesce_replaces_same_typing_frame():
+    conn = _connection("coalesce")
+    _enqueue(conn, {"type": "typing", "roomId": 1, "users": [1]})
+    _enqueue(conn, {"type": "message", "n": 1})
+    assert _enqueue(conn, {"type": "typing", "roomId": 1, "users": []})
+    assert _queued(conn) == [{"type": "message", "n": 1}, {"type": "typing", "roomId": 1, "users": []}]
+
+
+def test_coalesce_merges_presence_diffs():
+    """큐가 가득 찬 상태의 presence_diff는 큐에 있던 diff와 합쳐져 어느 유저의 변경도 잃지 않음"""
+    conn = _connection("coalesce")
+    _enqueue(conn, _diff((1, "online"), (2, "online")))
+    _enqueue(conn, {"type": "message", "n": 1})
+    assert _enqueue(conn, _diff((2, "offline"), (3, "online")))
+    queued = _queued(conn)
+    assert queued[0] == {"type": "message", "n": 1}
+    assert queued[1] == _diff((1, "online"), (2, "offline"), (3, "online"))
+
+
+def test_coalesce_never_drops_presence_diff_for_other_frames():
+    conn = _connection("coalesce")
+    _enqueue(conn, _diff((1, "online")))
+    _enqueue(conn, {"type": "typing", "roomId": 1, "users": [1]})
+    # 메시지를 넣으려면 typing을 버리고, 더 버릴 게 없으면 거절
+    assert _enqueue(conn, {"type": "message", "n": 1})
+    assert not _enqueue(conn, {"type": "message", "n": 2})
+    assert _queued(conn)[0] == _diff((1, "online"))
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        WebSocketManager(overflow_policy="nope")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.scope = {}
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+
+def _cluster(hub: str):
+    from utils.backplane import LocalBackplane
+
+    return [WebSocketManager(backplane=LocalBackplane(hub)) for _ in range(2)]
+
+
+async def _start(*managers):
+    for manager in managers:
+        await manager.backplane.start(manager._on_backplane)
+        await manager.remote.start()
+
+
+async def _stop(*managers):
+    for manager in managers:
+        await manager.remote.stop()
+        await manager.backplane.close()
+
+
+def test_user_stays_online_while_connected_on_another_worker():
+    async def main():
+        a, b = _cluster("online-elsewhere")
+        await _start(a, b)
+        ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+        await a.connect(7, ws_a)
+        await b.connect(7, ws_b)
+        await asyncio.sleep(0)
+        a.disconnect(7, ws_a)
+        await asyncio.sleep(0)
+        assert a.user_status[7] == "online"
+        b.disconnect(7, ws_b)
+        await asyncio.sleep(0)
+        assert b.user_status[7] == "offline"
+        await _stop(a, b)
+
+    asyncio.run(main())
+
+
+def test_simultaneous_last_disconnects_still_go_offline():
+    """두 워커에서 동시에 끊겨 서로 미룬 offline은 상대의 해제 통지를 받고 처리"""
+    async def main():
+        a, b = _cluster("simultaneous")
+        await _start(a, b)
+        ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+        await a.connect(8, ws_a)
+        await b.connect(8, ws_b)
+        await asyncio.sleep(0)
+        a.disconnect(8, ws_a)
+        b.disconnect(8, ws_b)
+        assert a.user_status[8] == b.user_status[8] == "online"
+        await asyncio.sleep(0)
+        assert a.user_status[8] == b.user_status[8] == "offline"
+        await _stop(a, b)
+
+    asyncio.run(main())
+
+
+def test_users_of_a_stopped_worker_go_offline():
+    async def main():
+        a, b = _cluster("leave")
+        await _start(a, b)
+        await b.connect(9, FakeWebSocket())
+        await asyncio.sleep(0)
+        assert a.remote.holds(9)
+        await b.remote.stop()
+        assert not a.remote.holds(9)
+        assert a.user_status[9] == "offline"
+        await _stop(a)
+        await b.backplane.close()
+
+    asyncio.run(main())
+
+
+def test_user_change_on_one_worker_evicts_user_cache_everywhere():
+    """다른 워커의 프로필/상태 변경(user 버전 갱신)도 인증 사용자 캐시에서 제거"""
+    from core.security import user_cache
+    from utils.versions import user_version
+
+    async def main():
+        a, b = _cluster("user-cache")
+        await _start(a, b)
+        a._loop = asyncio.get_running_loop()
+        user_cache.set(41, "cached user")
+        # b의 버전 변경 → 전파받은 a가 제거 (a 자신은 변경하지 않음)
+        b.versions._on_change = None
+        b._loop = a._loop
+        b.versions.bump(user_version(41))
+        await asyncio.sleep(0.01)
+        assert user_cache.get(41) is None
+        # 같은 값을 다시 받으면 그대로 (값이 바뀔 때만 제거)
+        user_cache.set(41, "reloaded")
+        await a._on_backplane({"op": "version", "origin": "other", "names": [user_version(41)], "value": a.versions.get(user_version(41))})
+        assert user_cache.get(41) == "reloaded"
+        # 로컬 변경도 같은 경로로 제거
+        a.versions.bump(user_version(41))
+        assert user_cache.get(41) is None
+        await _stop(a, b)
+
+    asyncio.run(main())
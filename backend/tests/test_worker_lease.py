@@ -0,0 +1,81 @@
+# backend/tests/test_worker_lease.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.worker_lease import WorkerLease
+from utils import snowflake
+from utils.worker_lease import WorkerIdLease, leases_table
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """워커 번호 임대 테이블만 있는 별도 DB (앱이 임대한 번호와 섞이지 않도록)"""
+    path = tmp_path / "leases.db"
+    WorkerLease.__table__.create(bind=create_engine(f"sqlite:///{path}"))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.delenv("WORKER_ID", raising=False)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+    # 테스트가 바꾼 프로세스 생성기를 앱 설정으로 복구
+    monkeypatch.setenv("WORKER_ID", "1")
+    snowflake.configure(1)
+
+
+def test_processes_lease_different_worker_ids(session_factory):
+    async def run():
+        first, second = WorkerIdLease(session_factory), WorkerIdLease(session_factory)
+        assert (await first.acquire(), await second.acquire()) == (0, 1)
+        # 반납한 번호는 다시 임대 가능
+        await first.stop()
+        assert await WorkerIdLease(session_factory).acquire() == 0
+
+    asyncio.run(run())
+
+
+def test_explicit_worker_id_held_by_live_process_fails_fast(session_factory, monkeypatch):
+    async def run():
+        monkeypatch.setenv("WORKER_ID", "7")
+        assert await WorkerIdLease(session_factory).acquire() == 7
+        with pytest.raises(RuntimeError):
+            await WorkerIdLease(session_factory).acquire()
+
+    asyncio.run(run())
+
+
+def test_expired_lease_is_taken_over_and_loser_releases_its_id(session_factory):
+    async def run():
+        stale, fresh = WorkerIdLease(session_factory), WorkerIdLease(session_factory)
+        assert await stale.acquire() == 0
+        async with session_factory() as db:
+            await db.execute(update(leases_table).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+        assert await fresh.acquire() == 0
+        # 번호를 빼앗긴 프로세스는 갱신 때 다른 번호로 옮김
+        await stale.renew()
+        assert stale.worker_id == 1
+        assert (snowflake.next_id() >> snowflake.SEQUENCE_BITS) & snowflake.MAX_WORKER_ID == 1
+
+    asyncio.run(run())
+
+
+def test_id_issuing_stops_when_lease_expires_unrenewed(session_factory):
+    async def run():
+        lease = WorkerIdLease(session_factory, ttl_ms=30)
+        await lease.start()
+
+        async def broken():
+            raise OSError("db down")
+
+        lease.renew = broken
+        await asyncio.sleep(0.1)
+        with pytest.raises(snowflake.WorkerIdUnavailable):
+            snowflake.next_id()
+        lease._task.cancel()
+        await asyncio.gather(lease._task, return_exceptions=True)
+
+    asyncio.run(run())
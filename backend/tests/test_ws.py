@@ -0,0 +1,54 @@
+# backend/tests/test_ws.py
+import json
+
+
+def _receive_until(ws, frame_type: str) -> list:
+    """frame_type 프레임이 올 때까지 받은 프레임 목록"""
+    frames = []
+    while True:
+        frame = json.loads(ws.receive_text())
+        frames.append(frame)
+        if frame.get("type") == frame_type:
+            return frames
+
+
+def _error_after(ws, payload: dict) -> dict:
+    """payload 전송 후 ping까지의 응답 중 error 프레임 (없으면 None)"""
+    ws.send_text(json.dumps(payload))
+    ws.send_text(json.dumps({"type": "ping"}))
+    errors = [frame for frame in _receive_until(ws, "pong") if frame.get("type") == "error"]
+    return errors[0] if errors else None
+
+
+def test_message_content_is_validated(client, make_user):
+    _, token, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "content"}, headers=headers).json()["room_id"]
+    with client.websocket_connect(f"/ws?token={token}") as ws:
+        for content in ({"evil": 1}, "", "   ", None, "x" * 100_000):
+            error = _error_after(ws, {"type": "message", "roomId": room_id, "content": content})
+            assert error is not None and error["roomId"] == room_id, content
+        # 거절 후에도 같은 연결로 정상 메시지 전송 가능
+        ws.send_text(json.dumps({"type": "join_room", "roomId": room_id}))
+        ws.send_text(json.dumps({"type": "message", "roomId": room_id, "content": "ok"}))
+        message = [frame for frame in _receive_until(ws, "message")][-1]
+        assert message["content"] == "ok"
+
+
+def test_malformed_ids_do_not_end_the_connection(client, make_user):
+    from utils.websocket_manager import manager
+
+    user, token, headers = make_user()
+    room_id = client.post("/rooms/", json={"name": "ids"}, headers=headers).json()["room_id"]
+    with client.websocket_connect(f"/ws?token={token}") as ws:
+        for payload in (
+            {"type": "join_room"},
+            {"type": "join_room", "roomId": "abc"},
+            {"type": "typing", "roomId": True},
+            {"type": "message", "roomId": "9" * 5000, "content": "x"},
+            {"type": "reaction", "roomId": room_id, "emoji": "👍"},
+            {"type": "reaction", "roomId": room_id, "messageId": "1e3", "emoji": "👍"},
+        ):
+            assert _error_after(ws, payload) is not None, payload
+        assert user["user_id"] in manager.active_connections
+    # 연결이 정리되어 offline 처리
+    assert user["user_id"] not in manager.active_connections
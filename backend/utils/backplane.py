@@ -0,0 +1,185 @@
+# backend/utils/backplane.py
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import urlparse
+
+from utils.codec import json_codec
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class BackplaneError(Exception):
+    pass
+
+
+class Backplane:
+    """워커(프로세스/파드) 간 브로드캐스트를 전달하는 pub/sub 인터페이스"""
+
+    async def start(self, handler: Handler):
+        raise NotImplementedError
+
+    async def publish(self, message: dict):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class LocalBackplane(Backplane):
+    """같은 프로세스 안의 구독자끼리만 전달 (단일 워커/테스트용)
+
+    hub 이름이 같은 인스턴스끼리 메시지를 주고받으므로
+    외부 서비스 없이 여러 워커 상황을 흉내낼 수 있다.
+    """
+
+    _hubs: Dict[str, Set["LocalBackplane"]] = defaultdict(set)
+
+    def __init__(self, hub: str = "default"):
+        self.hub = hub
+        self._handler: Optional[Handler] = None
+
+    async def start(self, handler: Handler):
+        self._handler = handler
+        self._hubs[self.hub].add(self)
+
+    async def publish(self, message: dict):
+        for peer in list(self._hubs[self.hub]):
+            if peer._handler is not None:
+                await peer._handler(message)
+
+    async def close(self):
+        self._hubs[self.hub].discard(self)
+        self._handler = None
+
+
+def _encode_command(*args: bytes) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis 연결이 끊어졌습니다.")
+    prefix, rest = line[:1], line[1:-2]
+    if prefix == b"+":
+        return rest.decode()
+    if prefix == b"-":
+        raise BackplaneError(rest.decode())
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        return [await _read_reply(reader) for _ in range(int(rest))]
+    raise BackplaneError(f"알 수 없는 응답: {line!r}")
+
+
+class RedisBackplane(Backplane):
+    """Redis PUBLISH/SUBSCRIBE 기반 구현 (RESP 프로토콜 직접 사용, 추가 의존성 없음)
+
+    redis://[:password@]host:port 또는 unix:///path/to/redis.sock 주소를 받는다.
+    """
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, url: str, channel: str = "chat:broadcast"):
+        parsed = urlparse(url)
+        self.unix_path = parsed.path if parsed.scheme == "unix" else None
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.channel = channel.encode()
+        self._handler: Optional[Handler] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._lock = asyncio.Lock()
+        self._subscriber: Optional[asyncio.Task] = None
+
+    async def _open(self):
+        if self.unix_path:
+            reader, writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(_encode_command(b"AUTH", self.password.encode()))
+            await writer.drain()
+            await _read_reply(reader)
+        return reader, writer
+
+    async def start(self, handler: Handler):
+        self._handler = handler
+        self._subscriber = asyncio.create_task(self._subscribe_loop())
+
+    async def _subscribe_loop(self):
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._open()
+                writer.write(_encode_command(b"SUBSCRIBE", self.channel))
+                await writer.drain()
+                while True:
+                    reply = await _read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        try:
+                            await self._handler(json_codec.decode(reply[2]))
+                        except Exception:
+                            logger.exception("backplane 메시지 처리 실패")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("backplane 구독 연결 오류, 재접속합니다: %r", exc)
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def publish(self, message: dict):
+        data = json_codec.encode(message).encode()
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        self._reader, self._writer = await self._open()
+                    self._writer.write(_encode_command(b"PUBLISH", self.channel, data))
+                    await self._writer.drain()
+                    await _read_reply(self._reader)
+                    return
+                except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                    # 끊긴 연결은 한 번만 다시 열어서 재시도
+                    self._drop_publisher()
+                    if attempt:
+                        raise
+
+    def _drop_publisher(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self):
+        if self._subscriber:
+            self._subscriber.cancel()
+            try:
+                await self._subscriber
+            except asyncio.CancelledError:
+                pass
+        self._drop_publisher()
+
+
+def create_backplane(url: Optional[str]) -> Backplane:
+    """CHAT_BACKPLANE_URL 값으로 구현 선택 (비어 있으면 로컬)"""
+    if not url or url == "local":
+        return LocalBackplane()
+    scheme = urlparse(url).scheme
+    if scheme in ("redis", "unix"):
+        return RedisBackplane(url)
+    raise ValueError(f"지원하지 않는 CHAT_BACKPLANE_URL 입니다: {url}")
@@ -0,0 +1,137 @@
+# backend/utils/codec.py
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 바이너리 모드 비활성
+    msgpack = None
+
+Data = Union[str, bytes]
+
+# WebSocket 서브프로토콜 이름 (클라이언트가 new WebSocket(url, ["chat.msgpack", "chat.json"])로 제안)
+SUBPROTOCOL_PREFIX = "chat."
+
+
+class Codec:
+    """/ws 프레임 인코딩 방식"""
+
+    name = ""
+    binary = False
+
+    def encode(self, payload: dict) -> Data:
+        raise NotImplementedError
+
+    def decode(self, data: Data) -> Any:
+        raise NotImplementedError
+
+
+if orjson is not None:
+    def _json_dumps(payload: dict) -> str:
+        return orjson.dumps(payload).decode()
+
+    _json_loads = orjson.loads
+else:
+    def _json_default(value):
+        # orjson과 같은 형식으로 직렬화
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Enum):
+            return value.value
+        raise TypeError(f"JSON으로 직렬화할 수 없는 값입니다: {type(value).__name__}")
+
+    def _json_dumps(payload: dict) -> str:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+    _json_loads = json.loads
+
+
+class JsonCodec(Codec):
+    """텍스트 JSON 프레임 (orjson이 있으면 orjson, 없으면 표준 json)"""
+
+    name = "json"
+
+    def encode(self, payload: dict) -> str:
+        return _json_dumps(payload)
+
+    def decode(self, data: Data) -> Any:
+        return _json_loads(data)
+
+
+class MsgpackCodec(Codec):
+    """바이너리 MessagePack 프레임 (서브프로토콜 chat.msgpack으로 선택)"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, payload: dict) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def decode(self, data: Data) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        return msgpack.unpackb(data, raw=False)
+
+
+json_codec = JsonCodec()
+
+CODECS: Dict[str, Codec] = {json_codec.name: json_codec}
+if msgpack is not None:
+    CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def negotiate(offered: Iterable[str]) -> Optional[str]:
+    """클라이언트가 제안한 서브프로토콜 중 지원하는 첫 번째 (없으면 None → 기본 JSON)"""
+    for subprotocol in offered:
+        if subprotocol.startswith(SUBPROTOCOL_PREFIX) and subprotocol[len(SUBPROTOCOL_PREFIX):] in CODECS:
+            return subprotocol
+    return None
+
+
+def codec_for_subprotocol(subprotocol: Optional[str]) -> Codec:
+    if not subprotocol:
+        return json_codec
+    return CODECS[subprotocol[len(SUBPROTOCOL_PREFIX):]]
+
+
+class EncodedFrame:
+    """브로드캐스트 1회분 프레임. 코덱별로 처음 필요할 때 한 번만 인코딩해서 모든 수신자가 공유"""
+
+    __slots__ = ("payload", "_encoded")
+
+    def __init__(self, payload: dict, **encoded: Data):
+        self.payload = payload
+        self._encoded: Dict[str, Data] = encoded
+
+    def encode(self, codec: Codec) -> Data:
+        data = self._encoded.get(codec.name)
+        if data is None:
+            data = self._encoded[codec.name] = codec.encode(self.payload)
+        return data
+
+
+async def receive_frame(websocket: WebSocket, codec: Codec) -> Optional[Any]:
+    """클라이언트 프레임 1개 수신 후 디코딩 (형식이 잘못된 프레임은 None)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    data = message.get("text")
+    if data is None:
+        data = message.get("bytes")
+    try:
+        return codec.decode(data)
+    except Exception:
+        logger.debug("프레임 디코딩 실패 codec=%s", codec.name)
+        return None
@@ -0,0 +1,79 @@
+# backend/utils/frames.py
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket
+
+from database import AsyncSessionLocal
+from models.user import User
+from utils.reactions import ReactionError, apply_reaction
+from utils.websocket_manager import manager
+
+# /ws 수신 프레임 필드 검증과 프레임 처리 공용 함수 (routers/ws.py, routers/websocket.py)
+# 클라이언트가 보낸 값은 그대로 DB 배치나 브로드캐스트에 들어가므로 형식을 먼저 확인한다.
+MESSAGE_MAX_LENGTH = int(os.getenv("MESSAGE_MAX_LENGTH", "4000"))  # 메시지 본문 최대 글자 수
+
+# roomId가 필요한 프레임 종류
+ROOM_FRAME_TYPES = {"join_room", "leave_room", "message", "reaction", "typing"}
+
+
+def message_content(msg: Dict[str, Any]) -> Optional[str]:
+    """message 프레임의 본문 (비어 있지 않은 MESSAGE_MAX_LENGTH자 이하 문자열이 아니면 None)"""
+    content = msg.get("content")
+    if not isinstance(content, str) or not content.strip() or len(content) > MESSAGE_MAX_LENGTH:
+        return None
+    return content
+
+
+def frame_id(msg: Dict[str, Any], key: str) -> Optional[int]:
+    """roomId/messageId 같은 ID 필드 (숫자 또는 숫자 문자열, 64비트 양수가 아니면 None)"""
+    value = msg.get(key)
+    if isinstance(value, str) and value.isascii() and value.isdigit() and len(value) <= 19:
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 < value < 2 ** 63:
+        return None
+    return value
+
+
+async def notify_forbidden(websocket: WebSocket, room_id: int):
+    """방 멤버가 아닌 유저의 방 프레임(join_room/leave_room/message) 거절"""
+    await manager.send_personal(websocket, {
+        "type": "error",
+        "roomId": room_id,
+        "detail": "해당 채팅방에 접근 권한이 없습니다."
+    })
+
+
+async def notify_invalid(websocket: WebSocket, room_id: Optional[int], detail: str):
+    """형식이 잘못된 프레임 거절"""
+    await manager.send_personal(websocket, {
+        "type": "error",
+        "roomId": room_id,
+        "detail": detail
+    })
+
+
+async def handle_reaction(websocket: WebSocket, user: User, room_id: int, msg: Dict[str, Any]):
+    """reaction 프레임 처리 ({"op": "add" | "remove", "messageId", "emoji"})"""
+    message_id = frame_id(msg, "messageId")
+    if message_id is None:
+        await notify_invalid(websocket, room_id, "messageId가 올바르지 않습니다.")
+        return
+    emoji = str(msg.get("emoji", ""))
+    if not 0 < len(emoji) <= 10:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            await apply_reaction(db, room_id, message_id, user.user_id, emoji, msg.get("op", "add") != "remove")
+    except ReactionError as exc:
+        await manager.send_personal(websocket, {"type": "error", "roomId": room_id, "detail": str(exc)})
+
+
+async def notify_message_failed(websocket: WebSocket, room_id: int, client_id, exc: Exception):
+    """메시지 저장 실패를 보낸 사람에게 알림"""
+    await manager.send_personal(websocket, {
+        "type": "message_failed",
+        "roomId": room_id,
+        "clientId": client_id,
+        "detail": "메시지 저장에 실패했습니다. 다시 전송해 주세요."
+    })
@@ -0,0 +1,128 @@
+# backend/utils/membership.py
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Set
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models.room import Room
+from models.room_member import RoomMember
+
+# 유저 목록 → 유저별 참여 중인 방 집합
+MembershipLoader = Callable[[List[int]], Awaitable[Dict[int, Set[int]]]]
+
+
+async def load_memberships(user_ids: List[int]) -> Dict[int, Set[int]]:
+    """room_members에서 유저들의 활성 방 목록 조회 (쿼리 1회)"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(RoomMember.user_id, RoomMember.room_id)
+            .join(Room, Room.room_id == RoomMember.room_id)
+            .where(RoomMember.user_id.in_(user_ids), Room.is_active == True)
+        )
+        rows = result.all()
+    memberships: Dict[int, Set[int]] = defaultdict(set)
+    for user_id, room_id in rows:
+        memberships[user_id].add(room_id)
+    return memberships
+
+
+class MembershipIndex:
+    """WebSocket 계층의 방 멤버십 인덱스 (room → 유저 집합, 유저 → room 집합)
+
+    유저별로 처음 필요할 때 room_members에서 한 번 읽고, 이후에는
+    rooms 라우터의 참여/나가기/생성/삭제가 add/remove/drop_room으로 직접 갱신한다.
+    그래서 join_room/message 프레임 권한 확인은 DB 없이 집합 조회 한 번이다.
+
+    - REST 엔드포인트는 스레드풀에서 호출하므로 갱신은 락으로 보호한다.
+    - 로드 중에 같은 유저(또는 방 삭제) 변경이 들어오면 로드 결과를 버리고 다시 읽는다.
+    - room → 유저 집합에는 로드된 유저만 들어 있다 (접속 유저 기준 조회용).
+    - 로드된 유저는 유지한다 (유저당 방 ID 집합 하나라 전체 유저 수에 비례).
+    """
+
+    def __init__(self, loader: MembershipLoader = load_memberships):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._room_users: Dict[int, Set[int]] = defaultdict(set)
+        self._user_rooms: Dict[int, Set[int]] = {}
+        # 로드되지 않은 유저의 변경 횟수 / 방 삭제 횟수 (로드 중 변경 감지용)
+        self._versions: Dict[int, int] = defaultdict(int)
+        self._epoch = 0
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._user_rooms)
+
+    async def ensure_loaded(self, user_ids: Iterable[int]):
+        """아직 인덱스에 없는 유저의 멤버십을 한 번에 로드"""
+        missing = [user_id for user_id in set(user_ids) if user_id not in self._user_rooms]
+        while missing:
+            with self._lock:
+                epoch = self._epoch
+                versions = {user_id: self._versions[user_id] for user_id in missing}
+            memberships = await self._loader(missing)
+            self.loads += 1
+            retry = []
+            with self._lock:
+                for user_id in missing:
+                    if user_id in self._user_rooms:
+                        continue
+                    if self._epoch != epoch or self._versions[user_id] != versions[user_id]:
+                        retry.append(user_id)
+                        continue
+                    rooms = set(memberships.get(user_id, ()))
+                    self._user_rooms[user_id] = rooms
+                    self._versions.pop(user_id, None)
+                    for room_id in rooms:
+                        self._room_users[room_id].add(user_id)
+            missing = retry
+
+    async def check(self, room_id: int, user_id: int) -> bool:
+        """유저가 방 멤버인지 확인 (로드된 뒤에는 O(1))"""
+        if user_id not in self._user_rooms:
+            await self.ensure_loaded((user_id,))
+        return room_id in self._user_rooms.get(user_id, ())
+
+    def rooms_of(self, user_id: int) -> Set[int]:
+        return set(self._user_rooms.get(user_id, ()))
+
+    def add(self, room_id: int, user_id: int):
+        with self._lock:
+            rooms = self._user_rooms.get(user_id)
+            if rooms is None:
+                self._versions[user_id] += 1
+                return
+            rooms.add(room_id)
+            self._room_users[room_id].add(user_id)
+
+    def remove(self, room_id: int, user_id: int):
+        with self._lock:
+            rooms = self._user_rooms.get(user_id)
+            if rooms is None:
+                self._versions[user_id] += 1
+                return
+            rooms.discard(room_id)
+            users = self._room_users.get(room_id)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._room_users[room_id]
+
+    def drop_room(self, room_id: int):
+        with self._lock:
+            self._epoch += 1
+            for user_id in self._room_users.pop(room_id, ()):
+                self._user_rooms[user_id].discard(room_id)
+
+    async def audience(self, subjects: Set[int], viewers: Set[int]) -> Dict[int, Set[int]]:
+        """subject별로 방을 하나라도 같이 쓰는 viewer 집합 (presence 전송 대상)"""
+        await self.ensure_loaded(subjects | viewers)
+        result: Dict[int, Set[int]] = {}
+        with self._lock:
+            for subject in subjects:
+                shared: Set[int] = set()
+                for room_id in self._user_rooms.get(subject, ()):
+                    shared |= self._room_users.get(room_id, set())
+                result[subject] = shared & viewers
+        return result
@@ -0,0 +1,142 @@
+# backend/utils/message_cache.py
+import asyncio
+import logging
+import os
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 최근 메시지 캐시 설정
+RECENT_MESSAGES_PER_ROOM = int(os.getenv("RECENT_MESSAGES_PER_ROOM", "50"))
+RECENT_MESSAGES_MAX_BYTES = int(os.getenv("RECENT_MESSAGES_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# (message_id, 직렬화된 메시지 프레임) 목록을 오래된 순으로 반환하는 DB 로더
+Loader = Callable[[int, int], Awaitable[List[Tuple[int, str]]]]
+
+
+class _RoomBuffer:
+    __slots__ = ("items", "size", "complete")
+
+    def __init__(self, capacity: int):
+        self.items: Deque[Tuple[int, str]] = deque(maxlen=capacity)
+        self.size = 0
+        # False면 DB 이력 없이 최근 브로드캐스트만 담긴 상태
+        self.complete = False
+
+
+class RecentMessageCache:
+    """방별 최근 메시지 링 버퍼 (WebSocket 계층 메모리)
+
+    broadcast_room으로 전달된 메시지 프레임을 직렬화된 그대로 보관한다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 안 쓰인 방부터 버린다.
+    DB 이력이 없는 방은 첫 조회 때 한 번만 로드하고(동시 조회는 같은 로드를 기다림),
+    로드 중에 도착한 메시지와 합쳐서 완성된 버퍼로 만든다.
+    """
+
+    def __init__(self, per_room: int = RECENT_MESSAGES_PER_ROOM, max_bytes: int = RECENT_MESSAGES_MAX_BYTES):
+        self.per_room = per_room
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._rooms: "OrderedDict[int, _RoomBuffer]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def _buffer(self, room_id: int) -> _RoomBuffer:
+        buf = self._rooms.get(room_id)
+        if buf is None:
+            buf = self._rooms[room_id] = _RoomBuffer(self.per_room)
+        else:
+            self._rooms.move_to_end(room_id)
+        return buf
+
+    def _push(self, buf: _RoomBuffer, message_id: int, data: str):
+        items = buf.items
+        if items and message_id <= items[-1][0]:
+            # 다른 워커에서 늦게 도착한 메시지 → ID 순서 위치에 삽입 (중복은 무시)
+            if any(existing == message_id for existing, _ in items):
+                return
+            if len(items) == items.maxlen and message_id < items[0][0]:
+                return
+            index = next(i for i, (existing, _) in enumerate(items) if existing > message_id)
+            if len(items) == items.maxlen:
+                buf.size -= len(items[0][1])
+                self.total_bytes -= len(items[0][1])
+                items.popleft()
+                index -= 1
+            items.insert(index, (message_id, data))
+        else:
+            if len(items) == items.maxlen:
+                buf.size -= len(items[0][1])
+                self.total_bytes -= len(items[0][1])
+            items.append((message_id, data))
+        buf.size += len(data)
+        self.total_bytes += len(data)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._rooms:
+            room_id, buf = self._rooms.popitem(last=False)
+            self.total_bytes -= buf.size
+            self.evictions += 1
+
+    def append(self, room_id: int, message_id: int, data: str):
+        """브로드캐스트된 메시지 프레임 추가"""
+        self._push(self._buffer(room_id), message_id, data)
+        self._evict()
+
+    def discard(self, room_id: int, message_ids: Iterable[int]):
+        """방 버퍼에서 특정 메시지 제거 (브로드캐스트됐지만 저장에 실패한 메시지)"""
+        buf = self._rooms.get(room_id)
+        if buf is None:
+            return
+        message_ids = set(message_ids)
+        kept = [(message_id, data) for message_id, data in buf.items if message_id not in message_ids]
+        removed = sum(len(data) for message_id, data in buf.items if message_id in message_ids)
+        if not removed:
+            return
+        buf.items = deque(kept, maxlen=self.per_room)
+        buf.size -= removed
+        self.total_bytes -= removed
+
+    def invalidate(self, room_id: int):
+        """방 버퍼 제거 (메시지 수정/삭제 등으로 내용이 바뀐 경우)"""
+        buf = self._rooms.pop(room_id, None)
+        if buf is not None:
+            self.total_bytes -= buf.size
+
+    async def snapshot(self, room_id: int, loader: Loader) -> List[str]:
+        """방의 최근 메시지 프레임 목록 (오래된 순). 캐시에 없으면 DB에서 채움"""
+        buf = self._rooms.get(room_id)
+        if buf is not None and buf.complete:
+            self.hits += 1
+            self._rooms.move_to_end(room_id)
+            return [data for _, data in buf.items]
+
+        pending = self._loading.get(room_id)
+        if pending is None:
+            self.misses += 1
+            pending = self._loading[room_id] = asyncio.ensure_future(self._backfill(room_id, loader))
+        try:
+            await asyncio.shield(pending)
+        except Exception:
+            logger.exception("최근 메시지 로드 실패 room_id=%s", room_id)
+
+        buf = self._rooms.get(room_id)
+        return [data for _, data in buf.items] if buf is not None else []
+
+    async def _backfill(self, room_id: int, loader: Loader):
+        try:
+            rows = await loader(room_id, self.per_room)
+        finally:
+            self._loading.pop(room_id, None)
+        # 로드하는 동안 도착한 메시지와 합침
+        buf = self._buffer(room_id)
+        for message_id, data in rows:
+            self._push(buf, message_id, data)
+        buf.complete = True
+        self._evict()
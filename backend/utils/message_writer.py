@@ -0,0 +1,193 @@
+# backend/utils/message_writer.py
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, OperationalError, StatementError
+
+from database import AsyncSessionLocal
+from models.message import Message
+from utils.read_cache import invalidate
+from utils.unread import record_new_messages
+from utils.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# write-behind 설정
+MESSAGE_FLUSH_INTERVAL_MS = int(os.getenv("MESSAGE_FLUSH_INTERVAL_MS", "50"))  # 최대 대기 시간
+MESSAGE_BATCH_SIZE = int(os.getenv("MESSAGE_BATCH_SIZE", "500"))               # 배치당 최대 행 수
+MESSAGE_FLUSH_RETRIES = int(os.getenv("MESSAGE_FLUSH_RETRIES", "3"))           # 실패 시 재시도 횟수
+MESSAGE_MAX_PENDING = int(os.getenv("MESSAGE_MAX_PENDING", "10000"))           # 저장 대기 행 상한
+
+ErrorCallback = Callable[[Exception], Awaitable[None]]
+
+
+def _is_transient(exc: StatementError) -> bool:
+    """연결 끊김/락 대기 초과처럼 다시 시도하면 성공할 수 있는 DB 오류인지"""
+    return isinstance(exc, OperationalError) or (isinstance(exc, DBAPIError) and exc.connection_invalidated)
+
+
+class MessageWriterFull(Exception):
+    """저장 대기열이 가득 차서 메시지를 받을 수 없음"""
+
+
+class MessageWriterClosed(Exception):
+    """종료 중이라 새 메시지를 받을 수 없음"""
+
+
+class MessageWriter:
+    """채팅 메시지 write-behind 배치 저장기
+
+    submit()은 행을 버퍼에 넣고 바로 반환하므로 호출 측은 커밋을 기다리지 않고
+    브로드캐스트할 수 있다. 버퍼는 MESSAGE_FLUSH_INTERVAL_MS마다 또는
+    MESSAGE_BATCH_SIZE 행이 쌓이면 bulk INSERT 한 번으로 커밋된다.
+
+    내구성: 브로드캐스트된 메시지는 최대 한 주기 동안 메모리에만 있다.
+    정상 종료 시에는 stop()이 남은 행을 모두 저장하고, 재시도까지 실패한
+    행은 on_error 콜백으로 보낸 사람에게 알린다. 프로세스가 비정상 종료되면
+    마지막 주기의 메시지는 유실될 수 있다.
+    """
+
+    RETRY_BACKOFF = 0.1
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        interval_ms: int = MESSAGE_FLUSH_INTERVAL_MS,
+        batch_size: int = MESSAGE_BATCH_SIZE,
+        max_retries: int = MESSAGE_FLUSH_RETRIES,
+        max_pending: int = MESSAGE_MAX_PENDING,
+        on_flush: Callable[[Iterable[int]], None] = lambda room_ids: None,
+        on_fail: Callable[[List[dict]], None] = lambda rows: None,
+    ):
+        self._session_factory = session_factory
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self.on_flush = on_flush
+        self.on_fail = on_fail
+        self._buffer: List[Tuple[dict, Optional[ErrorCallback]]] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def start(self):
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """새 메시지 접수를 막고 남은 버퍼를 모두 저장"""
+        self._closing = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def submit(self, row: dict, on_error: Optional[ErrorCallback] = None):
+        """Message 행 1개를 저장 대기열에 추가"""
+        if self._closing:
+            raise MessageWriterClosed("메시지 저장기가 종료 중입니다.")
+        if len(self._buffer) >= self.max_pending:
+            raise MessageWriterFull("메시지 저장 대기열이 가득 찼습니다.")
+        self._buffer.append((row, on_error))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """버퍼에 쌓인 행을 배치 단위로 저장"""
+        async with self._lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[dict, Optional[ErrorCallback]]], retries: Optional[int] = None):
+        rows = [row for row, _ in batch]
+        retries = self.max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                async with self._session_factory() as db:
+                    await db.execute(insert(Message), rows)
+                    # 안 읽은 메시지 카운터도 같은 트랜잭션에서 증가
+                    await record_new_messages(db, rows)
+                    await db.commit()
+                self.written += len(rows)
+                self._notify_flush(rows)
+                return
+            except StatementError as exc:
+                transient = _is_transient(exc)
+                if transient and attempt < retries:
+                    logger.warning("메시지 배치 저장 실패(%d행), 재시도 %d: %r", len(rows), attempt + 1, exc)
+                    await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                # 데이터 자체의 문제(FK 위반, 바인딩 불가 값 등)는 어느 행인지 모르므로
+                # 한 행씩 나눠서 저장해 문제 행만 실패시킨다 (연결 장애로 재시도를 다 쓴 경우는 재시도 없이)
+                if len(batch) > 1:
+                    for item in batch:
+                        await self._write([item], retries=0 if transient else None)
+                    return
+                await self._fail(batch, exc)
+                return
+            except Exception as exc:
+                if attempt < retries:
+                    logger.warning("메시지 배치 저장 실패(%d행), 재시도 %d: %r", len(rows), attempt + 1, exc)
+                    await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                await self._fail(batch, exc)
+
+    def _notify_flush(self, rows: List[dict]):
+        """저장된 방 목록 통지 (마지막 메시지 요약이 바뀌었으므로 방 정보 캐시 무효화)"""
+        try:
+            self.on_flush({row["room_id"] for row in rows})
+        except Exception:
+            logger.exception("저장 완료 통지 실패")
+
+    async def _fail(self, batch: List[Tuple[dict, Optional[ErrorCallback]]], exc: Exception):
+        """최종 실패한 행을 보낸 사람에게 알림"""
+        logger.error("메시지 저장 최종 실패(%d행): %r", len(batch), exc)
+        self.failed += len(batch)
+        try:
+            self.on_fail([row for row, _ in batch])
+        except Exception:
+            logger.exception("저장 실패 통지 실패")
+        for _, on_error in batch:
+            if on_error is not None:
+                try:
+                    await on_error(exc)
+                except Exception:
+                    logger.exception("저장 실패 알림 전송 실패")
+
+def _discard_failed(rows: List[dict]):
+    """저장 실패한 메시지는 이미 브로드캐스트되어 최근 메시지 버퍼에 있으므로 제거"""
+    per_room = defaultdict(list)
+    for row in rows:
+        per_room[row["room_id"]].append(row["message_id"])
+    for room_id, message_ids in per_room.items():
+        manager.discard_messages(room_id, message_ids)
+
+
+message_writer = MessageWriter(
+    on_flush=lambda room_ids: invalidate(rooms=room_ids),
+    on_fail=_discard_failed,
+)
@@ -0,0 +1,264 @@
+# backend/utils/metrics.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# /metrics (Prometheus 텍스트 형식) 수집기
+# 기록은 카운터 증가/버킷 탐색 정도라 부하 중에도 켜 둘 수 있다. 값은 워커(프로세스)별이다.
+# 연결 수, 큐 길이, 풀 상태처럼 이미 어딘가에 있는 값은 따로 기록하지 않고 스크레이프 때 읽는다.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+LOOP_LAG_INTERVAL_MS = int(os.getenv("METRICS_LOOP_LAG_INTERVAL_MS", "500"))
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Gauge(Metric):
+    """현재 값 (set으로 기록하거나 스크레이프 때 callback으로 읽음)"""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Tuple[Labels, float]]]] = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                items = list(self.callback())
+            except Exception:
+                logger.exception("metric callback 실패 name=%s", self.name)
+                return []
+        else:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Histogram(Metric):
+    """고정 버킷 히스토그램 (관측 1회 = 이분 탐색 1번 + 카운터 증가)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels → [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(counts)) for labels, counts in self._values.items()]
+        lines = []
+        for labels, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="%s"' % _format_value(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, callback))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# === 실시간 (WebSocketManager) ===
+ws_fanout_recipients = registry.histogram(
+    "chat_ws_fanout_recipients", "브로드캐스트 1회당 대상 소켓 수", ("type",), SIZE_BUCKETS
+)
+ws_fanout_seconds = registry.histogram(
+    "chat_ws_fanout_seconds", "브로드캐스트 1회의 인코딩+큐 적재 시간", ("type",)
+)
+ws_send_failures = registry.counter(
+    "chat_ws_send_failures_total", "전송 실패 (queue_full: 큐 초과로 제거, send_error: 소켓 전송 오류/타임아웃)", ("reason",)
+)
+ws_frames_dropped = registry.counter(
+    "chat_ws_frames_dropped_total", "큐가 가득 차서 버려진 프레임 수 (drop_oldest/coalesce 정책)"
+)
+event_loop_lag = registry.histogram(
+    "chat_event_loop_lag_seconds", "이벤트 루프 지연 (주기 작업이 예정보다 늦게 실행된 시간)"
+)
+
+# === DB ===
+db_session_seconds = registry.histogram(
+    "chat_db_session_hold_seconds", "요청 의존성(get_db/get_async_db)이 세션을 잡고 있던 시간", ("kind",)
+)
+
+# === HTTP ===
+http_request_seconds = registry.histogram(
+    "chat_http_request_duration_seconds", "HTTP 요청 처리 시간 (라우트 경로 템플릿별)", ("method", "route")
+)
+http_requests = registry.counter(
+    "chat_http_requests_total", "HTTP 요청 수", ("method", "route", "status")
+)
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정 (interval마다 깨어나서 예정보다 늦은 시간을 기록)"""
+
+    def __init__(self, interval_ms: int = LOOP_LAG_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.last = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None and METRICS_ENABLED:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, loop.time() - started - self.interval)
+            event_loop_lag.observe(self.last)
+
+
+loop_lag = LoopLagMonitor()
+registry.gauge(
+    "chat_event_loop_lag_last_seconds", "마지막으로 측정한 이벤트 루프 지연",
+    callback=lambda: [((), loop_lag.last)],
+)
+
+
+class MetricsMiddleware:
+    """라우트별 HTTP 지연 기록 (순수 ASGI 미들웨어, WebSocket은 제외)
+
+    라벨은 실제 경로가 아니라 라우트 템플릿(/rooms/{room_id})이라 라벨 수가 라우트 수로 제한된다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_seconds.observe(time.perf_counter() - started, method, path)
+            http_requests.inc(method, path, str(status_code))
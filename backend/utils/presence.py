@@ -0,0 +1,120 @@
+# backend/utils/presence.py
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from utils.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+# presence 변경을 모아서 보내는 주기 (같은 주기 안의 접속/해제 반복은 최종 상태 1건으로 합쳐짐)
+PRESENCE_FLUSH_INTERVAL_MS = int(os.getenv("PRESENCE_FLUSH_INTERVAL_MS", "1000"))
+
+# (변경된 유저 집합, 이 워커에 접속한 유저 집합) → 변경 유저별로 같은 방에 속한 접속 유저
+# (WebSocketManager가 멤버십 인덱스의 audience를 넘겨줌)
+AudienceLoader = Callable[[Set[int], Set[int]], Awaitable[Dict[int, Set[int]]]]
+
+
+class PresenceCoalescer:
+    """유저별 presence 변경을 주기적으로 모아 presence_diff 프레임으로 전송
+
+    - 주기 안에서 여러 번 바뀐 유저는 마지막 상태만 보내고,
+      마지막으로 보낸 상태와 같아지면(재접속 등) 아예 보내지 않는다.
+    - 받는 쪽은 변경 유저와 같은 방에 속한 유저(와 본인의 다른 탭)로 한정한다.
+    - 변경 목록은 백플레인으로도 발행하고, 각 워커가 자기 접속 유저 기준으로 대상을 고른다.
+    """
+
+    def __init__(
+        self,
+        manager: "WebSocketManager",
+        audience_loader: AudienceLoader,
+        interval_ms: int = PRESENCE_FLUSH_INTERVAL_MS,
+    ):
+        self.manager = manager
+        self.interval = interval_ms / 1000
+        self.audience_loader = audience_loader
+        self._pending: Dict[int, dict] = {}
+        # 마지막으로 내보낸 상태 (offline은 보관하지 않음)
+        self._published: Dict[int, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.suppressed = 0
+
+    def update(self, user_id: int, status: str, **fields):
+        """상태 변경 기록 (실제 전송은 다음 flush 때)"""
+        self._pending[user_id] = {"userId": user_id, "status": status, **fields}
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("presence flush 실패")
+
+    async def flush(self):
+        """모인 변경 중 실제로 달라진 것만 전송"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        changes: List[dict] = []
+        for user_id, state in pending.items():
+            if self._published.get(user_id, {"userId": user_id, "status": "offline"}) == state:
+                self.suppressed += 1
+                continue
+            changes.append(state)
+            if state["status"] == "offline":
+                self._published.pop(user_id, None)
+            else:
+                self._published[user_id] = state
+        if not changes:
+            return
+        self.sent += len(changes)
+        await self.deliver(changes)
+        await self.manager._publish({"op": "presence", "changes": changes})
+
+    async def deliver(self, changes: Iterable[dict]):
+        """이 워커에 접속한 유저 중 대상자에게 presence_diff 전송"""
+        manager = self.manager
+        changes = list(changes)
+        viewers = set(manager.active_connections)
+        if not changes or not viewers:
+            return
+        audience = await self.audience_loader({state["userId"] for state in changes}, viewers)
+
+        per_viewer: Dict[int, List[dict]] = defaultdict(list)
+        for state in changes:
+            subject = state["userId"]
+            targets = set(audience.get(subject, ()))
+            if subject in viewers:
+                targets.add(subject)
+            for viewer in targets:
+                per_viewer[viewer].append(state)
+
+        # 같은 변경 목록을 받는 유저끼리 묶어서 프레임은 한 번만 직렬화
+        groups: Dict[tuple, List[int]] = defaultdict(list)
+        for viewer, states in per_viewer.items():
+            groups[tuple(state["userId"] for state in states)].append(viewer)
+        for group_viewers in groups.values():
+            sockets = [
+                ws
+                for viewer in group_viewers
+                for ws in list(manager.active_connections.get(viewer, ()))
+            ]
+            manager._fanout(sockets, {"type": "presence_diff", "changes": per_viewer[group_viewers[0]]})
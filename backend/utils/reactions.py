@@ -0,0 +1,129 @@
+# backend/utils/reactions.py
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.message import Message
+from models.message_reaction import MessageReaction, MessageReactionCount
+from utils.websocket_manager import manager
+
+# 반응 수는 message_reaction_counts에 (message_id, emoji)별로 미리 집계해 두고
+# 반응 추가/취소와 같은 트랜잭션에서 증감한다. 이력 조회는 페이지당 IN 조회 한 번.
+
+counts_table = MessageReactionCount.__table__
+reactions_table = MessageReaction.__table__
+
+
+class ReactionError(Exception):
+    status_code = 400
+
+
+class ReactionForbidden(ReactionError):
+    status_code = 403
+
+
+class ReactionNotFound(ReactionError):
+    status_code = 404
+
+
+def _count_key(message_id: int, emoji: str):
+    return and_(counts_table.c.message_id == message_id, counts_table.c.emoji == emoji)
+
+
+def _reaction_key(message_id: int, user_id: int, emoji: str):
+    return and_(
+        reactions_table.c.message_id == message_id,
+        reactions_table.c.user_id == user_id,
+        reactions_table.c.emoji == emoji,
+    )
+
+
+async def _current_count(db: AsyncSession, message_id: int, emoji: str) -> int:
+    count = await db.scalar(select(counts_table.c.count).where(_count_key(message_id, emoji)))
+    return count or 0
+
+
+async def find_message_room(db: AsyncSession, message_id: int) -> Optional[int]:
+    """반응 대상 메시지의 방 ID (없거나 삭제된 메시지면 None)"""
+    return await db.scalar(
+        select(Message.room_id).where(Message.message_id == message_id, Message.is_deleted == False)
+    )
+
+
+async def add_reaction(db: AsyncSession, message_id: int, user_id: int, emoji: str) -> Tuple[bool, int]:
+    """반응 추가 후 (변경 여부, 해당 이모지 반응 수). 이미 누른 반응이면 변경 없이 현재 수 반환"""
+    for attempt in range(2):
+        if await db.scalar(select(reactions_table.c.id).where(_reaction_key(message_id, user_id, emoji))) is not None:
+            count = await _current_count(db, message_id, emoji)
+            await db.commit()
+            return False, count
+        try:
+            await db.execute(insert(reactions_table).values(message_id=message_id, user_id=user_id, emoji=emoji))
+            bumped = await db.execute(
+                update(counts_table).where(_count_key(message_id, emoji)).values(count=counts_table.c.count + 1)
+            )
+            if bumped.rowcount == 0:
+                await db.execute(insert(counts_table).values(message_id=message_id, emoji=emoji, count=1))
+            count = await _current_count(db, message_id, emoji)
+            await db.commit()
+            return True, count
+        except IntegrityError:
+            # 같은 반응 중복 요청, 또는 같은 이모지의 첫 반응이 동시에 들어와 집계 행 INSERT가 겹친 경우
+            await db.rollback()
+            if attempt:
+                raise
+    raise AssertionError("unreachable")
+
+
+async def remove_reaction(db: AsyncSession, message_id: int, user_id: int, emoji: str) -> Tuple[bool, int]:
+    """반응 취소 후 (변경 여부, 해당 이모지 반응 수)"""
+    deleted = await db.execute(delete(reactions_table).where(_reaction_key(message_id, user_id, emoji)))
+    if deleted.rowcount == 0:
+        count = await _current_count(db, message_id, emoji)
+        await db.commit()
+        return False, count
+    await db.execute(
+        update(counts_table).where(_count_key(message_id, emoji)).values(count=counts_table.c.count - 1)
+    )
+    await db.execute(delete(counts_table).where(_count_key(message_id, emoji), counts_table.c.count <= 0))
+    count = await _current_count(db, message_id, emoji)
+    await db.commit()
+    return True, count
+
+
+def reaction_counts(db, message_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """메시지 목록의 이모지별 반응 수 (동기 세션, 쿼리 1회)"""
+    message_ids = list(message_ids)
+    counts: Dict[int, Dict[str, int]] = defaultdict(dict)
+    if not message_ids:
+        return counts
+    rows = db.execute(
+        select(counts_table.c.message_id, counts_table.c.emoji, counts_table.c.count)
+        .where(counts_table.c.message_id.in_(message_ids), counts_table.c.count > 0)
+    ).all()
+    for message_id, emoji, count in rows:
+        counts[message_id][emoji] = count
+    return counts
+
+
+async def apply_reaction(db: AsyncSession, room_id: int, message_id: int, user_id: int, emoji: str, added: bool) -> Tuple[bool, int]:
+    """REST/WS 공용 반응 추가·취소. 실제로 바뀌었으면 방에 변경분(delta)만 브로드캐스트"""
+    if not await manager.membership.check(room_id, user_id):
+        raise ReactionForbidden("해당 채팅방에 접근 권한이 없습니다.")
+    if await find_message_room(db, message_id) != room_id:
+        raise ReactionNotFound("메시지를 찾을 수 없습니다.")
+    changed, count = await (add_reaction if added else remove_reaction)(db, message_id, user_id, emoji)
+    if changed:
+        await manager.broadcast_room(room_id, {
+            "type": "reaction",
+            "roomId": room_id,
+            "messageId": str(message_id),
+            "emoji": emoji,
+            "count": count,
+            "userId": user_id,
+            "op": "add" if added else "remove",
+        })
+    return changed, count
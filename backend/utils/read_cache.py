@@ -0,0 +1,113 @@
+# backend/utils/read_cache.py
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Hashable, Iterable, NamedTuple, Optional
+
+from fastapi import Response, status
+
+from utils.cache import TTLCache
+from utils.codec import json_codec
+from utils.versions import etag_matches, make_etag, members_version, room_version, user_version
+from utils.websocket_manager import manager
+
+# 자주 바뀌지 않는 단건 조회(방 정보, 방 멤버 목록, 사용자 상세) 응답 캐시
+# 항목은 저장할 때의 리소스 버전과 함께 두고, 조회 시 현재 버전과 다르면 버린다.
+# 버전은 변경 엔드포인트가 invalidate()로 올리고 백플레인으로 다른 워커에 전파된다.
+# TTL은 백플레인 메시지가 유실됐을 때를 위한 상한이다.
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "20000"))
+READ_CACHE_TTL = int(os.getenv("READ_CACHE_TTL", "300"))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: str
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _not_modified(entry: CachedResponse, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    """조건부 요청 판정 (If-None-Match가 있으면 If-Modified-Since는 무시)"""
+    if if_none_match:
+        return etag_matches(if_none_match, entry.etag)
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(entry.last_modified) <= since
+    return False
+
+
+class ReadCache:
+    """리소스 버전으로 무효화되는 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize: int = READ_CACHE_SIZE, ttl: float = READ_CACHE_TTL):
+        self._cache = TTLCache(maxsize, ttl)
+
+    def get(self, key: Hashable, version_name: str, loader: Callable[[], Any]) -> Any:
+        """현재 버전의 캐시 값, 없으면 loader() 결과를 저장 후 반환 (None은 저장하지 않음)
+
+        버전은 loader 실행 전에 읽는다. 조회 중에 변경이 커밋되면 버전이 올라가 있으므로
+        다음 조회에서 다시 읽힌다.
+        """
+        version = manager.versions.get(version_name)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = loader()
+        if value is not None:
+            self._cache.set(key, (version, value))
+        return value
+
+    def response(
+        self,
+        key: Hashable,
+        version_name: str,
+        loader: Callable[[], Any],
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> Optional[Response]:
+        """loader()가 돌려준 JSON 응답을 직렬화된 채로 캐시하고 ETag/Last-Modified를 붙여 반환
+
+        ETag는 본문 해시라서 어느 워커가 만들어도 같다. loader()가 None이면 None 반환.
+        """
+        def load() -> Optional[CachedResponse]:
+            payload = loader()
+            if payload is None:
+                return None
+            body = json_codec.encode(payload)
+            # 마지막 변경 시각 = 읽은 시각 (버전 값은 다른 워커 시계 기준이라 시간 순서를 보장하지 않음)
+            return CachedResponse(body.encode(), make_etag(body), _http_date(datetime.utcnow()))
+
+        entry: Optional[CachedResponse] = self.get(key, version_name, load)
+        if entry is None:
+            return None
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": entry.last_modified,
+            "Cache-Control": "private, no-cache",
+        }
+        if _not_modified(entry, if_none_match, if_modified_since):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+read_cache = ReadCache()
+
+
+def invalidate(rooms: Iterable[int] = (), members: Iterable[int] = (), users: Iterable[int] = ()):
+    """변경된 리소스의 캐시 무효화 (버전을 올리고 모든 워커에 전파, 커밋 후에 호출)"""
+    names = (
+        [room_version(room_id) for room_id in rooms]
+        + [members_version(room_id) for room_id in members]
+        + [user_version(user_id) for user_id in users]
+    )
+    if names:
+        manager.versions.bump(*names)
@@ -0,0 +1,200 @@
+# backend/utils/search.py
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.message import Message
+from models.room_member import RoomMember
+
+logger = logging.getLogger(__name__)
+
+# 메시지 전문 검색 인덱스
+#  - SQLite: FTS5 가상 테이블 messages_fts (rowid = message_id), messages 트리거로 INSERT/수정/삭제 반영
+#  - MySQL : messages.content FULLTEXT 인덱스 (ngram 파서, 한국어 대응), 엔진이 자동 반영
+#  - 그 외  : LIKE 검색 (인덱스 없음, 개발용)
+# 트리거/FULLTEXT라서 write-behind 배치 INSERT나 이후의 수정·소프트 삭제도 별도 코드 없이 인덱스에 반영된다.
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "content, room_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')",
+    # 삭제되지 않은 메시지만 색인
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages "
+    "WHEN coalesce(new.is_deleted, 0) = 0 BEGIN "
+    "INSERT INTO messages_fts(rowid, content, room_id) VALUES (new.message_id, new.content, new.room_id); "
+    "END",
+    # 수정/소프트 삭제: 기존 항목을 지우고 삭제되지 않았으면 다시 색인
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content, is_deleted, room_id ON messages BEGIN "
+    "DELETE FROM messages_fts WHERE rowid = old.message_id; "
+    "INSERT INTO messages_fts(rowid, content, room_id) "
+    "SELECT new.message_id, new.content, new.room_id WHERE coalesce(new.is_deleted, 0) = 0; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN "
+    "DELETE FROM messages_fts WHERE rowid = old.message_id; "
+    "END",
+]
+
+SQLITE_BACKFILL = (
+    "INSERT INTO messages_fts(rowid, content, room_id) "
+    "SELECT message_id, content, room_id FROM messages WHERE coalesce(is_deleted, 0) = 0"
+)
+
+MYSQL_INDEX_NAME = "ft_messages_content"
+
+
+def _terms(query: str) -> List[str]:
+    """검색어를 공백 기준 단어로 (검색 문법 문자는 제거해서 그대로 전달되지 않게 함)"""
+    cleaned = "".join(" " if ch in '"*+-<>()~@' else ch for ch in query)
+    return [term for term in cleaned.split() if term]
+
+
+def _fts5_query(terms: List[str]) -> str:
+    # 모든 단어를 포함 (단어별 접두어 일치: '안녕' → '안녕하세요')
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _mysql_query(terms: List[str]) -> str:
+    return " ".join(f'+"{term}"' for term in terms)
+
+
+class MessageSearch:
+    """메시지 전문 검색 (DB 종류에 맞는 인덱스로 순위순 message_id 목록 반환)
+
+    인덱스 생성은 배포 시 한 번 실행하는 명령(python -m migrations.search_index)이 맡고,
+    앱 시작 시에는 check()로 인덱스가 있는지만 확인한다.
+    """
+
+    def __init__(self):
+        self.mode = "like"
+        # FULLTEXT/FTS5를 쓸 수 있는 DB인데 인덱스가 없으면 False (/health에 표시)
+        self.index_ready = True
+
+    def status(self) -> dict:
+        return {"mode": self.mode, "index_ready": self.index_ready}
+
+    def check(self, engine: Engine):
+        """인덱스가 있는지 확인해서 검색 방식 결정 (DDL은 실행하지 않음)"""
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            exists, mode = self._sqlite_index_exists(engine), "fts5"
+        elif dialect == "mysql":
+            exists, mode = self._mysql_index_exists(engine), "mysql"
+        else:
+            self.mode, self.index_ready = "like", True
+            return
+        self.mode = mode if exists else "like"
+        self.index_ready = exists
+        if not exists:
+            logger.error(
+                "메시지 전문 검색 인덱스가 없어 LIKE 검색을 사용합니다 (전체 스캔). "
+                "`python -m migrations.search_index`로 인덱스를 만드세요."
+            )
+
+    def create_index(self, engine: Engine):
+        """인덱스 생성 (이미 있으면 그대로 사용, 실패하면 예외)"""
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            self._create_sqlite(engine)
+        elif dialect == "mysql":
+            self._create_mysql(engine)
+        else:
+            raise RuntimeError(f"전문 검색 인덱스를 지원하지 않는 DB입니다: {dialect}")
+
+    @staticmethod
+    def _sqlite_index_exists(engine: Engine) -> bool:
+        with engine.connect() as conn:
+            names = {
+                name for name, in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE name IN "
+                         "('messages_fts', 'messages_fts_ai', 'messages_fts_au', 'messages_fts_ad')")
+                )
+            }
+        return len(names) == 4
+
+    @staticmethod
+    def _mysql_index_exists(engine: Engine) -> bool:
+        with engine.connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT 1 FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = 'messages' AND index_name = :name"
+                ),
+                {"name": MYSQL_INDEX_NAME},
+            ).first() is not None
+
+    def _create_sqlite(self, engine: Engine):
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'")
+            ).first()
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                # 인덱스 도입 전에 쌓인 메시지 색인
+                conn.execute(text(SQLITE_BACKFILL))
+
+    def _create_mysql(self, engine: Engine):
+        if self._mysql_index_exists(engine):
+            return
+        logger.info("messages FULLTEXT 인덱스 생성 중 (메시지 수에 비례해 시간이 걸림)")
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE FULLTEXT INDEX {MYSQL_INDEX_NAME} ON messages (content) WITH PARSER ngram"))
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query: str,
+        room_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Tuple[int, float]]:
+        """user_id가 속한 방의 메시지 중 검색어와 일치하는 (message_id, 점수) 목록 (관련도순)"""
+        terms = _terms(query)
+        if not terms:
+            return []
+        params = {"user_id": user_id, "room_id": room_id, "limit": limit, "offset": offset}
+        room_filter = " AND {col} = :room_id" if room_id is not None else ""
+
+        if self.mode == "fts5":
+            # FTS5의 rank(bm25)는 작을수록 관련도가 높음
+            sql = (
+                "SELECT rowid, rank FROM messages_fts "
+                "WHERE messages_fts MATCH :q "
+                "AND room_id IN (SELECT room_id FROM room_members WHERE user_id = :user_id)"
+                + room_filter.format(col="room_id")
+                + " ORDER BY rank LIMIT :limit OFFSET :offset"
+            )
+            rows = db.execute(text(sql), {**params, "q": _fts5_query(terms)}).all()
+            return [(message_id, -score) for message_id, score in rows]
+
+        if self.mode == "mysql":
+            sql = (
+                "SELECT m.message_id, MATCH(m.content) AGAINST(:q IN BOOLEAN MODE) AS score "
+                "FROM messages m "
+                "WHERE MATCH(m.content) AGAINST(:q IN BOOLEAN MODE) AND m.is_deleted = 0 "
+                "AND m.room_id IN (SELECT room_id FROM room_members WHERE user_id = :user_id)"
+                + room_filter.format(col="m.room_id")
+                + " ORDER BY score DESC, m.message_id DESC LIMIT :limit OFFSET :offset"
+            )
+            rows = db.execute(text(sql), {**params, "q": _mysql_query(terms)}).all()
+            return [(message_id, float(score)) for message_id, score in rows]
+
+        # 인덱스가 없는 DB: 모든 단어를 포함하는 메시지를 최신순으로
+        member_rooms = db.query(RoomMember.room_id).filter(RoomMember.user_id == user_id)
+        q = (
+            db.query(Message.message_id)
+            .filter(Message.is_deleted == False)
+            .filter(Message.room_id.in_(member_rooms))
+        )
+        if room_id is not None:
+            q = q.filter(Message.room_id == room_id)
+        for term in terms:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            q = q.filter(Message.content.like(f"%{escaped}%", escape="\\"))
+        rows = q.order_by(Message.message_id.desc()).limit(limit).offset(offset).all()
+        return [(message_id, 0.0) for message_id, in rows]
+
+message_search = MessageSearch()
@@ -0,0 +1,116 @@
+# backend/utils/snowflake.py
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+# 64비트 ID 구성: [부호 1][타임스탬프 41][워커 10][시퀀스 12]
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_ID_BITS + SEQUENCE_BITS
+
+# 시계가 뒤로 가면 마지막 시각을 이어서 쓰고(기다리지 않음), 이 이상 차이나면 에러
+MAX_CLOCK_SKEW_MS = 1000
+
+
+class WorkerIdUnavailable(RuntimeError):
+    """이 프로세스에 메시지 ID 워커 번호가 없음 (임대 전이거나 임대 만료)"""
+
+
+def explicit_worker_id() -> Optional[int]:
+    """WORKER_ID 환경변수 (없으면 None → 앱 시작 시 utils.worker_lease가 비어 있는 번호를 임대)"""
+    value = os.getenv("WORKER_ID", "").strip()
+    if not value:
+        return None
+    if not value.isdigit() or int(value) > MAX_WORKER_ID:
+        raise ValueError(f"WORKER_ID는 0~{MAX_WORKER_ID} 범위여야 합니다: {value!r}")
+    return int(value)
+
+
+class SnowflakeGenerator:
+    """시간순 정렬 가능한 64비트 ID 생성기 (워커별로 고유)"""
+
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id는 0~{MAX_WORKER_ID} 범위여야 합니다: {worker_id}")
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _now_ms() -> int:
+        return time.time_ns() // 1_000_000 - EPOCH_MS
+
+    def next_id(self) -> int:
+        # 락 안에서 sleep/대기하지 않음 (이벤트 루프에서 호출되므로)
+        with self._lock:
+            now = self._now_ms()
+            if now < self._last_ms:
+                # 시계가 뒤로 간 경우: 마지막 시각을 그대로 이어서 사용
+                skew = self._last_ms - now
+                if skew > MAX_CLOCK_SKEW_MS:
+                    raise RuntimeError(f"시스템 시계가 {skew}ms 뒤로 이동했습니다.")
+                now = self._last_ms
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # 같은 ms 안에서 시퀀스 소진 → 다음 ms를 미리 사용
+                    now = self._last_ms + 1
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (now << TIMESTAMP_SHIFT) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def id_to_datetime(snowflake_id: int) -> datetime:
+    """ID에 담긴 생성 시각 (UTC, naive)"""
+    ms = (snowflake_id >> TIMESTAMP_SHIFT) + EPOCH_MS
+    return datetime(1970, 1, 1) + timedelta(milliseconds=ms)
+
+
+def datetime_to_id(value: datetime) -> int:
+    """해당 시각 이후에 생성된 ID의 하한값 (시간 범위 조회용)"""
+    ms = int((value - datetime(1970, 1, 1)).total_seconds() * 1000) - EPOCH_MS
+    return max(ms, 0) << TIMESTAMP_SHIFT
+
+
+_generator: Optional[SnowflakeGenerator] = None
+_generator_pid = None
+_generator_enabled = False
+_generator_lock = threading.Lock()
+
+
+def configure(worker_id: Optional[int]):
+    """이 프로세스의 워커 번호 설정 (None이면 다시 설정될 때까지 발급 중단)
+
+    같은 번호로 다시 설정하면 기존 생성기의 마지막 시각/시퀀스를 이어서 쓴다.
+    """
+    global _generator, _generator_pid, _generator_enabled
+    with _generator_lock:
+        if worker_id is None:
+            _generator_enabled = False
+            return
+        if _generator is None or _generator_pid != os.getpid() or _generator.worker_id != worker_id:
+            _generator = SnowflakeGenerator(worker_id)
+            _generator_pid = os.getpid()
+        _generator_enabled = True
+
+
+def next_id() -> int:
+    """프로세스 공용 생성기로 새 ID 발급
+
+    fork된 프로세스는 부모의 번호를 이어 쓰지 않는다. 임대한 번호가 없으면 WORKER_ID를 쓰고, 그것도 없으면 에러.
+    """
+    if _generator_pid != os.getpid():
+        worker_id = explicit_worker_id()
+        if worker_id is None:
+            raise WorkerIdUnavailable("메시지 ID 워커 번호가 없습니다. 앱 시작 시 임대되거나 WORKER_ID를 지정해야 합니다.")
+        configure(worker_id)
+    if not _generator_enabled:
+        raise WorkerIdUnavailable("메시지 ID 워커 번호 임대가 만료되어 ID를 발급하지 않습니다.")
+    return _generator.next_id()
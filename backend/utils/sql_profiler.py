@@ -0,0 +1,150 @@
+# backend/utils/sql_profiler.py
+import logging
+import os
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 요청/WS 프레임 단위 SQL 프로파일링 (기본 꺼짐)
+# 켜면 엔진 이벤트로 실행된 SQL을 현재 요청(ContextVar)에 모아서 쿼리 수, DB 시간, 느린 문장,
+# 같은 문장 반복(N+1)을 응답 헤더와 로그로 남긴다. 로그에는 바인딩 값 없이 SQL 문장만 남는다.
+# 스레드풀(동기 엔드포인트)과 비동기 세션(greenlet)은 요청의 컨텍스트를 이어받으므로 함께 집계된다.
+# 백그라운드 작업(메시지/상태 저장기)의 쿼리는 요청에 속하지 않아 집계하지 않는다.
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+SQL_PROFILE_SAMPLE_RATE = float(os.getenv("SQL_PROFILE_SAMPLE_RATE", "1.0"))  # 프로파일링할 요청 비율
+SQL_PROFILE_SLOW_MS = float(os.getenv("SQL_PROFILE_SLOW_MS", "100"))          # 느린 문장 기준
+SQL_PROFILE_REPEAT = int(os.getenv("SQL_PROFILE_REPEAT", "5"))                # 같은 문장이 이만큼 반복되면 N+1 의심
+SQL_PROFILE_LOG_QUERIES = int(os.getenv("SQL_PROFILE_LOG_QUERIES", "20"))     # 쿼리 수가 이 이상이면 로그
+SQL_PROFILE_HEADERS = os.getenv("SQL_PROFILE_HEADERS", "true").lower() in ("1", "true", "yes")
+
+STATEMENT_LOG_LENGTH = 300
+
+
+class QueryProfile:
+    """요청 1개(또는 WS 프레임 1개)의 SQL 실행 기록"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+        self.slow: List[Tuple[float, str]] = []
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed * 1000 >= SQL_PROFILE_SLOW_MS:
+            self.slow.append((elapsed * 1000, statement))
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """SQL_PROFILE_REPEAT번 이상 실행된 같은 문장 (N+1 후보)"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= SQL_PROFILE_REPEAT]
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"x-db-queries", str(self.count).encode()),
+            (b"x-db-time-ms", f"{self.seconds * 1000:.1f}".encode()),
+            (b"x-db-repeated", str(len(self.repeated())).encode()),
+        ]
+
+    def report(self):
+        """쿼리가 많거나 느린 문장, N+1 후보가 있으면 WARNING, 나머지는 DEBUG"""
+        repeated = self.repeated()
+        noisy = self.slow or repeated or self.count >= SQL_PROFILE_LOG_QUERIES
+        if not noisy and not logger.isEnabledFor(logging.DEBUG):
+            return
+        lines = [f"sql profile {self.label} queries={self.count} db_time={self.seconds * 1000:.1f}ms"]
+        for statement, count in repeated:
+            lines.append(f"  N+1? x{count}: {_shorten(statement)}")
+        for elapsed_ms, statement in self.slow:
+            lines.append(f"  slow {elapsed_ms:.1f}ms: {_shorten(statement)}")
+        logger.log(logging.WARNING if noisy else logging.DEBUG, "\n".join(lines))
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= STATEMENT_LOG_LENGTH else statement[:STATEMENT_LOG_LENGTH] + "..."
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["sql_profile_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    started = conn.info.pop("sql_profile_started", None)
+    if started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+
+def install(*engines: Engine):
+    """엔진에 실행 시간 측정 이벤트 등록 (SQL_PROFILE이 켜져 있을 때만)"""
+    if not SQL_PROFILE:
+        return
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    logger.info("SQL 프로파일링 사용 (sample_rate=%s, slow=%sms)", SQL_PROFILE_SAMPLE_RATE, SQL_PROFILE_SLOW_MS)
+
+
+def _sampled() -> bool:
+    return SQL_PROFILE and (SQL_PROFILE_SAMPLE_RATE >= 1 or random.random() < SQL_PROFILE_SAMPLE_RATE)
+
+
+@contextmanager
+def profile(label: str):
+    """블록 안에서 실행된 SQL을 label로 집계하고 끝나면 로그 (WS 프레임 처리용)"""
+    if not _sampled():
+        yield None
+        return
+    current = QueryProfile(label)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        current.report()
+
+
+class SQLProfilerMiddleware:
+    """HTTP 요청별 SQL 집계 (순수 ASGI 미들웨어, X-DB-* 응답 헤더와 로그)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _sampled():
+            await self.app(scope, receive, send)
+            return
+        current = QueryProfile(f'{scope.get("method", "")} {scope.get("path", "")}')
+        token = _current.set(current)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and SQL_PROFILE_HEADERS:
+                # 응답 시작 전까지 실행된 쿼리 기준 (의존성 정리 단계의 쿼리는 로그에만 포함)
+                message = {**message, "headers": list(message.get("headers", [])) + current.headers()}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                current.label = f'{scope.get("method", "")} {route.path}'
+            current.report()
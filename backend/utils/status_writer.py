@@ -0,0 +1,122 @@
+# backend/utils/status_writer.py
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, update
+
+from database import AsyncSessionLocal
+from models.user import User, UserStatus
+
+logger = logging.getLogger(__name__)
+
+# 상태 저장 주기 (이 시간 안에 여러 번 바뀐 유저는 마지막 상태만 저장)
+STATUS_FLUSH_INTERVAL_MS = int(os.getenv("STATUS_FLUSH_INTERVAL_MS", "2000"))
+
+users_table = User.__table__
+
+_update_status = (
+    update(users_table)
+    .where(users_table.c.user_id == bindparam("b_user_id"))
+    .values(status=bindparam("b_status"))
+)
+
+_update_status_message = (
+    update(users_table)
+    .where(users_table.c.user_id == bindparam("b_user_id"))
+    .values(status=bindparam("b_status"), status_message=bindparam("b_status_message"))
+)
+
+
+class StatusWriter:
+    """User.status 배치 저장기
+
+    접속 상태의 기준은 WebSocketManager.user_status(메모리)이고 DB는 그 사본이다.
+    submit()은 유저별 최신 상태만 덮어써 두고, STATUS_FLUSH_INTERVAL_MS마다
+    바뀐 유저들을 UPDATE 한 문장(executemany)으로 저장한다.
+    재접속 폭주 때도 주기당 트랜잭션은 1개이며, 종료 시 stop()이 남은 상태를 저장한다.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        interval_ms: int = STATUS_FLUSH_INTERVAL_MS,
+        on_flush: Callable[[Iterable[int]], None] = lambda user_ids: None,
+    ):
+        self._session_factory = session_factory
+        self.on_flush = on_flush
+        self.interval = interval_ms / 1000
+        self._pending: Dict[int, dict] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, user_id: int, status: str, status_message: Optional[str] = None):
+        """유저 상태 저장 예약 (status_message가 None이면 기존 값 유지)"""
+        try:
+            UserStatus(status)
+        except ValueError:
+            logger.warning("알 수 없는 상태 값이라 저장하지 않음 user_id=%s status=%r", user_id, status)
+            return
+        row = {"b_user_id": user_id, "b_status": status}
+        previous = self._pending.get(user_id)
+        if status_message is not None:
+            row["b_status_message"] = status_message
+        elif previous is not None and "b_status_message" in previous:
+            # 같은 주기에 먼저 들어온 상태 메시지는 유지
+            row["b_status_message"] = previous["b_status_message"]
+        self._pending[user_id] = row
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 작업을 멈추고 남은 상태를 모두 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("상태 저장 실패")
+
+    async def flush(self):
+        """모인 상태를 bulk UPDATE로 저장 (사용자 캐시는 on_flush의 버전 갱신으로 모든 워커에서 무효화)"""
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            with_message = [row for row in pending.values() if "b_status_message" in row]
+            status_only = [row for row in pending.values() if "b_status_message" not in row]
+            try:
+                async with self._session_factory() as db:
+                    if status_only:
+                        await db.execute(_update_status, status_only)
+                    if with_message:
+                        await db.execute(_update_status_message, with_message)
+                    await db.commit()
+            except Exception:
+                # 그 사이 더 새로운 상태가 들어온 유저는 새 값을 유지하고 나머지는 다음 주기에 재시도
+                for user_id, row in pending.items():
+                    self._pending.setdefault(user_id, row)
+                raise
+            self.written += len(pending)
+            self.flushes += 1
+            # 상태 필드를 포함한 사용자 목록/상세 응답의 버전 갱신
+            self.on_flush(list(pending))
@@ -0,0 +1,114 @@
+# backend/utils/typing_indicator.py
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from utils.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+# 입력 중 표시 설정
+TYPING_INTERVAL_MS = int(os.getenv("TYPING_INTERVAL_MS", "1000"))  # 방별 "입력 중" 프레임 전송 주기
+TYPING_TTL_MS = int(os.getenv("TYPING_TTL_MS", "5000"))            # 갱신이 없으면 입력 중 해제
+TYPING_MIN_GAP_MS = int(os.getenv("TYPING_MIN_GAP_MS", "1000"))    # 유저/방별 typing 프레임 최소 간격
+
+
+class TypingTracker:
+    """방별 입력 중 유저 집계 (저장하지 않는 일회성 상태)
+
+    클라이언트의 typing 프레임은 유저/방마다 TYPING_MIN_GAP_MS에 한 번만 받고,
+    TYPING_INTERVAL_MS마다 목록이 바뀐 방에만 {"type": "typing", "roomId", "users"} 프레임을 보낸다.
+    TYPING_TTL_MS 동안 갱신이 없거나 메시지를 보내면 목록에서 빠진다.
+    시작/중지는 백플레인으로 공유해서 모든 워커가 같은 목록을 보낸다.
+    """
+
+    def __init__(
+        self,
+        manager: "WebSocketManager",
+        interval_ms: int = TYPING_INTERVAL_MS,
+        ttl_ms: int = TYPING_TTL_MS,
+        min_gap_ms: int = TYPING_MIN_GAP_MS,
+    ):
+        self.manager = manager
+        self.interval = interval_ms / 1000
+        self.ttl = ttl_ms / 1000
+        self.min_gap = min_gap_ms / 1000
+        # room_id → user_id → (만료 시각, 이름)
+        self._rooms: Dict[int, Dict[int, Tuple[float, str]]] = {}
+        # (room_id, user_id) → 마지막으로 받은 시각 (이 워커에 접속한 유저만)
+        self._accepted: Dict[Tuple[int, int], float] = {}
+        self._dirty: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.throttled = 0
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def update(self, room_id: int, user_id: int, name: str, typing: bool = True):
+        """이 워커에 접속한 유저의 typing 프레임 처리 (너무 잦은 프레임은 무시)"""
+        now = time.monotonic()
+        key = (room_id, user_id)
+        if typing:
+            last = self._accepted.get(key)
+            if last is not None and now - last < self.min_gap:
+                self.throttled += 1
+                return
+            self._accepted[key] = now
+        else:
+            if self._accepted.pop(key, None) is None:
+                return
+        self.apply(room_id, user_id, name, typing)
+        await self.manager._publish({"op": "typing", "roomId": room_id, "userId": user_id, "name": name, "typing": typing})
+
+    def apply(self, room_id: int, user_id: int, name: str, typing: bool):
+        """입력 중 상태 반영 (다른 워커에서 온 변경도 여기로)"""
+        typers = self._rooms.get(room_id)
+        if typing:
+            if typers is None:
+                typers = self._rooms[room_id] = {}
+            if user_id not in typers:
+                self._dirty.add(room_id)
+            typers[user_id] = (time.monotonic() + self.ttl, name)
+        elif typers is not None and typers.pop(user_id, None) is not None:
+            self._dirty.add(room_id)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("typing 프레임 전송 실패")
+
+    def flush(self):
+        """만료 처리 후 목록이 바뀐 방에 현재 입력 중 유저 전송 (이 워커의 소켓에만)"""
+        now = time.monotonic()
+        for room_id, typers in list(self._rooms.items()):
+            expired = [user_id for user_id, (expires_at, _) in typers.items() if expires_at <= now]
+            for user_id in expired:
+                del typers[user_id]
+                self._accepted.pop((room_id, user_id), None)
+            if expired:
+                self._dirty.add(room_id)
+
+        dirty, self._dirty = self._dirty, set()
+        for room_id in dirty:
+            typers = self._rooms.get(room_id) or {}
+            if not typers:
+                # 빈 목록을 한 번 보내서 표시를 지우고 방 상태는 정리
+                self._rooms.pop(room_id, None)
+            users: List[dict] = [{"id": user_id, "name": name} for user_id, (_, name) in typers.items()]
+            self.manager._deliver_room(room_id, {"type": "typing", "roomId": room_id, "users": users})
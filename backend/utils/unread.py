@@ -0,0 +1,132 @@
+# backend/utils/unread.py
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import and_, bindparam, func, or_, update
+from sqlalchemy.orm import Session
+
+from models.message import Message
+from models.room import Room
+from models.room_member import RoomMember
+
+# 안 읽은 메시지 수는 방별 누적 메시지 수(Room.message_count)와
+# 멤버별 읽음 시점의 누적 수(RoomMember.read_count)의 차이로 계산한다.
+# 메시지 저장 시에는 방 1행만 갱신하면 되고, 목록 조회는 조인 한 번으로 끝난다.
+
+rooms_table = Room.__table__
+members_table = RoomMember.__table__
+
+_bump_rooms = (
+    update(rooms_table)
+    .where(rooms_table.c.room_id == bindparam("b_room_id"))
+    .values(message_count=rooms_table.c.message_count + bindparam("b_count"))
+)
+
+# 방 목록용 마지막 메시지 요약 (다른 워커의 더 최신 메시지를 덮어쓰지 않도록 ID 비교)
+_set_last_message = (
+    update(rooms_table)
+    .where(rooms_table.c.room_id == bindparam("b_room_id"))
+    .where(or_(rooms_table.c.last_message_id == None, rooms_table.c.last_message_id < bindparam("b_message_id")))
+    .values(
+        last_message_id=bindparam("b_message_id"),
+        last_message_preview=bindparam("b_preview"),
+        last_message_at=bindparam("b_created_at"),
+    )
+)
+
+LAST_MESSAGE_PREVIEW_LENGTH = 100
+
+# 보낸 사람은 자기 메시지를 읽은 것으로 처리
+_bump_senders = (
+    update(members_table)
+    .where(and_(
+        members_table.c.room_id == bindparam("b_room_id"),
+        members_table.c.user_id == bindparam("b_user_id"),
+    ))
+    .values(read_count=members_table.c.read_count + bindparam("b_count"))
+)
+
+
+def unread_count_column():
+    """목록 조회용 안 읽은 메시지 수 식"""
+    return (Room.message_count - RoomMember.read_count).label("unread_count")
+
+
+async def record_new_messages(db, rows: Iterable[dict]):
+    """새 메시지 저장과 같은 트랜잭션에서 카운터와 마지막 메시지 요약 갱신 (방/보낸 사람별 1문장)"""
+    per_room = Counter()
+    per_sender = Counter()
+    latest = {}
+    for row in rows:
+        per_room[row["room_id"]] += 1
+        per_sender[(row["room_id"], row["user_id"])] += 1
+        current = latest.get(row["room_id"])
+        if current is None or row["message_id"] > current["message_id"]:
+            latest[row["room_id"]] = row
+    if not per_room:
+        return
+    await db.execute(_bump_rooms, [
+        {"b_room_id": room_id, "b_count": count} for room_id, count in per_room.items()
+    ])
+    await db.execute(_set_last_message, [
+        {
+            "b_room_id": room_id,
+            "b_message_id": row["message_id"],
+            "b_preview": row["content"][:LAST_MESSAGE_PREVIEW_LENGTH],
+            "b_created_at": row["created_at"],
+        }
+        for room_id, row in latest.items()
+    ])
+    await db.execute(_bump_senders, [
+        {"b_room_id": room_id, "b_user_id": user_id, "b_count": count}
+        for (room_id, user_id), count in per_sender.items()
+    ])
+
+
+def mark_room_read(db: Session, member: RoomMember):
+    """채팅방 읽음 처리 (안 읽은 수 0으로)"""
+    message_count = (
+        db.query(Room.message_count)
+        .filter(Room.room_id == member.room_id)
+        .scalar()
+    )
+    member.read_count = message_count or 0
+    member.last_read_at = datetime.utcnow()
+    db.commit()
+
+
+def recompute_unread_counts(db: Session, user_id: int) -> int:
+    """카운터가 어긋났을 때 messages 테이블 기준으로 사용자의 read_count 재계산
+
+    last_read_at 이후 다른 사람이 보낸 메시지 수를 실제 안 읽은 수로 보고
+    read_count = message_count - 실제 안 읽은 수 로 맞춘다. 갱신한 방 수를 반환.
+    created_at(메시지 ID의 시각)과 last_read_at은 모두 앱의 UTC 시계로 기록한 값이다.
+    """
+    members = (
+        db.query(RoomMember, Room.message_count)
+        .join(Room, Room.room_id == RoomMember.room_id)
+        .filter(RoomMember.user_id == user_id)
+        .all()
+    )
+    for member, message_count in members:
+        actual_unread = (
+            db.query(func.count(Message.message_id))
+            .filter(Message.room_id == member.room_id)
+            .filter(Message.user_id != user_id)
+            .filter(Message.is_deleted == False)
+            .filter(Message.created_at > member.last_read_at)
+            .scalar()
+        )
+        member.read_count = (message_count or 0) - actual_unread
+    db.commit()
+    return len(members)
+
+
+def change_member_count(db: Session, room_id: int, delta: int):
+    """참여/나가기와 같은 트랜잭션에서 방 멤버 수 증감 (커밋은 호출 측)"""
+    db.execute(
+        update(rooms_table)
+        .where(rooms_table.c.room_id == room_id)
+        .values(member_count=rooms_table.c.member_count + delta)
+    )
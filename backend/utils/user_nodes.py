@@ -0,0 +1,112 @@
+# backend/utils/user_nodes.py
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Set
+
+if TYPE_CHECKING:
+    from utils.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커 접속 유저 목록 공유 주기 (이 주기의 3배 동안 소식이 없는 워커는 종료된 것으로 봄)
+USER_NODES_SYNC_INTERVAL_MS = int(os.getenv("USER_NODES_SYNC_INTERVAL_MS", "10000"))
+
+
+class RemoteConnections:
+    """다른 워커에 WebSocket으로 접속 중인 유저 (워커별 집합)
+
+    유저의 마지막 소켓이 이 워커에서 끊겨도 다른 워커에 연결이 남아 있으면 offline으로 바꾸지 않는다.
+    각 워커는 유저의 첫 연결/마지막 연결 해제를 백플레인으로 알리고({"op": "connections"}),
+    주기적으로 전체 목록(snapshot)을 보내서 새로 뜬 워커가 상태를 채우고 죽은 워커를 정리할 수 있게 한다.
+
+    두 워커에서 거의 동시에 마지막 연결이 끊기면 서로 상대에게 연결이 남아 있다고 보고 offline을 미룰 수 있다.
+    그래서 미룬 유저(_deferred)는 다른 워커의 해제 통지를 받아 어디에도 연결이 없으면 그때 offline 처리한다.
+    """
+
+    def __init__(self, manager: "WebSocketManager", interval_ms: int = USER_NODES_SYNC_INTERVAL_MS):
+        self.manager = manager
+        self.interval = interval_ms / 1000
+        self._nodes: Dict[str, Set[int]] = {}
+        self._seen: Dict[str, float] = {}
+        self._deferred: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def holds(self, user_id: int) -> bool:
+        """다른 워커에 이 유저의 연결이 있는지"""
+        return any(user_id in users for users in self._nodes.values())
+
+    def defer(self, user_id: int):
+        """다른 워커에 연결이 남아 offline을 미룬 유저"""
+        self._deferred.add(user_id)
+
+    def cancel(self, user_id: int):
+        self._deferred.discard(user_id)
+
+    async def start(self):
+        if self._task is None:
+            # 다른 워커에 목록 요청 (재시작 직후 offline 오판 방지)
+            await self.manager._publish({"op": "connections", "change": "sync"})
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.manager._publish({"op": "connections", "change": "leave"})
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.publish_snapshot()
+                self.expire()
+            except Exception:
+                logger.exception("접속 유저 목록 동기화 실패")
+
+    async def publish_snapshot(self):
+        await self.manager._publish({
+            "op": "connections", "change": "snapshot", "userIds": list(self.manager.active_connections),
+        })
+
+    def apply(self, node: str, change: str, user_id: Optional[int] = None, user_ids: Iterable[int] = ()):
+        """다른 워커의 변경 반영 (어디에도 연결이 없어진 유저는 offline 처리)"""
+        self._seen[node] = time.monotonic()
+        if change == "add":
+            self._nodes.setdefault(node, set()).add(user_id)
+        elif change == "remove":
+            self._nodes.get(node, set()).discard(user_id)
+            # offline 여부는 연결이 끊긴 워커가 판단하고, 여기서는 미뤄 둔 유저만 정리
+            self._settle(self._deferred & {user_id})
+        elif change == "snapshot":
+            previous = self._nodes.get(node, set())
+            self._nodes[node] = set(user_ids)
+            self._settle(self._deferred & (previous - self._nodes[node]))
+        elif change == "leave":
+            # 종료한 워커는 판단할 수 없으므로 그 워커에만 있던 유저를 모두 정리
+            self._seen.pop(node, None)
+            self._settle(self._nodes.pop(node, set()))
+        elif change == "sync":
+            asyncio.ensure_future(self.publish_snapshot())
+
+    def expire(self):
+        """3주기 동안 소식이 없는 워커를 정리하고 그 워커에만 있던 유저를 offline 처리"""
+        deadline = time.monotonic() - self.interval * 3
+        users: Set[int] = set()
+        for node in [node for node, seen in self._seen.items() if seen < deadline]:
+            logger.info("응답 없는 워커 정리 node=%s", node)
+            del self._seen[node]
+            users |= self._nodes.pop(node, set())
+        self._settle(users)
+
+    def _settle(self, user_ids: Iterable[int]):
+        for user_id in list(user_ids):
+            if user_id in self.manager.active_connections or self.holds(user_id):
+                continue
+            self._deferred.discard(user_id)
+            self.manager.set_status(user_id, "offline")
@@ -0,0 +1,81 @@
+# backend/utils/versions.py
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from utils.snowflake import next_id
+
+# 조건부 GET(ETag)용 버전 스탬프
+# 값은 변경마다 새로 발급한 snowflake ID다. 변경한 워커가 bump() → 백플레인으로 전파 →
+# 다른 워커는 observe()로 따라온다. 워커마다 시계와 워커 ID가 달라 나중 변경의 값이 더 작을 수
+# 있으므로 크기를 비교하지 않고 현재 값과 다르면 무조건 받아들인다 (값은 "같은지"만 의미가 있다).
+
+
+class VersionStamps:
+    """이름별 버전 스탬프 (스레드 안전, 워커 간 공유)"""
+
+    def __init__(
+        self,
+        publish: Optional[Callable[[dict], None]] = None,
+        on_change: Optional[Callable[[str], None]] = None,
+    ):
+        self._values: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._publish = publish
+        # 값이 바뀐 이름마다 호출 (버전 비교를 하지 않는 캐시의 무효화용)
+        self._on_change = on_change
+
+    def get(self, name: str) -> Optional[int]:
+        return self._values.get(name)
+
+    def observe(self, name: str, value: int):
+        """다른 워커의 변경이나 DB에서 읽은 초기값 반영 (현재 값과 다르면 채택 → 캐시 무효화)"""
+        with self._lock:
+            changed = self._values.get(name) != value
+            self._values[name] = value
+        if changed and self._on_change is not None:
+            self._on_change(name)
+
+    def bump(self, *names: str) -> int:
+        """데이터가 바뀌었을 때 호출 → 새 버전을 모든 워커에 전파 (여러 이름을 메시지 하나로)"""
+        value = next_id()
+        for name in names:
+            self.observe(name, value)
+        if names and self._publish is not None:
+            self._publish({"op": "version", "names": list(names), "value": value})
+        return value
+
+
+# 리소스별 버전 이름 (utils.read_cache 응답 캐시의 무효화 단위)
+# 리소스마다 int 하나라서 방/유저 수에 비례해서만 늘어난다.
+def room_version(room_id: int) -> str:
+    return f"room:{room_id}"
+
+
+def members_version(room_id: int) -> str:
+    return f"room_members:{room_id}"
+
+
+USER_VERSION_PREFIX = "user:"
+
+
+def user_version(user_id: int) -> str:
+    return f"{USER_VERSION_PREFIX}{user_id}"
+
+
+def make_etag(*parts) -> str:
+    """버전과 요청 파라미터로 만든 약한 ETag"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (목록, *, W/ 접두어 허용)"""
+    if not if_none_match:
+        return False
+    candidates: Iterable[str] = (value.strip() for value in if_none_match.split(","))
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in candidates:
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == bare:
+            return True
+    return False
@@ -1,59 +1,468 @@
-from typing import Dict, Set
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
 from fastapi import WebSocket
-from collections import defaultdict
-import json
+
+from core.security import invalidate_user
+from utils.backplane import Backplane, create_backplane
+from utils.codec import Codec, Data, EncodedFrame, codec_for_subprotocol, json_codec, negotiate
+from utils.membership import MembershipIndex
+from utils.metrics import registry, ws_fanout_recipients, ws_fanout_seconds, ws_frames_dropped, ws_send_failures
+from utils.message_cache import Loader, RecentMessageCache
+from utils.presence import PresenceCoalescer
+from utils.status_writer import StatusWriter
+from utils.typing_indicator import TypingTracker
+from utils.user_nodes import RemoteConnections
+from utils.versions import USER_VERSION_PREFIX, VersionStamps, user_version
+
+logger = logging.getLogger(__name__)
+
+# 브로드캐스트 설정
+WS_SEND_CONCURRENCY = int(os.getenv("WS_SEND_CONCURRENCY", "256"))  # 동시에 진행 가능한 send 수
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))           # send 1건당 타임아웃(초)
+
+# 연결별 송신 큐 설정
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))               # 연결당 최대 대기 프레임 수
+WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "drop_oldest")  # drop_oldest | coalesce | disconnect
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# 워커 간 브로드캐스트 백플레인 (비어 있으면 프로세스 내부 전달만)
+CHAT_BACKPLANE_URL = os.getenv("CHAT_BACKPLANE_URL", "")
+
+
+@dataclass
+class BroadcastResult:
+    """브로드캐스트 1회 결과"""
+    recipients: int
+    failed: int
+    elapsed_ms: float
+
+
+# presence_diff는 유저별 변경 목록이라 버리지 않고 큐에 있던 것과 합친다
+PRESENCE_DIFF_KEY = "presence_diff"
+
+
+def frame_key(payload: dict) -> Optional[str]:
+    """병합 가능한 프레임의 키 (같은 키는 최신 것만 의미 있음)"""
+    if payload.get("type") == "presence_diff":
+        return PRESENCE_DIFF_KEY
+    if payload.get("type") == "typing":
+        return f"typing:{payload.get('roomId')}"
+    return None
+
+
+def merge_presence_diff(older: dict, newer: dict) -> dict:
+    """두 presence_diff를 하나로 (같은 유저는 newer의 상태)"""
+    changes = {state["userId"]: state for state in older["changes"]}
+    changes.update((state["userId"], state) for state in newer["changes"])
+    return {"type": "presence_diff", "changes": list(changes.values())}
+
+
+class Connection:
+    """소켓 1개의 송신 큐와 전용 writer 태스크"""
+
+    def __init__(self, manager: "WebSocketManager", user_id: int, websocket: WebSocket, codec: Codec = json_codec):
+        self.manager = manager
+        self.user_id = user_id
+        self.websocket = websocket
+        self.codec = codec
+        self.rooms: Set[int] = set()
+        # (병합 키, 인코딩된 프레임, presence_diff면 병합용 원본 payload)
+        self.queue: Deque[Tuple[Optional[str], Data, Optional[dict]]] = deque()
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._run())
+
+    def stop(self):
+        self.closed = True
+        self.queue.clear()
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def enqueue(self, data: Data, key: Optional[str] = None, payload: Optional[dict] = None) -> bool:
+        """큐에 프레임 추가. 정책상 받을 수 없으면 False (호출 측에서 연결 제거)"""
+        if self.closed:
+            return False
+        if len(self.queue) >= self.manager.queue_size:
+            if key == PRESENCE_DIFF_KEY and self.manager.overflow_policy == "coalesce":
+                merged = self._merge_presence(payload)
+                if merged is not None:
+                    data, payload = self.codec.encode(merged), merged
+            if len(self.queue) >= self.manager.queue_size and not self._make_room(key):
+                return False
+        self.queue.append((key, data, payload if key == PRESENCE_DIFF_KEY else None))
+        self._ready.set()
+        return True
+
+    def _make_room(self, key: Optional[str]) -> bool:
+        """큐가 가득 찼을 때 정책에 따라 자리 확보"""
+        policy = self.manager.overflow_policy
+        if policy == "drop_oldest":
+            self.queue.popleft()
+            self.dropped += 1
+            ws_frames_dropped.inc()
+            return True
+        if policy == "coalesce":
+            # 같은 키의 이전 프레임 → 없으면 가장 오래된 병합 가능 프레임 제거
+            # (presence_diff는 버리면 상태가 유실되므로 _merge_presence로만 합침)
+            index = self._find(lambda k: key is not None and key != PRESENCE_DIFF_KEY and k == key)
+            if index is None:
+                index = self._find(lambda k: k is not None and k != PRESENCE_DIFF_KEY)
+            if index is not None:
+                del self.queue[index]
+                self.dropped += 1
+                ws_frames_dropped.inc()
+                return True
+        return False
+
+    def _merge_presence(self, payload: Optional[dict]) -> Optional[dict]:
+        """큐에 있던 presence_diff를 빼고 새 diff와 합친 payload 반환 (없으면 None)"""
+        index = self._find(lambda k: k == PRESENCE_DIFF_KEY)
+        if index is None or payload is None:
+            return None
+        queued = self.queue[index][2]
+        del self.queue[index]
+        self.dropped += 1
+        ws_frames_dropped.inc()
+        return merge_presence_diff(queued, payload)
+
+    def _find(self, predicate) -> Optional[int]:
+        for index, (queued_key, _, _) in enumerate(self.queue):
+            if predicate(queued_key):
+                return index
+        return None
+
+    async def _run(self):
+        manager = self.manager
+        send = self.websocket.send_bytes if self.codec.binary else self.websocket.send_text
+        try:
+            while True:
+                while not self.queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                _, data, _ = self.queue.popleft()
+                async with manager._send_slots:
+                    await asyncio.wait_for(send(data), manager.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.info("writer 종료 user_id=%s: %r", self.user_id, exc)
+            ws_send_failures.inc("send_error")
+            manager.evict(self)
+
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(
+        self,
+        send_concurrency: int = WS_SEND_CONCURRENCY,
+        send_timeout: float = WS_SEND_TIMEOUT,
+        queue_size: int = WS_QUEUE_SIZE,
+        overflow_policy: str = WS_OVERFLOW_POLICY,
+        backplane: Optional[Backplane] = None,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 WS_OVERFLOW_POLICY 입니다: {overflow_policy}")
         # 유저별 연결된 소켓
         self.active_connections: Dict[int, Set[WebSocket]] = defaultdict(set)
         # 방별 연결된 소켓
         self.room_connections: Dict[int, Set[WebSocket]] = defaultdict(set)
-        # 유저 상태
+        # 소켓별 송신 큐
+        self.connections: Dict[WebSocket, Connection] = {}
+        # 유저 상태 (접속 상태의 기준, DB에는 status_writer가 주기적으로 저장)
         self.user_status: Dict[int, str] = {}
+        self.status_writer = StatusWriter(
+            on_flush=lambda user_ids: self.versions.bump("user_status", *map(user_version, user_ids))
+        )
+        # 동시 send 제한 (모든 writer가 공유)
+        self.send_timeout = send_timeout
+        self._send_slots = asyncio.Semaphore(send_concurrency)
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.evicted = 0
+        # 다른 워커와 브로드캐스트를 주고받는 백플레인
+        self.node_id = uuid.uuid4().hex
+        self.backplane = backplane or create_backplane(CHAT_BACKPLANE_URL)
+        # 방별 최근 메시지 (join_room 직후 이력 전송용)
+        self.recent_messages = RecentMessageCache()
+        # 방 멤버십 인덱스 (프레임 권한 확인, presence 대상 계산)
+        self.membership = MembershipIndex()
+        # presence 변경 묶음 전송 (같은 방 유저에게만)
+        self.presence = PresenceCoalescer(self, self.membership.audience)
+        # 방별 입력 중 표시 (저장하지 않음)
+        self.typing = TypingTracker(self)
+        # 다른 워커에 접속 중인 유저 (offline 판단용)
+        self.remote = RemoteConnections(self)
+        # REST 스레드에서 멤버십 변경을 넘길 때 사용하는 이벤트 루프
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 조건부 GET용 버전 스탬프 (변경 시 다른 워커에 전파)
+        self.versions = VersionStamps(self.publish_threadsafe, on_change=self._version_changed)
+
+    @staticmethod
+    def _version_changed(name: str):
+        """사용자 버전이 바뀌면(이 워커든 다른 워커든) 인증 사용자 캐시에서 제거"""
+        if name.startswith(USER_VERSION_PREFIX):
+            invalidate_user(int(name[len(USER_VERSION_PREFIX):]))
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        await self.backplane.start(self._on_backplane)
+        await self.presence.start()
+        await self.status_writer.start()
+        await self.typing.start()
+        await self.remote.start()
+
+    async def stop(self):
+        await self.remote.stop()
+        await self.typing.stop()
+        await self.presence.stop()
+        await self.status_writer.stop()
+        await self.backplane.close()
+
+    async def _publish(self, message: dict):
+        message["origin"] = self.node_id
+        try:
+            await self.backplane.publish(message)
+        except Exception:
+            logger.exception("backplane publish 실패 op=%s", message.get("op"))
+
+    async def _on_backplane(self, message: dict):
+        """다른 워커에서 온 브로드캐스트를 이 워커의 소켓에 전달"""
+        if message.get("origin") == self.node_id:
+            return
+        op = message.get("op")
+        if op == "room":
+            self._deliver_room(message["roomId"], message["payload"])
+        elif op == "all":
+            self._fanout(list(self.connections), message["payload"])
+        elif op == "presence":
+            await self.presence.deliver(message["changes"])
+        elif op == "typing":
+            self.typing.apply(message["roomId"], message["userId"], message["name"], message["typing"])
+        elif op == "version":
+            for name in message["names"]:
+                self.versions.observe(name, message["value"])
+        elif op == "connections":
+            self.remote.apply(message["origin"], message["change"], message.get("userId"), message.get("userIds", ()))
+        elif op == "discard_messages":
+            self.recent_messages.discard(message["roomId"], message["messageIds"])
+        elif op == "membership":
+            self._apply_membership(message["change"], message["roomId"], message.get("userId"))
+            self._unsubscribe_membership(message["change"], message["roomId"], message.get("userId"))
+
+    def publish_threadsafe(self, message: dict):
+        """이벤트 루프 밖(스레드풀의 REST 엔드포인트 등)에서도 호출 가능한 백플레인 발행"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._publish(message)))
+
+    def membership_changed(self, change: str, room_id: int, user_id: Optional[int] = None):
+        """rooms 라우터에서 멤버십 변경 통지 (add | remove | drop, 스레드풀에서 호출 가능)
+
+        인덱스는 바로 갱신하고, 소켓 구독 정리와 다른 워커 전파는 이벤트 루프에서 처리한다.
+        """
+        self._apply_membership(change, room_id, user_id)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        message = {"op": "membership", "change": change, "roomId": room_id, "userId": user_id}
+        loop.call_soon_threadsafe(self._after_membership_change, message)
+
+    def _apply_membership(self, change: str, room_id: int, user_id: Optional[int]):
+        if change == "add":
+            self.membership.add(room_id, user_id)
+        elif change == "remove":
+            self.membership.remove(room_id, user_id)
+        elif change == "drop":
+            self.membership.drop_room(room_id)
+
+    def _after_membership_change(self, message: dict):
+        self._unsubscribe_membership(message["change"], message["roomId"], message.get("userId"))
+        asyncio.ensure_future(self._publish(message))
+
+    def _unsubscribe_membership(self, change: str, room_id: int, user_id: Optional[int]):
+        """멤버가 아니게 된 소켓을 방 구독에서 제거"""
+        if change == "remove":
+            sockets = [ws for ws in self.active_connections.get(user_id, ()) if ws in self.room_connections.get(room_id, ())]
+        elif change == "drop":
+            sockets = list(self.room_connections.get(room_id, ()))
+        else:
+            return
+        for ws in sockets:
+            self.leave_room(room_id, ws)
 
     async def connect(self, user_id: int, websocket: WebSocket):
-        await websocket.accept()
+        # 서브프로토콜(chat.msgpack 등)로 프레임 코덱 협상, 제안이 없으면 JSON 텍스트
+        subprotocol = negotiate(websocket.scope.get("subprotocols", ()))
+        await websocket.accept(subprotocol=subprotocol)
+        conn = Connection(self, user_id, websocket, codec_for_subprotocol(subprotocol))
+        self.connections[websocket] = conn
+        conn.start()
+        if not self.active_connections[user_id]:
+            # 이 워커의 첫 연결 → 다른 워커에 알림 (offline 판단용)
+            self.remote.cancel(user_id)
+            asyncio.ensure_future(self._publish({"op": "connections", "change": "add", "userId": user_id}))
         self.active_connections[user_id].add(websocket)
-        self.user_status[user_id] = "online"
-        # 접속 알림
-        await self.broadcast_all({
-            "type": "presence",
-            "userId": user_id,
-            "status": "online"
-        })
+        # 접속 알림 (다음 presence flush 때 같은 방 유저에게 전송)
+        self.set_status(user_id, "online")
+
+    def codec_of(self, websocket: WebSocket) -> Codec:
+        conn = self.connections.get(websocket)
+        return conn.codec if conn is not None else json_codec
+
+    def set_status(self, user_id: int, status: str, status_message: Optional[str] = None):
+        """유저 상태 변경 (presence_diff 전송과 DB 저장은 각각 주기적으로 묶어서 처리)"""
+        self.user_status[user_id] = status
+        if status_message is None:
+            self.presence.update(user_id, status)
+        else:
+            self.presence.update(user_id, status, statusMessage=status_message)
+        self.status_writer.submit(user_id, status, status_message)
 
     def disconnect(self, user_id: int, websocket: WebSocket):
+        conn = self.connections.pop(websocket, None)
+        if conn:
+            conn.stop()
+            for room_id in list(conn.rooms):
+                self.leave_room(room_id, websocket)
         if user_id in self.active_connections and websocket in self.active_connections[user_id]:
             self.active_connections[user_id].remove(websocket)
             if not self.active_connections[user_id]:
-                # 마지막 연결이 끊기면 offline 처리
-                self.user_status[user_id] = "offline"
+                # 이 워커의 마지막 연결이 끊기면 다른 워커에 연결이 없을 때만 offline 처리
+                del self.active_connections[user_id]
+                asyncio.ensure_future(self._publish({"op": "connections", "change": "remove", "userId": user_id}))
+                if self.remote.holds(user_id):
+                    self.remote.defer(user_id)
+                else:
+                    self.set_status(user_id, "offline")
 
-    async def broadcast_all(self, payload: dict):
+    def evict(self, conn: Connection):
+        """느리거나 끊긴 소켓을 모든 인덱스에서 제거하고 닫기"""
+        if conn.closed:
+            return
+        self.evicted += 1
+        logger.info("slow consumer 제거 user_id=%s queued=%d dropped=%d", conn.user_id, len(conn.queue), conn.dropped)
+        self.disconnect(conn.user_id, conn.websocket)
+        asyncio.ensure_future(self._close(conn.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            # 1013: Try Again Later → 클라이언트 재접속 유도
+            await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+        except Exception:
+            pass
+
+    def _fanout(self, sockets: Iterable[WebSocket], payload: dict) -> BroadcastResult:
+        """payload를 코덱별로 한 번씩만 인코딩해서 각 소켓의 송신 큐에 넣기"""
+        return self._fanout_frame(sockets, EncodedFrame(payload), frame_key(payload), payload.get("type"))
+
+    def _fanout_frame(self, sockets: Iterable[WebSocket], frame: EncodedFrame, key: Optional[str] = None, kind: Optional[str] = None) -> BroadcastResult:
+        """인코딩된 프레임을 각 소켓의 송신 큐에 넣고 소요 시간을 기록 (같은 코덱끼리 같은 버퍼 공유)"""
+        targets = list(sockets)
+        started = time.perf_counter()
+        failed = 0
+        for ws in targets:
+            conn = self.connections.get(ws)
+            if conn is None:
+                continue
+            if not conn.enqueue(frame.encode(conn.codec), key, frame.payload):
+                failed += 1
+                self.evict(conn)
+        elapsed = time.perf_counter() - started
+        result = BroadcastResult(
+            recipients=len(targets),
+            failed=failed,
+            elapsed_ms=elapsed * 1000,
+        )
+        kind = kind or "other"
+        ws_fanout_recipients.observe(result.recipients, kind)
+        ws_fanout_seconds.observe(elapsed, kind)
+        if failed:
+            ws_send_failures.inc("queue_full", amount=failed)
+        logger.debug(
+            "broadcast type=%s recipients=%d failed=%d elapsed=%.1fms",
+            kind, result.recipients, result.failed, result.elapsed_ms,
+        )
+        return result
+
+    async def send_personal(self, websocket: WebSocket, payload: dict) -> BroadcastResult:
+        """소켓 1개에 전송 (writer 태스크를 거쳐 순서 보장)"""
+        return self._fanout((websocket,), payload)
+
+    async def broadcast_all(self, payload: dict) -> BroadcastResult:
         """전체 유저에게 메시지 브로드캐스트"""
-        data = json.dumps(payload, ensure_ascii=False)
-        for sockets in self.active_connections.values():
-            for ws in list(sockets):
-                try:
-                    await ws.send_text(data)
-                except Exception:
-                    pass
+        result = self._fanout(list(self.connections), payload)
+        await self._publish({"op": "all", "payload": payload})
+        return result
 
     async def join_room(self, room_id: int, websocket: WebSocket):
         self.room_connections[room_id].add(websocket)
+        conn = self.connections.get(websocket)
+        if conn:
+            conn.rooms.add(room_id)
 
-    def leave_room(self, room_id: int, websocket: WebSocket):
-        if room_id in self.room_connections and websocket in self.room_connections[room_id]:
+    def leave_room(self, room_id: int, websocket: WebSocket) -> bool:
+        """방 구독 해제 (구독 중이었으면 True)"""
+        subscribed = websocket in self.room_connections.get(room_id, ())
+        if subscribed:
             self.room_connections[room_id].remove(websocket)
+            if not self.room_connections[room_id]:
+                del self.room_connections[room_id]
+        conn = self.connections.get(websocket)
+        if conn:
+            conn.rooms.discard(room_id)
+        return subscribed
+
+    def _deliver_room(self, room_id: int, payload: dict) -> BroadcastResult:
+        """이 워커에 있는 방 소켓에 전달 (채팅 메시지는 최근 메시지 버퍼에도 보관)"""
+        frame = EncodedFrame(payload)
+        if payload.get("type") == "message" and payload.get("messageId"):
+            self.recent_messages.append(room_id, int(payload["messageId"]), frame.encode(json_codec))
+        return self._fanout_frame(list(self.room_connections.get(room_id, ())), frame, frame_key(payload), payload.get("type"))
 
-    async def broadcast_room(self, room_id: int, payload: dict):
+    def discard_messages(self, room_id: int, message_ids: Iterable[int]):
+        """저장에 실패한 메시지를 모든 워커의 최근 메시지 버퍼에서 제거 (이력으로 재전송되지 않도록)"""
+        message_ids = list(message_ids)
+        self.recent_messages.discard(room_id, message_ids)
+        asyncio.ensure_future(self._publish({"op": "discard_messages", "roomId": room_id, "messageIds": message_ids}))
+
+    async def send_room_history(self, websocket: WebSocket, room_id: int, loader: Loader) -> BroadcastResult:
+        """방의 최근 메시지를 history 프레임 하나로 전송 (캐시에 없으면 loader로 DB에서 채움)"""
+        items = await self.recent_messages.snapshot(room_id, loader)
+        frame = EncodedFrame(None, json='{"type":"history","roomId":%d,"messages":[%s]}' % (room_id, ",".join(items)))
+        if self.codec_of(websocket) is not json_codec:
+            # 캐시는 JSON 문자열로 보관하므로 다른 코덱은 한 번 풀어서 다시 인코딩
+            frame.payload = json_codec.decode(frame.encode(json_codec))
+        return self._fanout_frame((websocket,), frame, None, "history")
+
+    async def broadcast_room(self, room_id: int, payload: dict) -> BroadcastResult:
         """특정 방에 브로드캐스트"""
-        data = json.dumps(payload, ensure_ascii=False)
-        for ws in list(self.room_connections.get(room_id, [])):
-            try:
-                await ws.send_text(data)
-            except Exception:
-                pass
+        result = self._deliver_room(room_id, payload)
+        await self._publish({"op": "room", "roomId": room_id, "payload": payload})
+        return result
 
 manager = WebSocketManager()
+
+
+def _queue_depth():
+    """송신 큐에 쌓인 프레임 수 (전체 합과 연결별 최댓값)"""
+    depths = [len(conn.queue) for conn in list(manager.connections.values())]
+    return [(("total",), sum(depths)), (("max",), max(depths, default=0))]
+
+
+# 스크레이프 때 매니저 상태를 바로 읽는 지표
+registry.gauge("chat_ws_connections", "이 워커에 연결된 WebSocket 수", callback=lambda: [((), len(manager.connections))])
+registry.gauge("chat_ws_users", "이 워커에 연결된 유저 수", callback=lambda: [((), len(manager.active_connections))])
+registry.gauge("chat_ws_rooms", "이 워커에서 소켓이 하나 이상 참가한 방 수", callback=lambda: [((), len(manager.room_connections))])
+registry.gauge("chat_ws_queue_depth", "송신 대기 프레임 수", ("stat",), callback=_queue_depth)
+registry.gauge("chat_ws_evicted", "느린 소켓으로 제거된 연결 수 (누적)", callback=lambda: [((), manager.evicted)])
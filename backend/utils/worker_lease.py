@@ -0,0 +1,139 @@
+# backend/utils/worker_lease.py
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from database import AsyncSessionLocal
+from models.worker_lease import WorkerLease
+from utils import snowflake
+
+logger = logging.getLogger(__name__)
+
+# 워커 번호 임대 기간 (1/3 주기로 갱신, 갱신 없이 지나면 다른 프로세스가 가져갈 수 있음)
+WORKER_LEASE_TTL_MS = int(os.getenv("WORKER_LEASE_TTL_MS", "30000"))
+
+leases_table = WorkerLease.__table__
+
+
+class WorkerIdLease:
+    """프로세스별 메시지 ID 워커 번호 (worker_leases 테이블 임대)
+
+    uvicorn --workers N이나 --reload로 뜬 프로세스는 같은 환경변수를 물려받으므로
+    시작할 때 비어 있거나 만료된 번호를 하나 임대해서 snowflake 생성기에 설정한다.
+    WORKER_ID를 지정하면 그 번호만 임대하고, 다른 살아 있는 프로세스가 쓰고 있으면 시작하지 않는다.
+    갱신하지 못한 채 임대가 만료되면 다른 프로세스와 ID가 겹칠 수 있으므로 ID 발급을 멈춘다.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, ttl_ms: int = WORKER_LEASE_TTL_MS):
+        self._session_factory = session_factory
+        self.ttl = timedelta(milliseconds=ttl_ms)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.worker_id: Optional[int] = None
+        self.expires_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            await self.acquire()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """갱신을 멈추고 번호 반납"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.worker_id is not None:
+            async with self._session_factory() as db:
+                await db.execute(
+                    delete(leases_table)
+                    .where(leases_table.c.worker_id == self.worker_id, leases_table.c.holder == self.holder)
+                )
+                await db.commit()
+            self.worker_id = None
+
+    async def acquire(self) -> int:
+        """WORKER_ID 또는 비어 있는 번호를 임대하고 ID 생성기에 설정"""
+        wanted = snowflake.explicit_worker_id()
+        now = datetime.utcnow()
+        async with self._session_factory() as db:
+            if wanted is not None:
+                candidates = [wanted]
+            else:
+                rows = (await db.execute(select(leases_table.c.worker_id, leases_table.c.expires_at))).all()
+                taken = {worker_id for worker_id, expires_at in rows if expires_at >= now}
+                candidates = [worker_id for worker_id in range(snowflake.MAX_WORKER_ID + 1) if worker_id not in taken]
+            for worker_id in candidates:
+                if await self._claim(db, worker_id, now):
+                    self.worker_id, self.expires_at = worker_id, now + self.ttl
+                    snowflake.configure(worker_id)
+                    logger.info("메시지 ID 워커 번호 %d 임대 holder=%s", worker_id, self.holder)
+                    return worker_id
+        if wanted is not None:
+            raise RuntimeError(f"WORKER_ID={wanted}를 다른 프로세스가 사용 중입니다. 프로세스마다 다른 값을 지정하세요.")
+        raise RuntimeError("임대할 수 있는 메시지 ID 워커 번호가 없습니다.")
+
+    async def _claim(self, db, worker_id: int, now: datetime) -> bool:
+        """만료된 번호는 UPDATE, 없는 번호는 INSERT로 가져감 (동시에 시도하면 한쪽만 성공)"""
+        values = {"holder": self.holder, "expires_at": now + self.ttl}
+        result = await db.execute(
+            update(leases_table)
+            .where(leases_table.c.worker_id == worker_id, leases_table.c.expires_at < now)
+            .values(**values)
+        )
+        if result.rowcount == 1:
+            await db.commit()
+            return True
+        try:
+            await db.execute(insert(leases_table).values(worker_id=worker_id, **values))
+            await db.commit()
+            return True
+        except IntegrityError:
+            await db.rollback()
+            return False
+
+    async def renew(self):
+        """임대 연장 (다른 프로세스가 가져갔으면 새 번호를 임대)"""
+        now = datetime.utcnow()
+        async with self._session_factory() as db:
+            result = await db.execute(
+                update(leases_table)
+                .where(leases_table.c.worker_id == self.worker_id, leases_table.c.holder == self.holder)
+                .values(expires_at=now + self.ttl)
+            )
+            await db.commit()
+        if result.rowcount == 1:
+            self.expires_at = now + self.ttl
+            # 갱신 실패로 발급을 멈췄었다면 재개 (그동안 다른 프로세스가 가져가지 않았음)
+            snowflake.configure(self.worker_id)
+            return
+        logger.error("메시지 ID 워커 번호 %s 임대를 잃어 다시 임대합니다.", self.worker_id)
+        snowflake.configure(None)
+        await self.acquire()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.ttl.total_seconds() / 3)
+            try:
+                await self.renew()
+            except Exception:
+                logger.exception("메시지 ID 워커 번호 임대 갱신 실패")
+                if self.expires_at is not None and datetime.utcnow() >= self.expires_at:
+                    # 다른 프로세스가 같은 번호를 가져갔을 수 있으므로 발급 중단
+                    snowflake.configure(None)
+
+    def status(self) -> dict:
+        return {"worker_id": self.worker_id, "expires_at": self.expires_at}
+
+
+worker_id_lease = WorkerIdLease()
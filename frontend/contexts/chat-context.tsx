@@ -92,6 +92,19 @@ export function ChatProvider({ children }: { children: ReactNode }) {
           })
         }
 
+        // === 사용자 상태 일괄 업데이트 (같은 방 유저의 변경 묶음) ===
+        if (data.type === "presence_diff") {
+          const changes = new Map<string, string>(
+            data.changes.map((c: { userId: number; status: string }) => [c.userId.toString(), c.status])
+          )
+          setChatState((prev) => ({
+            ...prev,
+            onlineUsers: prev.onlineUsers.map((u) =>
+              changes.has(u.id) ? { ...u, status: changes.get(u.id) as typeof u.status } : u
+            ),
+          }))
+        }
+
         // === 새 메시지 수신 ===
         if (data.type === "message") {
           setChatState((prev) => ({
@@ -1,4 +1,6 @@
 const API_BASE_URL = 'http://localhost:8000';
+// GET /users/ 한 페이지 크기 (서버 최대값)
+const USERS_PAGE_SIZE = 1000;
 
 export interface LoginData {
   email: string;
@@ -163,16 +165,28 @@ class ApiClient {
 
   // === 사용자 관련 메서드 ===
 
+  // 서버는 user_id 순으로 페이지를 나눠 주므로 X-Next-Cursor가 없을 때까지 이어서 조회
   async getUsers(): Promise<User[]> {
-    const response = await fetch(`${API_BASE_URL}/users/`, {
-      headers: this.getAuthHeaders(),
-    });
+    const users: User[] = [];
+    let cursor: string | null = null;
 
-    if (!response.ok) {
-      throw new Error('사용자 목록을 가져올 수 없습니다.');
-    }
+    do {
+      const params = new URLSearchParams({ limit: String(USERS_PAGE_SIZE) });
+      if (cursor) params.set('cursor', cursor);
 
-    return response.json();
+      const response = await fetch(`${API_BASE_URL}/users/?${params}`, {
+        headers: this.getAuthHeaders(),
+      });
+
+      if (!response.ok) {
+        throw new Error('사용자 목록을 가져올 수 없습니다.');
+      }
+
+      users.push(...(await response.json()));
+      cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+
+    return users;
   }
 
   async deleteRoom(roomId: number): Promise<void> {